@@ -0,0 +1,88 @@
+"""Measure CLI cold start.
+
+Runs ``intune-doc export --help`` in fresh interpreters and reports the
+wall-clock time, failing when the median exceeds the budget or when any of
+the heavy modules (document libraries, sqlite3, http.server) were imported
+along the way.
+
+    python benchmarks/startup.py --runs 10 --budget-ms 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("docx", "openpyxl", "pptx", "sqlite3", "http.server")
+DEFAULT_COMMAND = ["export", "--help"]
+
+_PROBE = """
+import sys
+from intune_doc.cli import main
+try:
+    main({args!r})
+except SystemExit:
+    pass
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print("HEAVY:" + ",".join(loaded), file=sys.stderr)
+"""
+
+
+def loaded_heavy_modules(args: list[str] = DEFAULT_COMMAND) -> list[str]:
+    """Return the heavy modules imported while running the CLI with ``args``."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(args=list(args), heavy=HEAVY_MODULES)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    marker = next(line for line in result.stderr.splitlines() if line.startswith("HEAVY:"))
+    return [name for name in marker[len("HEAVY:"):].split(",") if name]
+
+
+def time_startup(runs: int, args: list[str] = DEFAULT_COMMAND) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "intune_doc", *args],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=400.0)
+    options = parser.parse_args()
+
+    heavy = loaded_heavy_modules()
+    timings = time_startup(options.runs)
+    median = statistics.median(timings)
+    print(f"runs: {options.runs}")
+    print(f"min: {min(timings):.1f} ms  median: {median:.1f} ms  max: {max(timings):.1f} ms")
+    print(f"heavy modules imported: {', '.join(heavy) or 'none'}")
+
+    if heavy:
+        print("FAIL: heavy modules must only load when the command that needs them runs", file=sys.stderr)
+        return 1
+    if median > options.budget_ms:
+        print(f"FAIL: median start-up exceeds {options.budget_ms:.0f} ms budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
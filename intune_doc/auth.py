@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import json
+import logging
+import threading
 import time
+import urllib.error
 import urllib.parse
 import urllib.request
 from dataclasses import dataclass
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
 
 
 GRAPH_SCOPE = "https://graph.microsoft.com/.default"
@@ -15,12 +20,29 @@ DELEGATED_SCOPES = [
     "DeviceManagementServiceConfig.Read.All",
     "CloudPC.Read.All",
     "Group.Read.All",
+    "DeviceManagementRBAC.Read.All",
 ]
 
 
+# Tokens are renewed this long before they expire.
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+
 @dataclass(frozen=True)
 class TokenResponse:
     access_token: str
+    # Epoch seconds; 0 when the response did not say.
+    expires_at: float = 0.0
+    refresh_token: str = ""
+
+
+def _token_response(payload: Dict[str, str]) -> TokenResponse:
+    expires_in = payload.get("expires_in")
+    return TokenResponse(
+        access_token=payload["access_token"],
+        expires_at=time.time() + int(expires_in) if expires_in else 0.0,
+        refresh_token=payload.get("refresh_token") or "",
+    )
 
 
 def _post_form(url: str, data: Dict[str, str]) -> Dict[str, str]:
@@ -48,7 +70,21 @@ def request_client_credentials_token(tenant_id: str, client_id: str, client_secr
             "grant_type": "client_credentials",
         },
     )
-    return TokenResponse(access_token=payload["access_token"])
+    return _token_response(payload)
+
+
+def request_refresh_token(tenant_id: str, client_id: str, refresh_token: str) -> TokenResponse:
+    url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
+    payload = _post_form(
+        url,
+        {
+            "client_id": client_id,
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+            "scope": _format_scopes(DELEGATED_SCOPES),
+        },
+    )
+    return _token_response(payload)
 
 
 def request_device_code_token(tenant_id: str, client_id: str) -> TokenResponse:
@@ -79,7 +115,7 @@ def request_device_code_token(tenant_id: str, client_id: str) -> TokenResponse:
             },
         )
         if "access_token" in token_response:
-            return TokenResponse(access_token=token_response["access_token"])
+            return _token_response(token_response)
 
         error = token_response.get("error")
         if error == "authorization_pending":
@@ -91,3 +127,38 @@ def request_device_code_token(tenant_id: str, client_id: str) -> TokenResponse:
             continue
 
         raise RuntimeError(token_response.get("error_description", "Device code authentication failed"))
+
+
+class TokenProvider:
+    """Hands out an access token, renewing it shortly before it expires.
+
+    Long-running commands pass this to :class:`GraphClient` so requests keep
+    working past the first token's lifetime. Device code tokens are renewed
+    with their refresh token when one was issued, and by signing in again
+    otherwise.
+    """
+
+    def __init__(self, tenant_id: str, client_id: str, client_secret: str = "", use_device_code: bool = False) -> None:
+        self.tenant_id = tenant_id
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.use_device_code = use_device_code
+        self._token: Optional[TokenResponse] = None
+        self._lock = threading.Lock()
+
+    def __call__(self) -> str:
+        with self._lock:
+            token = self._token
+            if token is None or (token.expires_at and time.time() > token.expires_at - TOKEN_REFRESH_MARGIN_SECONDS):
+                self._token = token = self._renew(token)
+            return token.access_token
+
+    def _renew(self, previous: Optional[TokenResponse]) -> TokenResponse:
+        if not self.use_device_code:
+            return request_client_credentials_token(self.tenant_id, self.client_id, self.client_secret)
+        if previous is not None and previous.refresh_token:
+            try:
+                return request_refresh_token(self.tenant_id, self.client_id, previous.refresh_token)
+            except urllib.error.HTTPError as exc:
+                logger.warning("Refreshing the device code token failed (%s); signing in again.", exc.code)
+        return request_device_code_token(self.tenant_id, self.client_id)
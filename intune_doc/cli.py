@@ -1,39 +1,135 @@
 from __future__ import annotations
 
 import argparse
+import json
 import logging
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
 import sys
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from .auth import request_client_credentials_token, request_device_code_token
-from .config import AppConfig, load_config
+from . import memory, tracing
+from .auth import TokenProvider, request_client_credentials_token, request_device_code_token
+from .config import (
+    DEFAULT_CACHE_MB,
+    DEFAULT_FULL_REFRESH_SECONDS,
+    DEFAULT_POLL_INTERVAL_SECONDS,
+    SEARCH_INDEX_NAME,
+    AppConfig,
+    OutputConfig,
+    ReportOptionsConfig,
+    load_config,
+    load_output_config,
+)
 from .exporters.composite_export import export_all
+from .exporters.plan import plan_export
 from .graph_client import GraphClient
-from .output import write_raw_export, write_rendered_reports
+from .output import WriterOptions, variant_output_prefix, write_raw_export, write_rendered_variants
 from .reports.builder import build_report_schema
-from .reports.cli import SUPPORTED_AUDIENCES, SUPPORTED_FORMATS, SUPPORTED_SCOPES, _parse_formats
-from .reports.registry import render_reports
-from .reports.schema import DEFAULT_REPORT_SCOPE, ReportScope
+from .reports.cli import (
+    SUPPORTED_AUDIENCES,
+    SUPPORTED_FORMATS,
+    SUPPORTED_SCOPES,
+    _parse_audiences,
+    _parse_formats,
+    _parse_scopes,
+)
+from .reports.registry import render_report_variants
+from .reports.schema import DEFAULT_REPORT_SCOPE, ReportSchema, ReportScope
+from .tracing import span
+
+# The modules behind diff, search, serve, watch, saved exports and the export
+# store (sqlite3, http.server, socketserver) are imported by the handlers that
+# use them, so other commands and --help do not pay for them.
 
 
 @dataclass(frozen=True)
 class ExportCommandOptions:
     formats: List[str]
-    audience: str
-    scope: ReportScope
+    audiences: List[str]
+    scopes: List[ReportScope]
     output: str
+    trace: Optional[str] = None
+    profile_memory: Optional[str] = None
 
+    @property
+    def audience(self) -> str:
+        return self.audiences[0]
 
-def _build_export_parser(
-    parent: argparse._SubParsersAction,
+    @property
+    def scope(self) -> ReportScope:
+        return self.scopes[0]
+
+
+@dataclass(frozen=True)
+class WatchCommandOptions(ExportCommandOptions):
+    interval: float = DEFAULT_POLL_INTERVAL_SECONDS
+    full_refresh: float = DEFAULT_FULL_REFRESH_SECONDS
+    socket: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class DiffCommandOptions:
+    old: str
+    new: str
+    output_format: str = "text"
+    output: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class SearchCommandOptions:
+    query: str
+    indexes: List[str]
+    organization: Optional[str] = None
+    limit: int = 50
+    output_format: str = "text"
+
+
+@dataclass(frozen=True)
+class ServeCommandOptions:
+    inputs: List[str]
+    host: str = "127.0.0.1"
+    port: int = 8000
+    cache_mb: int = DEFAULT_CACHE_MB
+
+
+@dataclass(frozen=True)
+class RenderCommandOptions:
+    input: str
+    formats: List[str]
+    audiences: List[str]
+    scopes: List[ReportScope]
+    output: str
+    organization: Optional[str] = None
+    trace: Optional[str] = None
+    profile_memory: Optional[str] = None
+
+    @property
+    def audience(self) -> str:
+        return self.audiences[0]
+
+    @property
+    def scope(self) -> ReportScope:
+        return self.scopes[0]
+
+
+CommandOptions = Union[
+    ExportCommandOptions,
+    DiffCommandOptions,
+    RenderCommandOptions,
+    SearchCommandOptions,
+    ServeCommandOptions,
+]
+
+
+def _add_report_arguments(
+    parser: argparse.ArgumentParser,
     default_audience: str,
     default_scope: ReportScope,
     default_output: str,
-) -> argparse.ArgumentParser:
-    export_parser = parent.add_parser("export", help="Export Intune documentation.")
-    export_parser.add_argument(
+) -> None:
+    parser.add_argument(
         "--format",
         dest="formats",
         action="append",
@@ -43,30 +139,218 @@ def _build_export_parser(
             f"Supported: {', '.join(SUPPORTED_FORMATS)}"
         ),
     )
-    export_parser.add_argument(
+    parser.add_argument(
         "--audience",
-        dest="audience",
-        choices=SUPPORTED_AUDIENCES,
-        default=default_audience,
-        help="Audience template to use for report output.",
+        dest="audiences",
+        action="append",
+        default=[],
+        help=(
+            "Audience template(s) to use for report output. Repeat or comma-separate values. "
+            f"Supported: {', '.join(SUPPORTED_AUDIENCES)} (default: {default_audience})"
+        ),
     )
-    export_parser.add_argument(
+    parser.add_argument(
         "--scope",
-        dest="scope",
-        choices=SUPPORTED_SCOPES,
-        default=default_scope,
-        help="Scope of report output: full_settings or assignment_summary.",
+        dest="scopes",
+        action="append",
+        default=[],
+        help=(
+            "Scope(s) of report output. Repeat or comma-separate values. "
+            f"Supported: {', '.join(SUPPORTED_SCOPES)} (default: {default_scope})"
+        ),
     )
-    export_parser.add_argument(
+    parser.add_argument(
         "--output",
         dest="output",
         default=default_output,
         help="Output path or file prefix for generated reports.",
     )
+    parser.add_argument(
+        "--trace",
+        dest="trace",
+        default=None,
+        metavar="PATH",
+        help="Write a Chrome trace-event JSON of the run's stages (opens in Perfetto or speedscope).",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        dest="profile_memory",
+        default=None,
+        metavar="PATH",
+        help="Record peak RSS and top tracemalloc allocations per stage and write them to this JSON file.",
+    )
+
+
+def _build_export_parser(
+    parent: argparse._SubParsersAction,
+    default_audience: str,
+    default_scope: ReportScope,
+    default_output: str,
+) -> argparse.ArgumentParser:
+    export_parser = parent.add_parser("export", help="Export Intune documentation.")
+    _add_report_arguments(export_parser, default_audience, default_scope, default_output)
     export_parser.set_defaults(command="export")
     return export_parser
 
 
+def _build_watch_parser(
+    parent: argparse._SubParsersAction,
+    default_audience: str,
+    default_scope: ReportScope,
+    default_output: str,
+) -> argparse.ArgumentParser:
+    watch_parser = parent.add_parser(
+        "watch",
+        help="Keep exporting as the tenant changes.",
+        description=(
+            "Run until stopped, keeping one authenticated Graph client and its caches warm. Each poll "
+            "checks the Intune audit log and re-exports the tenant only if something changed."
+        ),
+    )
+    _add_report_arguments(watch_parser, default_audience, default_scope, default_output)
+    watch_parser.add_argument(
+        "--interval",
+        dest="interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL_SECONDS,
+        metavar="SECONDS",
+        help=f"Seconds between change checks (default: {DEFAULT_POLL_INTERVAL_SECONDS}).",
+    )
+    watch_parser.add_argument(
+        "--full-refresh",
+        dest="full_refresh",
+        type=float,
+        default=DEFAULT_FULL_REFRESH_SECONDS,
+        metavar="SECONDS",
+        help=(
+            "Export again after this many seconds even without audited changes, for group membership "
+            f"and other unaudited changes (default: {DEFAULT_FULL_REFRESH_SECONDS})."
+        ),
+    )
+    watch_parser.add_argument(
+        "--socket",
+        dest="socket",
+        default=None,
+        metavar="PATH",
+        help="Unix socket accepting run, status and stop commands.",
+    )
+    watch_parser.set_defaults(command="watch")
+    return watch_parser
+
+
+def _build_render_parser(
+    parent: argparse._SubParsersAction,
+    default_audience: str,
+    default_scope: ReportScope,
+    default_output: str,
+) -> argparse.ArgumentParser:
+    render_parser = parent.add_parser(
+        "render",
+        help="Render reports from a saved export.",
+        description="Build reports from a saved export without connecting to Microsoft Graph.",
+    )
+    render_parser.add_argument(
+        "input",
+        help="Saved export: *-raw.json, NDJSON, an export store or a directory of JSON files.",
+    )
+    _add_report_arguments(render_parser, default_audience, default_scope, default_output)
+    render_parser.add_argument(
+        "--organization",
+        dest="organization",
+        default=None,
+        help="Organization name for the report (defaults to the one saved with the export).",
+    )
+    render_parser.set_defaults(command="render")
+    return render_parser
+
+
+def _build_diff_parser(parent: argparse._SubParsersAction) -> argparse.ArgumentParser:
+    diff_parser = parent.add_parser(
+        "diff",
+        help="Compare two raw exports.",
+        description="Report assets, settings and assignments that changed between two raw exports.",
+    )
+    diff_parser.add_argument("old", help="Older raw export (*-raw.json or NDJSON).")
+    diff_parser.add_argument("new", help="Newer raw export (*-raw.json or NDJSON).")
+    diff_parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=("text", "json"),
+        default="text",
+        help="Output format for the diff.",
+    )
+    diff_parser.add_argument(
+        "--output",
+        dest="output",
+        default=None,
+        help="Write the diff to this file instead of standard output.",
+    )
+    diff_parser.set_defaults(command="diff")
+    return diff_parser
+
+
+def _build_search_parser(parent: argparse._SubParsersAction) -> argparse.ArgumentParser:
+    search_parser = parent.add_parser(
+        "search",
+        help="Search exported assets and settings.",
+        description=(
+            "Find assets whose names, descriptions, setting ids, display names or values contain every "
+            "word of the query, using the index written with include_search_index."
+        ),
+    )
+    search_parser.add_argument("query", nargs="+", help="Words to search for; each matches as a prefix.")
+    search_parser.add_argument(
+        "--index",
+        dest="indexes",
+        action="append",
+        default=[],
+        help=f"Search index to query. Repeat to search several (default: <output_directory>/{SEARCH_INDEX_NAME}).",
+    )
+    search_parser.add_argument(
+        "--organization",
+        dest="organization",
+        default=None,
+        help="Only return matches from this organization's export.",
+    )
+    search_parser.add_argument("--limit", dest="limit", type=int, default=50, help="Maximum matches per index.")
+    search_parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=("text", "json"),
+        default="text",
+        help="Output format for the matches.",
+    )
+    search_parser.set_defaults(command="search")
+    return search_parser
+
+
+def _build_serve_parser(parent: argparse._SubParsersAction) -> argparse.ArgumentParser:
+    serve_parser = parent.add_parser(
+        "serve",
+        help="Serve reports from saved exports over local HTTP.",
+        description=(
+            "Load saved exports and render JSON sections, paginated asset views and report files on "
+            "request, keeping recently rendered reports in memory."
+        ),
+    )
+    serve_parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Saved exports: *-raw.json, NDJSON, export stores or directories of JSON files.",
+    )
+    serve_parser.add_argument("--host", dest="host", default="127.0.0.1", help="Address to listen on.")
+    serve_parser.add_argument("--port", dest="port", type=int, default=8000, help="Port to listen on.")
+    serve_parser.add_argument(
+        "--cache-mb",
+        dest="cache_mb",
+        type=int,
+        default=DEFAULT_CACHE_MB,
+        help=f"Memory for rendered reports, least recently used dropped first (default: {DEFAULT_CACHE_MB}).",
+    )
+    serve_parser.set_defaults(command="serve")
+    return serve_parser
+
+
 def build_parser(
     default_audience: str = "client",
     default_scope: ReportScope = DEFAULT_REPORT_SCOPE,
@@ -75,6 +359,11 @@ def build_parser(
     parser = argparse.ArgumentParser(prog="intune-doc", description="Generate Intune documentation exports.")
     subparsers = parser.add_subparsers(dest="command", required=True)
     _build_export_parser(subparsers, default_audience, default_scope, default_output)
+    _build_render_parser(subparsers, default_audience, default_scope, default_output)
+    _build_watch_parser(subparsers, default_audience, default_scope, default_output)
+    _build_diff_parser(subparsers)
+    _build_search_parser(subparsers)
+    _build_serve_parser(subparsers)
     return parser
 
 
@@ -83,17 +372,70 @@ def parse_args(
     default_audience: str = "client",
     default_scope: ReportScope = DEFAULT_REPORT_SCOPE,
     default_output: str = "intune-report",
-) -> ExportCommandOptions:
+) -> CommandOptions:
     parser = build_parser(default_audience, default_scope, default_output)
     parsed = parser.parse_args(list(args))
+    if parsed.command == "diff":
+        return DiffCommandOptions(
+            old=parsed.old,
+            new=parsed.new,
+            output_format=parsed.output_format,
+            output=parsed.output,
+        )
+    if parsed.command == "serve":
+        return ServeCommandOptions(
+            inputs=parsed.inputs,
+            host=parsed.host,
+            port=parsed.port,
+            cache_mb=parsed.cache_mb,
+        )
+    if parsed.command == "search":
+        return SearchCommandOptions(
+            query=" ".join(parsed.query),
+            indexes=parsed.indexes,
+            organization=parsed.organization,
+            limit=parsed.limit,
+            output_format=parsed.output_format,
+        )
+    formats = _parse_formats(parsed.formats)
+    try:
+        audiences = _parse_audiences(parsed.audiences, default_audience)
+        scopes = _parse_scopes(parsed.scopes, default_scope)
+    except ValueError as exc:
+        # These used to be argparse choices; keep reporting them as usage errors.
+        parser.error(str(exc))
+    if parsed.command == "render":
+        return RenderCommandOptions(
+            input=parsed.input,
+            formats=formats,
+            audiences=audiences,
+            scopes=scopes,
+            output=parsed.output,
+            organization=parsed.organization,
+            trace=parsed.trace,
+            profile_memory=parsed.profile_memory,
+        )
+    if parsed.command == "watch":
+        return WatchCommandOptions(
+            formats=formats,
+            audiences=audiences,
+            scopes=scopes,
+            output=parsed.output,
+            trace=parsed.trace,
+            profile_memory=parsed.profile_memory,
+            interval=parsed.interval,
+            full_refresh=parsed.full_refresh,
+            socket=parsed.socket,
+        )
     if parsed.command != "export":
         raise ValueError(f"Unknown command: {parsed.command}")
-    formats = _parse_formats(parsed.formats)
     return ExportCommandOptions(
         formats=formats,
-        audience=parsed.audience,
-        scope=parsed.scope,
+        audiences=audiences,
+        scopes=scopes,
         output=parsed.output,
+        trace=parsed.trace,
+        profile_memory=parsed.profile_memory,
     )
 
 
@@ -105,13 +447,67 @@ def _load_config_or_exit() -> AppConfig:
         raise SystemExit(1) from exc
 
 
-def _resolve_output_prefix(config: AppConfig, output: str) -> Path:
+def _load_output_config_or_exit() -> OutputConfig:
+    try:
+        return load_output_config(Path("config.yaml"))
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        raise SystemExit(1) from exc
+
+
+def _resolve_output_prefix(config: Union[AppConfig, OutputConfig], output: str) -> Path:
     output_path = Path(output)
     if output_path.is_absolute():
         return output_path
     return config.output_directory / output_path
 
 
+def _build_writer_options(report_options: ReportOptionsConfig) -> WriterOptions:
+    return WriterOptions(
+        excel_shard_by=report_options.excel_shard_by,
+        word_backend=report_options.word_backend,
+        word_shard_by=report_options.word_shard_by,
+        word_shard_size=report_options.word_shard_size,
+        render_cache_directory=(
+            str(report_options.render_cache_directory) if report_options.render_cache_directory else None
+        ),
+    )
+
+
+@contextmanager
+def _stage(name: str, category: str, **args: Any) -> Iterator[Dict[str, Any]]:
+    with span(name, category, **args) as span_args, memory.stage(name):
+        yield span_args
+
+
+def _write_report_variants(
+    report: ReportSchema,
+    options: Union[ExportCommandOptions, RenderCommandOptions],
+    config: Union[AppConfig, OutputConfig],
+) -> None:
+    output_prefix = _resolve_output_prefix(config, options.output)
+    with memory.stage("render reports"):
+        variants = render_report_variants(report, options.formats, options.audiences, options.scopes)
+    profiler = memory.active_profiler()
+    writer_options = memory.fit_writer_options(
+        _build_writer_options(config.report_options),
+        profiler,
+        "build_report_schema",
+        parallel_jobs=len(variants),
+    )
+    if profiler is not None and profiler.trace_allocations:
+        # Keep the writes in this process so each save is measured.
+        writer_options = replace(writer_options, max_workers=1)
+    write_rendered_variants(
+        {
+            variant_output_prefix(output_prefix, audience, scope, options.audiences, options.scopes): rendered
+            for (audience, scope), rendered in variants.items()
+        },
+        config.report_options.include_sections,
+        writer_options,
+    )
+
+
 def _resolve_organization(graph_client: GraphClient) -> str:
     response = graph_client.get("/organization", params={"$select": "displayName"})
     organizations = response.get("value", [])
@@ -120,41 +516,281 @@ def _resolve_organization(graph_client: GraphClient) -> str:
     return "Unknown organization"
 
 
-def main(argv: Optional[Iterable[str]] = None) -> int:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-    )
-    config = _load_config_or_exit()
-    options = parse_args(
-        list(sys.argv[1:]) if argv is None else argv,
-        default_audience=config.report_options.template_set,
-    )
+def _run_diff(options: DiffCommandOptions) -> int:
+    from .diff import diff_exports, format_diff
 
-    if config.use_device_code:
-        token = request_device_code_token(config.tenant_id, config.client_id)
+    try:
+        diff = diff_exports(Path(options.old), Path(options.new))
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    if options.output_format == "json":
+        text = json.dumps(asdict(diff), indent=2, ensure_ascii=False)
+    else:
+        text = format_diff(diff)
+    if options.output:
+        Path(options.output).write_text(f"{text}\n", encoding="utf-8")
     else:
-        token = request_client_credentials_token(
-            config.tenant_id,
-            config.client_id,
-            config.client_secret,
+        print(text)
+    return 0
+
+
+def _run_search(config: OutputConfig, options: SearchCommandOptions) -> int:
+    from .search import SearchIndex, format_hits, search_index_path
+
+    index_paths = [Path(index) for index in options.indexes] or [search_index_path(config.output_directory)]
+    hits = []
+    for index_path in index_paths:
+        if not index_path.exists():
+            print(f"Error: Search index not found: {index_path}", file=sys.stderr)
+            return 1
+        with SearchIndex(index_path) as index:
+            hits.extend(index.search(options.query, options.organization, options.limit))
+
+    if options.output_format == "json":
+        print(json.dumps([asdict(hit) for hit in hits], indent=2, ensure_ascii=False))
+    else:
+        print(format_hits(hits))
+    return 0
+
+
+def _update_search_index(config: Union[AppConfig, OutputConfig], report: ReportSchema) -> None:
+    from .search import search_index_path, update_search_index
+
+    index_path = search_index_path(config.output_directory)
+    with _stage("update search index", "save"):
+        update = update_search_index(index_path, report)
+    logging.getLogger(__name__).info(
+        "Search index %s: %d assets indexed, %d unchanged, %d removed",
+        index_path,
+        update.indexed,
+        update.unchanged,
+        update.removed,
+    )
+
+
+def _run_serve(config: OutputConfig, options: ServeCommandOptions) -> int:
+    from .server import ReportServer, load_export, make_http_server
+
+    report_options = config.report_options
+    exports = []
+    for input_name in options.inputs:
+        input_path = Path(input_name)
+        if not input_path.exists():
+            print(f"Error: Saved export not found: {input_path}", file=sys.stderr)
+            return 1
+        try:
+            with _stage(f"load {input_path.name}", "build"):
+                exports.append(
+                    load_export(input_path, effective_policies="effective_policies" in report_options.include_sections)
+                )
+        except (OSError, ValueError) as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            return 1
+
+    report_server = ReportServer(
+        exports,
+        report_options.include_sections,
+        _build_writer_options(report_options),
+        cache_bytes=options.cache_mb * 1024 * 1024,
+        default_audience=report_options.template_set,
+    )
+    http_server = make_http_server(report_server, options.host, options.port)
+    logger = logging.getLogger(__name__)
+    for export in exports:
+        logger.info(
+            "Serving %s (%s) at /exports/%s",
+            export.source,
+            export.report.metadata.organization,
+            export.export_hash,
         )
+    logger.info("Listening on http://%s:%d", options.host, http_server.server_port)
+    try:
+        http_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http_server.server_close()
+    return 0
+
+
+def _run_render(config: OutputConfig, options: RenderCommandOptions) -> int:
+    from .raw_export import open_raw_export
 
-    graph_client = GraphClient(token.access_token)
-    raw_export = export_all(graph_client)
-    organization = _resolve_organization(graph_client)
-    report = build_report_schema(
-        raw_export,
-        audience=options.audience,
-        organization=organization,
-        generated_at=raw_export.get("generatedAt"),
+    input_path = Path(options.input)
+    if not input_path.exists():
+        print(f"Error: Saved export not found: {input_path}", file=sys.stderr)
+        return 1
+
+    try:
+        # Assets are decoded one at a time while the schema is built.
+        with _stage("build_report_schema", "build"):
+            report = build_report_schema(
+                open_raw_export(input_path),
+                audience=options.audience,
+                organization=options.organization,
+                effective_policies="effective_policies" in config.report_options.include_sections,
+            )
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    _write_report_variants(report, options, config)
+    if config.report_options.include_search_index:
+        _update_search_index(config, report)
+    return 0
+
+
+def _export_report(
+    config: AppConfig,
+    options: Union[ExportCommandOptions, WatchCommandOptions],
+    graph_client: GraphClient,
+) -> Tuple[Dict[str, Any], ReportSchema]:
+    report_options = config.report_options
+    # Fetch only what the requested reports use; a saved raw export or store
+    # keeps settings so it can be rendered in any scope later, and the search
+    # index needs them to be searchable.
+    plan = plan_export(
+        options.scopes,
+        report_options.include_sections,
+        report_options.asset_types,
+        keep_settings=(
+            report_options.include_raw_exports
+            or report_options.include_export_store
+            or report_options.include_search_index
+        ),
     )
-    rendered = render_reports(report, options.formats, options.audience, options.scope)
+    with _stage("export_all", "export"):
+        raw_export = export_all(graph_client, plan, report_options.export_workers)
+    graph_client.save_caches()
+    with span("resolve_organization", "graph"):
+        organization = _resolve_organization(graph_client)
+    # Saved with the raw export so `render` can reuse it.
+    raw_export["organization"] = organization
+    with _stage("build_report_schema", "build", assets=len(raw_export["assets"])):
+        report = build_report_schema(
+            raw_export,
+            audience=options.audience,
+            organization=organization,
+            generated_at=raw_export.get("generatedAt"),
+            effective_policies="effective_policies" in report_options.include_sections,
+        )
+    return raw_export, report
 
-    output_prefix = _resolve_output_prefix(config, options.output)
-    write_rendered_reports(rendered, output_prefix, config.report_options.include_sections)
 
+def _write_export_outputs(
+    config: AppConfig,
+    options: Union[ExportCommandOptions, WatchCommandOptions],
+    raw_export: Dict[str, Any],
+    report: ReportSchema,
+) -> None:
+    _write_report_variants(report, options, config)
+
+    output_prefix = _resolve_output_prefix(config, options.output)
     if config.report_options.include_raw_exports:
         write_raw_export(raw_export, output_prefix)
+    if config.report_options.include_export_store:
+        from .store import write_export_store
 
+        with _stage("save export store", "save"):
+            write_export_store(raw_export, output_prefix)
+    if config.report_options.include_search_index:
+        _update_search_index(config, report)
+
+
+def _run_export(config: AppConfig, options: ExportCommandOptions) -> int:
+    with span("auth", "auth", device_code=config.use_device_code):
+        if config.use_device_code:
+            token = request_device_code_token(config.tenant_id, config.client_id)
+        else:
+            token = request_client_credentials_token(
+                config.tenant_id,
+                config.client_id,
+                config.client_secret,
+            )
+
+    graph_client = GraphClient(token.access_token, cache_directory=config.report_options.graph_cache_directory)
+    raw_export, report = _export_report(config, options, graph_client)
+    _write_export_outputs(config, options, raw_export, report)
+    return 0
+
+
+def _run_watch(config: AppConfig, options: WatchCommandOptions) -> int:
+    from .daemon import Watcher
+
+    token_provider = TokenProvider(
+        config.tenant_id,
+        config.client_id,
+        config.client_secret,
+        config.use_device_code,
+    )
+    with span("auth", "auth", device_code=config.use_device_code):
+        token = token_provider()
+    # One client for the life of the daemon, so its caches stay warm.
+    graph_client = GraphClient(
+        token,
+        cache_directory=config.report_options.graph_cache_directory,
+        token_provider=token_provider,
+    )
+    watcher = Watcher(
+        graph_client,
+        export=lambda: _export_report(config, options, graph_client),
+        write=lambda raw_export, report: _write_export_outputs(config, options, raw_export, report),
+        interval_seconds=options.interval,
+        full_refresh_seconds=options.full_refresh,
+    )
+    try:
+        watcher.run(Path(options.socket) if options.socket else None)
+    except KeyboardInterrupt:
+        pass
     return 0
+
+
+def _run_instrumented(
+    options: Union[ExportCommandOptions, RenderCommandOptions],
+    memory_budget_mb: Optional[int],
+    run: Callable[[], int],
+) -> int:
+    logger = logging.getLogger(__name__)
+    if options.trace:
+        tracing.start_tracing()
+    if options.profile_memory or memory_budget_mb:
+        memory.start_profiling(memory_budget_mb, trace_allocations=bool(options.profile_memory))
+    try:
+        return run()
+    finally:
+        tracer = tracing.stop_tracing()
+        if tracer is not None and options.trace:
+            logger.info("Wrote trace to %s", tracer.write(Path(options.trace)))
+        profiler = memory.stop_profiling()
+        if profiler is not None and options.profile_memory:
+            logger.info("Memory by stage:\n%s", profiler.summary())
+            logger.info("Wrote memory profile to %s", profiler.write(Path(options.profile_memory)))
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    args = list(sys.argv[1:]) if argv is None else list(argv)
+    # Validate arguments (and answer --help) before touching config.yaml;
+    # only export needs tenant credentials from it.
+    options = parse_args(args)
+    if isinstance(options, DiffCommandOptions):
+        return _run_diff(options)
+    if isinstance(options, SearchCommandOptions):
+        return _run_search(_load_output_config_or_exit(), options)
+    if isinstance(options, ServeCommandOptions):
+        return _run_serve(_load_output_config_or_exit(), options)
+    if isinstance(options, RenderCommandOptions):
+        output_config = _load_output_config_or_exit()
+        options = parse_args(args, default_audience=output_config.report_options.template_set)
+        budget = output_config.report_options.memory_budget_mb
+        return _run_instrumented(options, budget, lambda: _run_render(output_config, options))
+
+    config = _load_config_or_exit()
+    options = parse_args(args, default_audience=config.report_options.template_set)
+    if isinstance(options, WatchCommandOptions):
+        return _run_instrumented(options, config.report_options.memory_budget_mb, lambda: _run_watch(config, options))
+    return _run_instrumented(options, config.report_options.memory_budget_mb, lambda: _run_export(config, options))
@@ -2,16 +2,42 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import yaml
 
+from .exporters.plan import ASSET_TYPES
+from .exporters.scheduler import DEFAULT_EXPORT_WORKERS
+
 
 @dataclass(frozen=True)
 class ReportOptionsConfig:
     template_set: str = "client"
     include_sections: List[str] = field(default_factory=list)
+    asset_types: List[str] = field(default_factory=list)
     include_raw_exports: bool = False
+    include_export_store: bool = False
+    include_search_index: bool = False
+    excel_shard_by: str = "sheet"
+    word_backend: str = "python-docx"
+    word_shard_by: str = "none"
+    word_shard_size: int = 500
+    render_cache_directory: Optional[Path] = None
+    memory_budget_mb: Optional[int] = None
+    export_workers: int = DEFAULT_EXPORT_WORKERS
+    graph_cache_directory: Optional[Path] = None
+
+
+EXCEL_SHARD_MODES = ("sheet", "policy_type", "group")
+WORD_BACKENDS = ("python-docx", "stream")
+WORD_SHARD_MODES = ("none", "asset_type", "chunk")
+
+# Defaults of the watch, serve and search commands, kept here so the CLI can
+# show them without importing the modules that implement those commands.
+DEFAULT_POLL_INTERVAL_SECONDS = 15 * 60
+DEFAULT_FULL_REFRESH_SECONDS = 24 * 60 * 60
+DEFAULT_CACHE_MB = 256
+SEARCH_INDEX_NAME = "search-index.sqlite"
 
 
 @dataclass(frozen=True)
@@ -24,16 +50,78 @@ class AppConfig:
     report_options: ReportOptionsConfig
 
 
+@dataclass(frozen=True)
+class OutputConfig:
+    output_directory: Path = Path("./output")
+    report_options: ReportOptionsConfig = field(default_factory=ReportOptionsConfig)
+
+
 def _parse_report_options(payload: dict) -> ReportOptionsConfig:
     payload = payload or {}
     include_sections = payload.get("include_sections") or []
     if not isinstance(include_sections, list):
         raise ValueError("report_options.include_sections must be a list")
+    asset_types = payload.get("asset_types") or []
+    if not isinstance(asset_types, list):
+        raise ValueError("report_options.asset_types must be a list")
+    asset_types = [str(asset_type).strip() for asset_type in asset_types if str(asset_type).strip()]
+    unknown_types = [asset_type for asset_type in asset_types if asset_type not in ASSET_TYPES]
+    if unknown_types:
+        raise ValueError(f"report_options.asset_types must be one of: {', '.join(ASSET_TYPES)}")
+
+    excel_shard_by = str(payload.get("excel_shard_by") or "sheet").strip()
+    if excel_shard_by not in EXCEL_SHARD_MODES:
+        raise ValueError(
+            f"report_options.excel_shard_by must be one of: {', '.join(EXCEL_SHARD_MODES)}"
+        )
+    word_backend = str(payload.get("word_backend") or "python-docx").strip()
+    if word_backend not in WORD_BACKENDS:
+        raise ValueError(f"report_options.word_backend must be one of: {', '.join(WORD_BACKENDS)}")
+    word_shard_by = str(payload.get("word_shard_by") or "none").strip()
+    if word_shard_by not in WORD_SHARD_MODES:
+        raise ValueError(f"report_options.word_shard_by must be one of: {', '.join(WORD_SHARD_MODES)}")
+    try:
+        word_shard_size = int(payload.get("word_shard_size", 500))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("report_options.word_shard_size must be an integer") from exc
+    if word_shard_size < 1:
+        raise ValueError("report_options.word_shard_size must be at least 1")
+    render_cache_directory = payload.get("render_cache_directory")
+    if render_cache_directory is not None and not isinstance(render_cache_directory, str):
+        raise ValueError("report_options.render_cache_directory must be a path")
+    graph_cache_directory = payload.get("graph_cache_directory")
+    if graph_cache_directory is not None and not isinstance(graph_cache_directory, str):
+        raise ValueError("report_options.graph_cache_directory must be a path")
+    try:
+        export_workers = int(payload.get("export_workers", DEFAULT_EXPORT_WORKERS))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("report_options.export_workers must be an integer") from exc
+    if export_workers < 1:
+        raise ValueError("report_options.export_workers must be at least 1")
+    memory_budget_mb = payload.get("memory_budget_mb")
+    if memory_budget_mb is not None:
+        try:
+            memory_budget_mb = int(memory_budget_mb)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("report_options.memory_budget_mb must be an integer") from exc
+        if memory_budget_mb < 1:
+            raise ValueError("report_options.memory_budget_mb must be at least 1")
 
     return ReportOptionsConfig(
         template_set=payload.get("template_set", "client"),
         include_sections=[str(section).strip() for section in include_sections if str(section).strip()],
+        asset_types=asset_types,
         include_raw_exports=bool(payload.get("include_raw_exports", False)),
+        include_export_store=bool(payload.get("include_export_store", False)),
+        include_search_index=bool(payload.get("include_search_index", False)),
+        excel_shard_by=excel_shard_by,
+        word_backend=word_backend,
+        word_shard_by=word_shard_by,
+        word_shard_size=word_shard_size,
+        render_cache_directory=Path(render_cache_directory) if render_cache_directory else None,
+        memory_budget_mb=memory_budget_mb,
+        export_workers=export_workers,
+        graph_cache_directory=Path(graph_cache_directory) if graph_cache_directory else None,
     )
 
 
@@ -69,3 +157,18 @@ def load_config(path: Path) -> AppConfig:
         output_directory=output_directory,
         report_options=report_options,
     )
+
+
+def load_output_config(path: Path) -> OutputConfig:
+    """Load only the output settings, for commands that never call Graph.
+
+    Tenant credentials are not required, and a missing file yields the defaults.
+    """
+    if not path.exists():
+        return OutputConfig()
+
+    payload = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    return OutputConfig(
+        output_directory=Path(payload.get("output_directory", "./output")),
+        report_options=_parse_report_options(payload.get("report_options", {})),
+    )
@@ -0,0 +1,221 @@
+"""Watch mode: keep one Graph client warm and re-export when the tenant changes.
+
+Every poll asks Graph for Intune audit events since the last export, which is
+one small request. The tenant is exported again only when there are some, or
+when a full refresh is due (group membership and other changes that are not
+audited). The export reuses the same :class:`GraphClient`, token provider and
+named caches as every earlier run; only its memo of GET responses is cleared
+before each poll. Reports are rewritten only when an asset's
+content hash changed; with a render cache, only those assets are rendered
+again.
+
+A Unix socket accepts one command per line and answers with one JSON line:
+``run`` (export now), ``status`` and ``stop``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+import urllib.error
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .config import DEFAULT_FULL_REFRESH_SECONDS, DEFAULT_POLL_INTERVAL_SECONDS
+from .graph_client import GraphClient
+from .reports.schema import ReportSchema
+
+logger = logging.getLogger(__name__)
+
+AssetKey = Tuple[str, str]
+ExportRun = Callable[[], Tuple[Dict[str, Any], ReportSchema]]
+WriteRun = Callable[[Dict[str, Any], ReportSchema], None]
+
+
+@dataclass
+class WatchStatus:
+    checks: int = 0
+    exports: int = 0
+    writes: int = 0
+    last_check: Optional[str] = None
+    last_export: Optional[str] = None
+    # What the last poll did: skipped, unchanged, written or failed.
+    last_result: str = ""
+    changed_assets: int = 0
+
+
+def _utc_timestamp(epoch_seconds: float) -> str:
+    return datetime.fromtimestamp(epoch_seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def asset_hashes(report: ReportSchema) -> Dict[AssetKey, str]:
+    return {(asset.asset_type, asset.asset_id): asset.content_hash for asset in report.assets}
+
+
+def count_changed_assets(previous: Dict[AssetKey, str], current: Dict[AssetKey, str]) -> int:
+    """Assets added, removed or modified between two exports."""
+    return sum(1 for key in previous.keys() | current.keys() if previous.get(key) != current.get(key))
+
+
+def audit_events_since(graph_client: GraphClient, since: str) -> Optional[bool]:
+    """Whether Intune logged any audit event after ``since``; None if the check failed."""
+    try:
+        response = graph_client.get(
+            "/deviceManagement/auditEvents",
+            params={"$filter": f"activityDateTime gt {since}", "$select": "id,activityDateTime", "$top": "1"},
+            log_errors=False,
+        )
+    except (urllib.error.URLError, OSError, ValueError) as exc:
+        logger.warning("Checking Intune audit events failed: %s", exc)
+        return None
+    return bool(response.get("value"))
+
+
+class Watcher:
+    """Polls one tenant and re-exports it when it changed.
+
+    ``export`` runs the export and builds the report schema; ``write`` writes
+    the reports and any saved exports. Both are called from the polling thread
+    only, one poll at a time.
+    """
+
+    def __init__(
+        self,
+        graph_client: GraphClient,
+        export: ExportRun,
+        write: WriteRun,
+        interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        full_refresh_seconds: float = DEFAULT_FULL_REFRESH_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.graph_client = graph_client
+        self.export = export
+        self.write = write
+        self.interval_seconds = interval_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+        self.clock = clock
+        self.status = WatchStatus()
+        self._hashes: Optional[Dict[AssetKey, str]] = None
+        self._exported_at: Optional[float] = None
+        self._wake = threading.Event()
+        self._run_requested = threading.Event()
+        self._stopping = threading.Event()
+
+    def poll(self, force: bool = False) -> str:
+        """Check the tenant once and export and write it if needed."""
+        now = self.clock()
+        self.status.checks += 1
+        self.status.last_check = _utc_timestamp(now)
+        # Each poll is a new run: GET responses remembered by the last one are stale.
+        self.graph_client.clear_memo()
+        if not force and self._exported_at is not None:
+            due = now - self._exported_at >= self.full_refresh_seconds
+            if not due:
+                changed = audit_events_since(self.graph_client, _utc_timestamp(self._exported_at))
+                if changed is False:
+                    self.status.last_result = "skipped"
+                    return self.status.last_result
+                if changed is None:
+                    logger.warning("Could not tell whether the tenant changed; exporting it anyway.")
+
+        try:
+            raw_export, report = self.export()
+        except Exception:
+            logger.exception("Watch export failed; trying again at the next poll.")
+            self.status.last_result = "failed"
+            return self.status.last_result
+        self.status.exports += 1
+        self.status.last_export = _utc_timestamp(now)
+
+        hashes = asset_hashes(report)
+        changed = len(hashes) if self._hashes is None else count_changed_assets(self._hashes, hashes)
+        self.status.changed_assets = changed
+        if self._hashes is not None and not changed:
+            # Changes made while the export ran are picked up by the next check.
+            self._exported_at = now
+            self.status.last_result = "unchanged"
+            return self.status.last_result
+        try:
+            self.write(raw_export, report)
+        except Exception:
+            logger.exception("Writing the watch reports failed; trying again at the next poll.")
+            self.status.last_result = "failed"
+            return self.status.last_result
+        self._hashes = hashes
+        self._exported_at = now
+        self.status.writes += 1
+        self.status.last_result = "written"
+        logger.info("Wrote reports for %d changed assets.", changed)
+        return self.status.last_result
+
+    def request_run(self) -> None:
+        self._run_requested.set()
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+
+    def handle_command(self, command: str) -> Dict[str, Any]:
+        if command == "run":
+            self.request_run()
+            return {"ok": True, "queued": True}
+        if command == "status":
+            return {"ok": True, **asdict(self.status)}
+        if command == "stop":
+            self.stop()
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown command: {command}. Use run, status or stop."}
+
+    def run(self, socket_path: Optional[Path] = None) -> None:
+        """Poll until stopped; the first poll always exports."""
+        server = _start_control_server(self, socket_path) if socket_path is not None else None
+        try:
+            force = True
+            while not self._stopping.is_set():
+                self.poll(force=force)
+                self._wake.wait(self.interval_seconds)
+                self._wake.clear()
+                force = self._run_requested.is_set()
+                self._run_requested.clear()
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+                Path(socket_path).unlink(missing_ok=True)
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        command = self.rfile.readline().decode("utf-8").strip()
+        response = self.server.watcher.handle_command(command)
+        self.wfile.write(f"{json.dumps(response)}\n".encode("utf-8"))
+
+
+def _start_control_server(watcher: Watcher, socket_path: Path) -> socketserver.ThreadingUnixStreamServer:
+    socket_path = Path(socket_path)
+    # A socket left behind by a daemon that did not shut down cleanly.
+    socket_path.unlink(missing_ok=True)
+    server = socketserver.ThreadingUnixStreamServer(str(socket_path), _ControlHandler)
+    os.chmod(socket_path, 0o600)
+    server.watcher = watcher
+    threading.Thread(target=server.serve_forever, name="watch-control", daemon=True).start()
+    logger.info("Accepting run, status and stop commands on %s", socket_path)
+    return server
+
+
+def send_control_command(socket_path: Path, command: str, timeout: float = 10.0) -> Dict[str, Any]:
+    """Send one command to a running watcher and return its answer."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        client.sendall(f"{command}\n".encode("utf-8"))
+        with client.makefile("rb") as reader:
+            return json.loads(reader.readline().decode("utf-8"))
@@ -0,0 +1,230 @@
+"""Drift diff between two raw exports.
+
+The older export is indexed by ``(type, id)`` and the newer export is then
+streamed past that index once. Unchanged assets cost a single content-hash
+comparison. Only assets whose hash differs are broken down into per-setting
+and per-assignment hashes and compared key by key. The whole diff is linear in
+the number of assets and settings.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .raw_export import iter_raw_assets
+from .reports.builder import build_asset_detail
+from .reports.hashing import content_hash, text_hash
+from .reports.rendering import distill_assignment_mappings
+from .reports.schema import AssetDetail
+from .reports.setting_rows import stringify_setting_value
+
+
+PREVIEW_LENGTH = 200
+
+AssetKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class AssetRef:
+    asset_type: str
+    asset_id: str
+    name: str
+
+
+@dataclass(frozen=True)
+class SettingChange:
+    setting: str
+    change: str
+    old_value: Optional[str] = None
+    new_value: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class AssignmentChange:
+    target: str
+    change: str
+    old_assignment: Optional[str] = None
+    new_assignment: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class AssetChange:
+    asset_type: str
+    asset_id: str
+    name: str
+    previous_name: Optional[str] = None
+    setting_changes: List[SettingChange] = field(default_factory=list)
+    assignment_changes: List[AssignmentChange] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class ExportDiff:
+    added: List[AssetRef]
+    removed: List[AssetRef]
+    modified: List[AssetChange]
+    unchanged: int
+
+
+def _preview(value: str) -> str:
+    return value if len(value) <= PREVIEW_LENGTH else f"{value[:PREVIEW_LENGTH]}…"
+
+
+def _unique_key(key: str, seen: Dict[str, Any]) -> str:
+    if key not in seen:
+        return key
+    suffix = 2
+    while f"{key} #{suffix}" in seen:
+        suffix += 1
+    return f"{key} #{suffix}"
+
+
+def _assignment_key(mapping: Dict[str, Any]) -> str:
+    target = mapping.get("groupDisplayName") or mapping.get("groupId") or mapping.get("targetType") or "unknown"
+    return f"{mapping.get('assignmentType') or 'include'}: {target}"
+
+
+# Both maps are name/target -> (hash, preview shown in the report).
+def _setting_hashes(asset: AssetDetail) -> Dict[str, Tuple[str, str]]:
+    settings: Dict[str, Tuple[str, str]] = {}
+    for row in asset.setting_rows:
+        settings[_unique_key(row["setting"], settings)] = (text_hash(row["value"]), _preview(row["value"]))
+    return settings
+
+
+def _assignment_hashes(asset: AssetDetail) -> Dict[str, Tuple[str, str]]:
+    assignments: Dict[str, Tuple[str, str]] = {}
+    for mapping in asset.assignment_mappings or distill_assignment_mappings(asset.assignments):
+        details = {
+            name: value
+            for name, value in mapping.items()
+            if value is not None and name not in ("groupDisplayName", "assignmentType")
+        }
+        assignments[_unique_key(_assignment_key(mapping), assignments)] = (
+            content_hash(mapping),
+            _preview(stringify_setting_value(details)),
+        )
+    return assignments
+
+
+def _asset_key(asset: AssetDetail) -> AssetKey:
+    return asset.asset_type, asset.asset_id
+
+
+def index_assets(raw_assets: Iterable[Dict[str, Any]]) -> Dict[AssetKey, AssetDetail]:
+    index: Dict[AssetKey, AssetDetail] = {}
+    for raw_asset in raw_assets:
+        asset = build_asset_detail(raw_asset)
+        index.setdefault(_asset_key(asset), asset)
+    return index
+
+
+def _compare(
+    old: Dict[str, Tuple[str, str]],
+    new: Dict[str, Tuple[str, str]],
+) -> Iterable[Tuple[str, str, Optional[str], Optional[str]]]:
+    for key, (new_hash, new_preview) in new.items():
+        previous = old.get(key)
+        if previous is None:
+            yield key, "added", None, new_preview
+        elif previous[0] != new_hash:
+            yield key, "modified", previous[1], new_preview
+    for key, (_, old_preview) in old.items():
+        if key not in new:
+            yield key, "removed", old_preview, None
+
+
+def _asset_change(old: AssetDetail, new: AssetDetail) -> AssetChange:
+    return AssetChange(
+        asset_type=new.asset_type,
+        asset_id=new.asset_id,
+        name=new.name,
+        previous_name=old.name if old.name != new.name else None,
+        setting_changes=[
+            SettingChange(*change) for change in _compare(_setting_hashes(old), _setting_hashes(new))
+        ],
+        assignment_changes=[
+            AssignmentChange(*change) for change in _compare(_assignment_hashes(old), _assignment_hashes(new))
+        ],
+    )
+
+
+def diff_assets(
+    old_assets: Iterable[Dict[str, Any]],
+    new_assets: Iterable[Dict[str, Any]],
+) -> ExportDiff:
+    old_index = index_assets(old_assets)
+    seen: set[AssetKey] = set()
+    added: List[AssetRef] = []
+    modified: List[AssetChange] = []
+    unchanged = 0
+
+    for raw_asset in new_assets:
+        asset = build_asset_detail(raw_asset)
+        key = _asset_key(asset)
+        if key in seen:
+            continue
+        seen.add(key)
+        previous = old_index.get(key)
+        if previous is None:
+            added.append(AssetRef(asset.asset_type, asset.asset_id, asset.name))
+        elif previous.content_hash == asset.content_hash:
+            unchanged += 1
+        else:
+            modified.append(_asset_change(previous, asset))
+
+    removed = [
+        AssetRef(asset.asset_type, asset.asset_id, asset.name)
+        for key, asset in old_index.items()
+        if key not in seen
+    ]
+    return ExportDiff(
+        added=sorted(added, key=lambda ref: (ref.asset_type, ref.asset_id)),
+        removed=sorted(removed, key=lambda ref: (ref.asset_type, ref.asset_id)),
+        modified=sorted(modified, key=lambda change: (change.asset_type, change.asset_id)),
+        unchanged=unchanged,
+    )
+
+
+def diff_exports(old_path: Path, new_path: Path) -> ExportDiff:
+    """Compare two raw exports (``*-raw.json`` or NDJSON)."""
+    return diff_assets(iter_raw_assets(old_path), iter_raw_assets(new_path))
+
+
+def format_diff(diff: ExportDiff) -> str:
+    lines = [
+        f"Assets: {len(diff.added)} added, {len(diff.removed)} removed, "
+        f"{len(diff.modified)} modified, {diff.unchanged} unchanged"
+    ]
+    for ref in diff.added:
+        lines.append(f"+ {ref.asset_type}/{ref.asset_id}  {ref.name}")
+    for ref in diff.removed:
+        lines.append(f"- {ref.asset_type}/{ref.asset_id}  {ref.name}")
+    for change in diff.modified:
+        lines.append(f"~ {change.asset_type}/{change.asset_id}  {change.name}")
+        if change.previous_name:
+            lines.append(f"    renamed from: {change.previous_name}")
+        if not (change.previous_name or change.setting_changes or change.assignment_changes):
+            lines.append("    description or other details changed")
+        for setting in change.setting_changes:
+            lines.append(_format_change("setting", setting.setting, setting.change, setting.old_value, setting.new_value))
+        for assignment in change.assignment_changes:
+            lines.append(
+                _format_change(
+                    "assignment",
+                    assignment.target,
+                    assignment.change,
+                    assignment.old_assignment,
+                    assignment.new_assignment,
+                )
+            )
+    return "\n".join(lines)
+
+
+def _format_change(kind: str, name: str, change: str, old: Optional[str], new: Optional[str]) -> str:
+    if change == "added":
+        return f"    {kind} added: {name} = {new}"
+    if change == "removed":
+        return f"    {kind} removed: {name} (was {old})"
+    return f"    {kind} changed: {name}: {old} -> {new}"
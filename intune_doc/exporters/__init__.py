@@ -1,21 +1,39 @@
+from .app_configurations import export_app_configurations
+from .app_protection_policies import export_app_protection_policies
+from .assignment_filters import export_assignment_filters
 from .autopilot_profiles import export_autopilot_profiles
+from .compliance_policies import export_compliance_policies
 from .device_configurations import export_device_configurations
 from .enrollment_profiles import export_enrollment_profiles
+from .group_policy_configurations import export_group_policy_configurations
 from .images import export_images
 from .initial_access_policies import export_initial_access_policies
+from .intents import export_intents
+from .mobile_apps import export_mobile_apps
+from .notification_templates import export_notification_templates
 from .provisioning_profiles import export_provisioning_profiles
 from .scripts import export_scripts
 from .settings_catalog import export_settings_catalog
+from .update_profiles import export_update_profiles
 from .windows365 import export_windows365
 
 __all__ = [
+    "export_app_configurations",
+    "export_app_protection_policies",
+    "export_assignment_filters",
     "export_autopilot_profiles",
+    "export_compliance_policies",
     "export_device_configurations",
     "export_enrollment_profiles",
+    "export_group_policy_configurations",
     "export_images",
     "export_initial_access_policies",
+    "export_intents",
+    "export_mobile_apps",
+    "export_notification_templates",
     "export_provisioning_profiles",
     "export_scripts",
     "export_settings_catalog",
+    "export_update_profiles",
     "export_windows365",
 ]
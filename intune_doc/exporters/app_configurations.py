@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
+
+
+def _extract_device_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "targetedMobileApps": raw.get("targetedMobileApps"),
+        "settings": raw.get("settings"),
+        "encodedSettingXml": raw.get("encodedSettingXml"),
+    }
+
+
+def _extract_app_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "appGroupType": raw.get("appGroupType"),
+        "customSettings": raw.get("customSettings"),
+        "targetedAppManagementLevels": raw.get("targetedAppManagementLevels"),
+    }
+
+
+RESOURCES = [
+    ResourceDefinition(
+        type_key="app_configurations",
+        graph_resource_name="managedDeviceMobileAppConfiguration",
+        collection_path="/deviceAppManagement/mobileAppConfigurations",
+        assignment_path_template="/deviceAppManagement/mobileAppConfigurations/{id}/assignments",
+        settings_extractor=_extract_device_settings,
+        reference_fields=("roleScopeTagIds",),
+    ),
+    ResourceDefinition(
+        type_key="app_configurations",
+        graph_resource_name="targetedManagedAppConfiguration",
+        collection_path="/deviceAppManagement/targetedManagedAppConfigurations",
+        assignment_path_template="/deviceAppManagement/targetedManagedAppConfigurations/{id}/assignments",
+        settings_extractor=_extract_app_settings,
+        reference_fields=("roleScopeTagIds",),
+        query_params={"$select": "id,displayName,description,appGroupType,customSettings,targetedAppManagementLevels"},
+    ),
+]
+
+
+def export_app_configurations(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
+
+_METADATA_KEYS = {
+    "@odata.type",
+    "id",
+    "displayName",
+    "description",
+    "createdDateTime",
+    "lastModifiedDateTime",
+    "version",
+    "roleScopeTagIds",
+    "isAssigned",
+    "deployedAppCount",
+}
+
+
+def _extract_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in raw.items() if key not in _METADATA_KEYS}
+
+
+def _protection_resource(graph_resource_name: str, collection: str) -> ResourceDefinition:
+    return ResourceDefinition(
+        type_key="app_protection_policies",
+        graph_resource_name=graph_resource_name,
+        collection_path=f"/deviceAppManagement/{collection}",
+        assignment_path_template=f"/deviceAppManagement/{collection}/{{id}}/assignments",
+        settings_extractor=_extract_settings,
+        reference_fields=("roleScopeTagIds",),
+    )
+
+
+RESOURCES = [
+    _protection_resource("iosManagedAppProtection", "iosManagedAppProtections"),
+    _protection_resource("androidManagedAppProtection", "androidManagedAppProtections"),
+    _protection_resource("windowsManagedAppProtection", "windowsManagedAppProtections"),
+]
+
+
+def export_app_protection_policies(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
+
+
+def _extract_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "platform": raw.get("platform"),
+        "rule": raw.get("rule"),
+        "assignmentFilterManagementType": raw.get("assignmentFilterManagementType"),
+    }
+
+
+RESOURCES = [
+    ResourceDefinition(
+        type_key="assignment_filters",
+        graph_resource_name="deviceAndAppManagementAssignmentFilter",
+        collection_path="/deviceManagement/assignmentFilters",
+        # Filters refine other policies' assignments and have none of their own.
+        assignment_path_template=None,
+        settings_extractor=_extract_settings,
+        query_params={"$select": "id,displayName,description,platform,rule,assignmentFilterManagementType"},
+    ),
+]
+
+
+def export_assignment_filters(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
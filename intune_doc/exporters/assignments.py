@@ -4,8 +4,15 @@ import logging
 import urllib.error
 from typing import Any, Dict, Iterable, List, Mapping, Optional
 
+from ..tracing import span
+
 logger = logging.getLogger(__name__)
 
+# Resolved groups are reused by the policies of a run and, in watch mode or with
+# a Graph cache directory, by the runs within the hour.
+GROUP_CACHE_NAME = "groups"
+GROUP_CACHE_TTL_SECONDS = 60 * 60
+
 
 def _chunked(items: Iterable[str], size: int = 15) -> Iterable[List[str]]:
     batch: List[str] = []
@@ -43,16 +50,19 @@ def _extract_assignment_target(assignment: Mapping[str, Any]) -> Optional[Dict[s
     return {
         "groupId": group_id,
         "assignmentType": _assignment_type(target),
+        "filterId": target.get("deviceAndAppManagementAssignmentFilterId"),
+        "filterType": target.get("deviceAndAppManagementAssignmentFilterType"),
     }
 
 
 def _resolve_groups(graph_client: Any, group_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
-    resolved: Dict[str, Dict[str, Any]] = {}
     ids = [group_id for group_id in group_ids if group_id]
     if not ids:
-        return resolved
+        return {}
 
-    for batch in _chunked(ids):
+    cache = graph_client.cache(GROUP_CACHE_NAME, GROUP_CACHE_TTL_SECONDS)
+    resolved: Dict[str, Dict[str, Any]] = cache.get_many(ids)
+    for batch in _chunked(group_id for group_id in ids if group_id not in resolved):
         filter_value = ",".join(f"'{group_id}'" for group_id in batch)
         try:
             response = graph_client.get(
@@ -72,16 +82,19 @@ def _resolve_groups(graph_client: Any, group_ids: Iterable[str]) -> Dict[str, Di
             raise
         for group in response.get("value", []):
             resolved[group.get("id")] = group
+            cache.put(group.get("id"), group)
 
     return resolved
 
 
 def collect_assignments(graph_client: Any, assignment_path: str) -> List[Dict[str, Any]]:
-    response = graph_client.get(assignment_path)
+    with span("collect_assignments", "graph", path=assignment_path):
+        response = graph_client.get(assignment_path)
     assignments = response.get("value", [])
     targets = [_extract_assignment_target(assignment) for assignment in assignments]
     group_ids = [target["groupId"] for target in targets if target]
-    resolved_groups = _resolve_groups(graph_client, group_ids)
+    with span("resolve_groups", "graph", groups=len(group_ids)):
+        resolved_groups = _resolve_groups(graph_client, group_ids)
 
     normalized: List[Dict[str, Any]] = []
     for assignment, target in zip(assignments, targets):
@@ -102,6 +115,8 @@ def collect_assignments(graph_client: Any, assignment_path: str) -> List[Dict[st
                     "groupType": group_type,
                     "groupDynamicRule": group.get("membershipRule") if group_type == "dynamic" else None,
                     "assignmentType": target["assignmentType"],
+                    "filterId": target["filterId"],
+                    "filterType": target["filterType"] if target["filterId"] else None,
                 },
                 "intent": assignment.get("intent") or assignment.get("installIntent") or "notApplicable",
                 "delivery": assignment.get("delivery"),
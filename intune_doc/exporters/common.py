@@ -2,15 +2,20 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import logging
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
 import urllib.error
 
+from ..tracing import span
 from .assignments import collect_assignments
 
+if TYPE_CHECKING:
+    from .plan import ExportPlan
+
 logger = logging.getLogger(__name__)
 
 
 SettingsExtractor = Callable[[Dict[str, Any]], Dict[str, Any]]
+DetailLoader = Callable[[Any, Dict[str, Any]], Dict[str, Any]]
 
 
 @dataclass(frozen=True)
@@ -18,16 +23,40 @@ class ResourceDefinition:
     type_key: str
     graph_resource_name: str
     collection_path: str
-    assignment_path_template: str
+    # None for resources that cannot be assigned.
+    assignment_path_template: Optional[str]
     display_name_key: str = "displayName"
     settings_extractor: Optional[SettingsExtractor] = None
     query_params: Optional[Dict[str, str]] = None
+    # Fields holding ids of other objects (scope tags, images) that are
+    # resolved to names after the export; always selected.
+    reference_fields: Tuple[str, ...] = ()
+    # Fetches settings that the collection GET does not return; its result is
+    # merged into the raw item before settings are extracted.
+    detail_loader: Optional[DetailLoader] = None
+    detail_requests_per_item: int = 0
+
+    @property
+    def select_params(self) -> Optional[Dict[str, str]]:
+        """``query_params`` with the reference fields added to its ``$select``."""
+        params = self.query_params
+        if not params or "$select" not in params or not self.reference_fields:
+            return params
+        fields = dict.fromkeys((*params["$select"].split(","), *self.reference_fields))
+        return {**params, "$select": ",".join(fields)}
+
+    @property
+    def requests_per_item(self) -> int:
+        """Graph requests made for each exported item, beyond the collection pages."""
+        # An assignments GET and a group lookup.
+        return (2 if self.assignment_path_template else 0) + self.detail_requests_per_item
 
 
 def paginate(graph_client: Any, path: str, params: Optional[Dict[str, str]] = None) -> Iterable[Dict[str, Any]]:
     suppress_errors = bool(params and "$select" in params)
     try:
-        response = graph_client.get(path, params=params, log_errors=not suppress_errors)
+        with span("GET page", "graph", path=path):
+            response = graph_client.get(path, params=params, log_errors=not suppress_errors)
     except urllib.error.HTTPError as exc:
         if exc.code == 400 and params and "$select" in params:
             logger.warning(
@@ -52,7 +81,8 @@ def paginate(graph_client: Any, path: str, params: Optional[Dict[str, str]] = No
 
     next_link = response.get("@odata.nextLink")
     while next_link:
-        response = graph_client.get(next_link, is_absolute=True)
+        with span("GET page", "graph", path=path):
+            response = graph_client.get(next_link, is_absolute=True)
         for item in response.get("value", []):
             yield item
         next_link = response.get("@odata.nextLink")
@@ -62,10 +92,11 @@ def normalize_asset(
     raw: Dict[str, Any],
     resource: ResourceDefinition,
     assignments: List[Dict[str, Any]],
+    include_settings: bool = True,
 ) -> Dict[str, Any]:
     display_name = raw.get(resource.display_name_key) or raw.get("name") or raw.get("id")
     settings = {}
-    if resource.settings_extractor:
+    if include_settings and resource.settings_extractor:
         settings = resource.settings_extractor(raw)
 
     return {
@@ -82,13 +113,27 @@ def normalize_asset(
     }
 
 
-def export_resources(graph_client: Any, resources: List[ResourceDefinition]) -> List[Dict[str, Any]]:
+def export_resources(
+    graph_client: Any,
+    resources: List[ResourceDefinition],
+    plan: Optional["ExportPlan"] = None,
+) -> List[Dict[str, Any]]:
     exported: List[Dict[str, Any]] = []
+    include_settings = plan.include_settings if plan else True
 
     for resource in resources:
-        for item in paginate(graph_client, resource.collection_path, params=resource.query_params):
-            assignment_path = resource.assignment_path_template.format(id=item.get("id"))
-            assignments = collect_assignments(graph_client, assignment_path)
-            exported.append(normalize_asset(item, resource, assignments))
+        params = plan.query_params(resource) if plan else resource.select_params
+        with span(f"export {resource.graph_resource_name}", "export", path=resource.collection_path) as span_args:
+            count = 0
+            for item in paginate(graph_client, resource.collection_path, params=params):
+                assignments: List[Dict[str, Any]] = []
+                if resource.assignment_path_template:
+                    assignment_path = resource.assignment_path_template.format(id=item.get("id"))
+                    assignments = collect_assignments(graph_client, assignment_path)
+                if include_settings and resource.detail_loader:
+                    item = {**item, **resource.detail_loader(graph_client, item)}
+                exported.append(normalize_asset(item, resource, assignments, include_settings))
+                count += 1
+            span_args["items"] = count
 
     return exported
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
+
+_METADATA_KEYS = {
+    "@odata.type",
+    "id",
+    "displayName",
+    "description",
+    "createdDateTime",
+    "lastModifiedDateTime",
+    "version",
+    "roleScopeTagIds",
+}
+
+
+def _extract_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
+    # Compliance settings are properties of the platform-specific policy type,
+    # so everything that is not policy metadata is a setting. They are listed
+    # like OMA settings so each one is its own row and is compared for conflicts.
+    return {
+        "policyType": raw.get("@odata.type"),
+        "settings": [
+            {"displayName": key, "value": value} for key, value in raw.items() if key not in _METADATA_KEYS
+        ],
+    }
+
+
+RESOURCES = [
+    ResourceDefinition(
+        type_key="compliance_policies",
+        graph_resource_name="deviceCompliancePolicy",
+        collection_path="/deviceManagement/deviceCompliancePolicies",
+        assignment_path_template="/deviceManagement/deviceCompliancePolicies/{id}/assignments",
+        settings_extractor=_extract_settings,
+        reference_fields=("roleScopeTagIds",),
+    ),
+]
+
+
+def export_compliance_policies(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
@@ -1,32 +1,82 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional, Sequence, Tuple
 
-from .autopilot_profiles import export_autopilot_profiles
-from .device_configurations import export_device_configurations
-from .enrollment_profiles import export_enrollment_profiles
-from .images import export_images
-from .initial_access_policies import export_initial_access_policies
-from .provisioning_profiles import export_provisioning_profiles
-from .scripts import export_scripts
-from .settings_catalog import export_settings_catalog
-from .windows365 import export_windows365
+from . import (
+    app_configurations,
+    app_protection_policies,
+    assignment_filters,
+    autopilot_profiles,
+    compliance_policies,
+    device_configurations,
+    enrollment_profiles,
+    group_policy_configurations,
+    images,
+    initial_access_policies,
+    intents,
+    mobile_apps,
+    notification_templates,
+    provisioning_profiles,
+    scripts,
+    settings_catalog,
+    update_profiles,
+    windows365,
+)
+from .common import ResourceDefinition
+from .group_members import assigned_group_ids, fetch_member_counts
+from .plan import ASSET_TYPES, FULL_EXPORT_PLAN, ExportPlan
+from .references import resolve_references
+from .scheduler import DEFAULT_EXPORT_WORKERS, export_scheduled
 
 
-def export_all(graph_client: Any) -> Dict[str, List[Dict[str, Any]]]:
-    assets: List[Dict[str, Any]] = []
-    assets.extend(export_device_configurations(graph_client))
-    assets.extend(export_settings_catalog(graph_client))
-    assets.extend(export_autopilot_profiles(graph_client))
-    assets.extend(export_enrollment_profiles(graph_client))
-    assets.extend(export_scripts(graph_client))
-    assets.extend(export_initial_access_policies(graph_client))
-    assets.extend(export_windows365(graph_client))
-    assets.extend(export_provisioning_profiles(graph_client))
-    assets.extend(export_images(graph_client))
+# Asset type -> the resources exported for it, in ASSET_TYPES order.
+RESOURCE_FAMILIES: Tuple[Tuple[str, Sequence[ResourceDefinition]], ...] = tuple(
+    zip(
+        ASSET_TYPES,
+        (
+            device_configurations.RESOURCES,
+            settings_catalog.RESOURCES,
+            autopilot_profiles.RESOURCES,
+            enrollment_profiles.RESOURCES,
+            scripts.RESOURCES,
+            initial_access_policies.RESOURCES,
+            windows365.RESOURCES,
+            provisioning_profiles.RESOURCES,
+            images.RESOURCES,
+            compliance_policies.RESOURCES,
+            mobile_apps.RESOURCES,
+            app_protection_policies.RESOURCES,
+            app_configurations.RESOURCES,
+            group_policy_configurations.RESOURCES,
+            intents.RESOURCES,
+            update_profiles.RESOURCES,
+            notification_templates.RESOURCES,
+            assignment_filters.RESOURCES,
+        ),
+    )
+)
 
-    return {
+
+def export_all(
+    graph_client: Any,
+    plan: Optional[ExportPlan] = None,
+    max_workers: int = DEFAULT_EXPORT_WORKERS,
+) -> Dict[str, Any]:
+    plan = plan or FULL_EXPORT_PLAN
+    resources = [
+        resource
+        for asset_type, family in RESOURCE_FAMILIES
+        if plan.includes(asset_type)
+        for resource in family
+    ]
+    assets = export_scheduled(graph_client, resources, plan, max_workers)
+    resolve_references(graph_client, assets)
+
+    raw_export: Dict[str, Any] = {
         "generatedAt": datetime.now(timezone.utc).isoformat(),
         "assets": assets,
     }
+    if plan.include_member_counts:
+        raw_export["groupMemberCounts"] = fetch_member_counts(graph_client, assigned_group_ids(assets))
+    return raw_export
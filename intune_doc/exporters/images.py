@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
 
 
 def _extract_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
@@ -26,5 +27,5 @@ RESOURCES = [
 ]
 
 
-def export_images(graph_client: Any) -> List[Dict[str, Any]]:
-    return export_resources(graph_client, RESOURCES)
+def export_images(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
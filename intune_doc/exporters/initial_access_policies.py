@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
 
 
 def _extract_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
@@ -21,10 +22,11 @@ RESOURCES = [
         collection_path="/deviceManagement/termsAndConditions",
         assignment_path_template="/deviceManagement/termsAndConditions/{id}/assignments",
         settings_extractor=_extract_settings,
+        reference_fields=("roleScopeTagIds",),
         query_params={"$select": "id,displayName,description,bodyText,acceptanceStatement,version,termsAndConditionsType"},
     ),
 ]
 
 
-def export_initial_access_policies(graph_client: Any) -> List[Dict[str, Any]]:
-    return export_resources(graph_client, RESOURCES)
+def export_initial_access_policies(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
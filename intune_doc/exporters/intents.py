@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
+
+
+def _extract_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "templateId": raw.get("templateId"),
+        "isAssigned": raw.get("isAssigned"),
+        "isMigratingToConfigurationPolicy": raw.get("isMigratingToConfigurationPolicy"),
+    }
+
+
+RESOURCES = [
+    ResourceDefinition(
+        type_key="intents",
+        graph_resource_name="deviceManagementIntent",
+        collection_path="/deviceManagement/intents",
+        assignment_path_template="/deviceManagement/intents/{id}/assignments",
+        settings_extractor=_extract_settings,
+        reference_fields=("roleScopeTagIds",),
+        query_params={"$select": "id,displayName,description,templateId,isAssigned,isMigratingToConfigurationPolicy"},
+    ),
+]
+
+
+def export_intents(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
+
+
+def _extract_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "appType": raw.get("@odata.type"),
+        "publisher": raw.get("publisher"),
+        "isFeatured": raw.get("isFeatured"),
+        "publishingState": raw.get("publishingState"),
+        "isAssigned": raw.get("isAssigned"),
+    }
+
+
+RESOURCES = [
+    ResourceDefinition(
+        type_key="mobile_apps",
+        graph_resource_name="mobileApp",
+        collection_path="/deviceAppManagement/mobileApps",
+        assignment_path_template="/deviceAppManagement/mobileApps/{id}/assignments",
+        settings_extractor=_extract_settings,
+        reference_fields=("roleScopeTagIds",),
+        query_params={"$select": "id,displayName,description,publisher,isFeatured,publishingState,isAssigned"},
+    ),
+]
+
+
+def export_mobile_apps(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
+
+
+def _extract_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "brandingOptions": raw.get("brandingOptions"),
+        "defaultLocale": raw.get("defaultLocale"),
+        "localizedMessages": [
+            {
+                "locale": message.get("locale"),
+                "subject": message.get("subject"),
+                "message": message.get("messageTemplate"),
+                "isDefault": message.get("isDefault"),
+            }
+            for message in raw.get("localizedNotificationMessages") or []
+        ],
+    }
+
+
+RESOURCES = [
+    ResourceDefinition(
+        type_key="notification_templates",
+        graph_resource_name="notificationMessageTemplate",
+        collection_path="/deviceManagement/notificationMessageTemplates",
+        # Templates are referenced from compliance policy actions, not assigned.
+        assignment_path_template=None,
+        settings_extractor=_extract_settings,
+        reference_fields=("roleScopeTagIds",),
+        query_params={"$expand": "localizedNotificationMessages"},
+    ),
+]
+
+
+def export_notification_templates(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
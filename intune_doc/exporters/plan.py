@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from .common import ResourceDefinition
+
+
+# In export order; each matches the type_key of that exporter's resources.
+ASSET_TYPES = (
+    "device_configurations",
+    "settings_catalog",
+    "autopilot_profiles",
+    "enrollment_profiles",
+    "scripts",
+    "initial_access_policies",
+    "windows365",
+    "provisioning_profiles",
+    "images",
+    "compliance_policies",
+    "mobile_apps",
+    "app_protection_policies",
+    "app_configurations",
+    "group_policy_configurations",
+    "intents",
+    "update_profiles",
+    "notification_templates",
+    "assignment_filters",
+)
+
+
+@dataclass(frozen=True)
+class ExportPlan:
+    """What an export run has to fetch from Graph for the reports it writes.
+
+    Assignments are always fetched because the summary and coverage sections
+    count them. Settings are only needed for the asset detail pages and the
+    setting conflicts in ``full_settings`` scope.
+    """
+
+    include_settings: bool = True
+    asset_types: Optional[FrozenSet[str]] = None
+    # Member counts of the assigned groups, shown in the coverage section.
+    include_member_counts: bool = True
+
+    def includes(self, asset_type: str) -> bool:
+        return self.asset_types is None or asset_type in self.asset_types
+
+    def query_params(self, resource: ResourceDefinition) -> Optional[Dict[str, str]]:
+        if self.include_settings:
+            return resource.select_params
+        fields = dict.fromkeys(("id", resource.display_name_key, *resource.reference_fields))
+        return {"$select": ",".join(fields)}
+
+
+FULL_EXPORT_PLAN = ExportPlan()
+
+
+def plan_export(
+    scopes: Iterable[str],
+    include_sections: Iterable[str] = (),
+    asset_types: Iterable[str] = (),
+    keep_settings: bool = False,
+) -> ExportPlan:
+    """Plan an export from the requested scopes and report sections.
+
+    ``include_sections`` and ``asset_types`` follow the config semantics: an
+    empty list means everything. ``keep_settings`` forces settings to be
+    fetched, e.g. when the raw export is saved for re-rendering later.
+    """
+    sections = set(include_sections)
+    needs_settings = not sections or bool(sections & {"assets", "setting_conflicts", "effective_policies"})
+    include_settings = keep_settings or (needs_settings and "full_settings" in set(scopes))
+    include_member_counts = not sections or "assignment_coverage" in sections
+    asset_types = frozenset(asset_types)
+    return ExportPlan(
+        include_settings=include_settings,
+        asset_types=asset_types or None,
+        include_member_counts=include_member_counts,
+    )
@@ -0,0 +1,106 @@
+"""Resolve ids that exported assets reference to the names of those objects.
+
+Assignments point at assignment filters, policies at role scope tags and
+Windows 365 provisioning policies at device images, all by id. Looking each
+one up would cost a request per reference, so the ids are gathered across
+every asset first and each referenced collection is read once (or taken from
+the assets of this run, when that family was exported too) into an index.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from ..tracing import span
+from .common import paginate
+
+
+def _filter_ids(asset: Dict[str, Any]) -> Iterable[str]:
+    for assignment in asset.get("assignments") or []:
+        filter_id = (assignment.get("target") or {}).get("filterId")
+        if filter_id:
+            yield filter_id
+
+
+def _scope_tag_ids(asset: Dict[str, Any]) -> Iterable[str]:
+    return [str(tag_id) for tag_id in (asset.get("raw") or {}).get("roleScopeTagIds") or []]
+
+
+def _image_ids(asset: Dict[str, Any]) -> Iterable[str]:
+    image_id = (asset.get("raw") or {}).get("imageId")
+    return [image_id] if image_id else []
+
+
+@dataclass(frozen=True)
+class ReferenceCollection:
+    name: str
+    collection_path: str
+    referenced_ids: Callable[[Dict[str, Any]], Iterable[str]]
+    # The exported family holding the same objects, reused when it was exported.
+    asset_type: Optional[str] = None
+
+
+REFERENCE_COLLECTIONS = (
+    ReferenceCollection("assignmentFilters", "/deviceManagement/assignmentFilters", _filter_ids, "assignment_filters"),
+    ReferenceCollection("roleScopeTags", "/deviceManagement/roleScopeTags", _scope_tag_ids),
+    ReferenceCollection("deviceImages", "/deviceManagement/virtualEndpoint/deviceImages", _image_ids, "images"),
+)
+
+
+def gather_references(assets: List[Dict[str, Any]]) -> Dict[str, Set[str]]:
+    """Every id referenced by ``assets``, per reference collection."""
+    return {
+        collection.name: {reference for asset in assets for reference in collection.referenced_ids(asset)}
+        for collection in REFERENCE_COLLECTIONS
+    }
+
+
+def build_reference_indexes(
+    graph_client: Any, assets: List[Dict[str, Any]], references: Dict[str, Set[str]]
+) -> Dict[str, Dict[str, str]]:
+    """Map id -> display name for each collection that has references."""
+    indexes: Dict[str, Dict[str, str]] = {}
+    for collection in REFERENCE_COLLECTIONS:
+        referenced = references.get(collection.name) or set()
+        if not referenced:
+            continue
+        index = {
+            str(asset.get("id")): str(asset.get("displayName"))
+            for asset in assets
+            if collection.asset_type and asset.get("type") == collection.asset_type
+        }
+        if not referenced <= index.keys():
+            with span(f"GET {collection.name}", "graph") as span_args:
+                for item in paginate(graph_client, collection.collection_path, params={"$select": "id,displayName"}):
+                    index[str(item.get("id"))] = str(item.get("displayName") or item.get("id"))
+                span_args["items"] = len(index)
+        indexes[collection.name] = index
+    return indexes
+
+
+def join_references(assets: List[Dict[str, Any]], indexes: Dict[str, Dict[str, str]]) -> None:
+    """Add the referenced names to the normalized assets, in place."""
+    filters = indexes.get("assignmentFilters", {})
+    scope_tags = indexes.get("roleScopeTags", {})
+    images = indexes.get("deviceImages", {})
+    for asset in assets:
+        for assignment in asset.get("assignments") or []:
+            target = assignment.get("target") or {}
+            filter_id = target.get("filterId")
+            if filter_id:
+                target["filterDisplayName"] = filters.get(filter_id) or f"Unknown filter ({filter_id})"
+        tag_ids = _scope_tag_ids(asset)
+        if tag_ids:
+            asset["scopeTags"] = [scope_tags.get(tag_id) or f"Unknown scope tag ({tag_id})" for tag_id in tag_ids]
+        settings = asset.get("settings")
+        image_id = (asset.get("raw") or {}).get("imageId")
+        # Gallery images are not in deviceImages; their id is already readable.
+        if image_id in images and isinstance(settings, dict) and settings:
+            settings["imageDisplayName"] = images[image_id]
+
+
+def resolve_references(graph_client: Any, assets: List[Dict[str, Any]]) -> None:
+    references = gather_references(assets)
+    with span("resolve_references", "graph", references=sum(len(ids) for ids in references.values())):
+        join_references(assets, build_reference_indexes(graph_client, assets, references))
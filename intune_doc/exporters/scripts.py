@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
 
 
 def _extract_windows_script_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
@@ -38,6 +39,7 @@ RESOURCES = [
         collection_path="/deviceManagement/deviceManagementScripts",
         assignment_path_template="/deviceManagement/deviceManagementScripts/{id}/assignments",
         settings_extractor=_extract_windows_script_settings,
+        reference_fields=("roleScopeTagIds",),
         query_params={"$select": "id,displayName,description,runAsAccount,runAs32Bit,enforceSignatureCheck,fileName"},
     ),
     ResourceDefinition(
@@ -46,6 +48,7 @@ RESOURCES = [
         collection_path="/deviceManagement/deviceShellScripts",
         assignment_path_template="/deviceManagement/deviceShellScripts/{id}/assignments",
         settings_extractor=_extract_shell_script_settings,
+        reference_fields=("roleScopeTagIds",),
         query_params={"$select": "id,displayName,description,runAsAccount,fileName,scriptType"},
     ),
     ResourceDefinition(
@@ -54,10 +57,11 @@ RESOURCES = [
         collection_path="/deviceManagement/deviceHealthScripts",
         assignment_path_template="/deviceManagement/deviceHealthScripts/{id}/assignments",
         settings_extractor=_extract_health_script_settings,
+        reference_fields=("roleScopeTagIds",),
         query_params={"$select": "id,displayName,description,publisher,runAsAccount,detectionScriptContent,remediationScriptContent"},
     ),
 ]
 
 
-def export_scripts(graph_client: Any) -> List[Dict[str, Any]]:
-    return export_resources(graph_client, RESOURCES)
+def export_scripts(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
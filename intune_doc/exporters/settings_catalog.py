@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
 
 
 def _extract_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
@@ -21,10 +22,11 @@ RESOURCES = [
         collection_path="/deviceManagement/configurationPolicies",
         assignment_path_template="/deviceManagement/configurationPolicies/{id}/assignments",
         settings_extractor=_extract_settings,
+        reference_fields=("roleScopeTagIds",),
         query_params={"$select": "id,displayName,description,platforms,technologies,settingCount,settings"},
     ),
 ]
 
 
-def export_settings_catalog(graph_client: Any) -> List[Dict[str, Any]]:
-    return export_resources(graph_client, RESOURCES)
+def export_settings_catalog(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
+
+
+def _extract_feature_update_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "featureUpdateVersion": raw.get("featureUpdateVersion"),
+        "rolloutSettings": raw.get("rolloutSettings"),
+        "installLatestWindows10OnWindows11IneligibleDevice": raw.get(
+            "installLatestWindows10OnWindows11IneligibleDevice"
+        ),
+        "endOfSupportDate": raw.get("endOfSupportDate"),
+    }
+
+
+def _extract_quality_update_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "releaseDateDisplayName": raw.get("releaseDateDisplayName"),
+        "expeditedUpdateSettings": raw.get("expeditedUpdateSettings"),
+    }
+
+
+def _extract_driver_update_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "approvalType": raw.get("approvalType"),
+        "deploymentDeferralInDays": raw.get("deploymentDeferralInDays"),
+    }
+
+
+RESOURCES = [
+    ResourceDefinition(
+        type_key="update_profiles",
+        graph_resource_name="windowsFeatureUpdateProfile",
+        collection_path="/deviceManagement/windowsFeatureUpdateProfiles",
+        assignment_path_template="/deviceManagement/windowsFeatureUpdateProfiles/{id}/assignments",
+        settings_extractor=_extract_feature_update_settings,
+        reference_fields=("roleScopeTagIds",),
+        query_params={
+            "$select": "id,displayName,description,featureUpdateVersion,rolloutSettings,installLatestWindows10OnWindows11IneligibleDevice,endOfSupportDate"
+        },
+    ),
+    ResourceDefinition(
+        type_key="update_profiles",
+        graph_resource_name="windowsQualityUpdateProfile",
+        collection_path="/deviceManagement/windowsQualityUpdateProfiles",
+        assignment_path_template="/deviceManagement/windowsQualityUpdateProfiles/{id}/assignments",
+        settings_extractor=_extract_quality_update_settings,
+        reference_fields=("roleScopeTagIds",),
+        query_params={"$select": "id,displayName,description,releaseDateDisplayName,expeditedUpdateSettings"},
+    ),
+    ResourceDefinition(
+        type_key="update_profiles",
+        graph_resource_name="windowsDriverUpdateProfile",
+        collection_path="/deviceManagement/windowsDriverUpdateProfiles",
+        assignment_path_template="/deviceManagement/windowsDriverUpdateProfiles/{id}/assignments",
+        settings_extractor=_extract_driver_update_settings,
+        reference_fields=("roleScopeTagIds",),
+        query_params={"$select": "id,displayName,description,approvalType,deploymentDeferralInDays"},
+    ),
+]
+
+
+def export_update_profiles(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
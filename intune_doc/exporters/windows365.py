@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from .common import ResourceDefinition, export_resources
+from .plan import ExportPlan
 
 
 def _extract_provisioning_settings(raw: Dict[str, Any]) -> Dict[str, Any]:
@@ -29,6 +30,7 @@ RESOURCES = [
         collection_path="/deviceManagement/virtualEndpoint/provisioningPolicies",
         assignment_path_template="/deviceManagement/virtualEndpoint/provisioningPolicies/{id}/assignments",
         settings_extractor=_extract_provisioning_settings,
+        reference_fields=("imageId",),
         query_params={"$select": "id,displayName,description,imageId,cloudPcNamingTemplate,domainJoinConfiguration,windowsSetting"},
     ),
     ResourceDefinition(
@@ -42,5 +44,5 @@ RESOURCES = [
 ]
 
 
-def export_windows365(graph_client: Any) -> List[Dict[str, Any]]:
-    return export_resources(graph_client, RESOURCES)
+def export_windows365(graph_client: Any, plan: Optional[ExportPlan] = None) -> List[Dict[str, Any]]:
+    return export_resources(graph_client, RESOURCES, plan)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import heapq
+import pickle
+import tempfile
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List, Optional
+
+
+DEFAULT_RUN_SIZE = 100_000
+
+SortKey = Callable[[Any], Any]
+
+
+def dump_rows(rows: Iterable[Any], spill_file: BinaryIO) -> None:
+    for row in rows:
+        pickle.dump(row, spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_rows(spill_file: BinaryIO) -> Iterator[Any]:
+    try:
+        while True:
+            try:
+                yield pickle.load(spill_file)
+            except EOFError:
+                return
+    finally:
+        spill_file.close()
+
+
+def _write_run(rows: List[Any], key: SortKey) -> BinaryIO:
+    rows.sort(key=key)
+    run_file = tempfile.TemporaryFile()
+    dump_rows(rows, run_file)
+    run_file.seek(0)
+    return run_file
+
+
+def external_sort(
+    rows: Iterable[Any],
+    key: SortKey,
+    run_size: int = DEFAULT_RUN_SIZE,
+    on_row: Optional[Callable[[Any], None]] = None,
+) -> Iterator[Any]:
+    """Sort ``rows`` holding at most ``run_size`` rows in memory at a time.
+
+    Rows are buffered into sorted runs that spill to temporary files once the
+    buffer fills up, and the runs are lazily k-way merged on iteration. Inputs
+    that fit in a single run never touch the disk. ``on_row`` is called for
+    every input row as it is consumed, before any output is produced.
+    """
+    if run_size < 1:
+        raise ValueError("run_size must be at least 1")
+
+    runs: List[Any] = []
+    buffer: List[Any] = []
+    for row in rows:
+        if on_row is not None:
+            on_row(row)
+        buffer.append(row)
+        if len(buffer) >= run_size:
+            runs.append(_write_run(buffer, key))
+            buffer = []
+
+    if not runs:
+        buffer.sort(key=key)
+        return iter(buffer)
+
+    if buffer:
+        runs.append(_write_run(buffer, key))
+    return heapq.merge(*(load_rows(run_file) for run_file in runs), key=key)
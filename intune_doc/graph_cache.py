@@ -0,0 +1,69 @@
+"""Time-limited caches for Graph data that rarely changes between runs.
+
+Each cache is a JSON file in the configured cache directory, loaded on first
+use and written back atomically by :meth:`TtlCache.save`. Without a
+directory a cache lives for the run only, which still saves repeated
+lookups across the policies of one export.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TtlCache:
+    def __init__(self, path: Optional[Path], ttl_seconds: float) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path is not None and path.exists():
+            try:
+                self._entries = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                logger.warning("Ignoring unreadable Graph cache %s: %s", path, exc)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or time.time() - entry["stored_at"] > self.ttl_seconds:
+            return None
+        return entry["value"]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = {"value": value, "stored_at": time.time()}
+            self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        now = time.time()
+        with self._lock:
+            entries = {
+                key: entry for key, entry in self._entries.items() if now - entry["stored_at"] <= self.ttl_seconds
+            }
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+            json.dump(entries, temp_file)
+        os.replace(temp_name, self.path)
@@ -1,19 +1,95 @@
 from __future__ import annotations
 
+import io
 import json
 import logging
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .graph_cache import TtlCache
 
 logger = logging.getLogger(__name__)
 
+# Graph accepts at most 20 requests in one JSON batch.
+BATCH_SIZE = 20
+BATCH_RETRIES = 3
+# GET responses kept for the rest of the run, least recently used first out.
+# Larger responses and nextLink pages are not kept.
+MEMO_MAX_BYTES = 32 * 1024 * 1024
+MEMO_MAX_RESPONSE_BYTES = 1024 * 1024
+
+BatchRequest = Tuple[str, Optional[Dict[str, str]]]
+
+
+class _Flight:
+    """One GET in progress; identical GETs wait for it instead of sending their own."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.payload: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
 
 class GraphClient:
-    def __init__(self, token: str, base_url: str = "https://graph.microsoft.com/beta") -> None:
+    def __init__(
+        self,
+        token: str,
+        base_url: str = "https://graph.microsoft.com/beta",
+        cache_directory: Optional[Path] = None,
+        token_provider: Optional[Callable[[], str]] = None,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
         self.token = token
+        # Called for every request when set, so a long-lived client renews its token.
+        self.token_provider = token_provider
+        self.cache_directory = cache_directory
+        self._caches: Dict[str, TtlCache] = {}
+        self._caches_lock = threading.Lock()
+        # Response text by URL for this run, and the GETs in progress.
+        self._memo: "OrderedDict[str, str]" = OrderedDict()
+        self._memo_size = 0
+        self._flights: Dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+        self.memo_hits = 0
+
+    def _open(self, request: urllib.request.Request, url: str, log_errors: bool) -> Dict[str, Any]:
+        return json.loads(self._read(request, url, log_errors))
+
+    def _read(self, request: urllib.request.Request, url: str, log_errors: bool) -> str:
+        token = self.token_provider() if self.token_provider is not None else self.token
+        request.add_header("Authorization", f"Bearer {token}")
+        request.add_header("Accept", "application/json")
+        request.add_header("consistencylevel", "eventual")
+
+        logger.debug("Graph %s request to %s", request.get_method(), url)
+        try:
+            with urllib.request.urlopen(request) as response:
+                payload = response.read().decode("utf-8")
+        except urllib.error.HTTPError as exc:
+            error_body = exc.read() if exc.fp else b""
+            if log_errors:
+                logger.error(
+                    "Graph %s request failed (%s %s) for %s. Response: %s",
+                    request.get_method(),
+                    exc.code,
+                    exc.reason,
+                    url,
+                    error_body.decode("utf-8", errors="replace"),
+                )
+            # The body was read for the log; raise an error whose body can
+            # still be read, by this caller and by any waiting on the same GET.
+            raise _http_error(exc, error_body) from None
+        except urllib.error.URLError as exc:
+            logger.error("Graph %s request failed for %s: %s", request.get_method(), url, exc.reason)
+            raise
+
+        return payload
 
     def get(
         self,
@@ -31,28 +107,151 @@ class GraphClient:
             query = urllib.parse.urlencode(params)
             url = f"{url}?{query}"
 
-        request = urllib.request.Request(url)
-        request.add_header("Authorization", f"Bearer {self.token}")
-        request.add_header("Accept", "application/json")
-        request.add_header("consistencylevel", "eventual")
+        # Identical GETs share one request: the first one sends it and the rest
+        # wait for its result, or are answered from the memo once it is done.
+        # The text is kept rather than the parsed body so callers never share
+        # (and mutate) the same objects.
+        with self._flights_lock:
+            payload = self._memo.get(url)
+            if payload is not None:
+                self._memo.move_to_end(url)
+                self.memo_hits += 1
+                flight = None
+            else:
+                flight = self._flights.get(url)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[url] = _Flight()
+        if flight is None:
+            return json.loads(payload)
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                # Each waiter raises its own copy so tracebacks do not pile up
+                # on the one exception shared by every thread.
+                raise _copy_error(flight.error) from flight.error
+            return json.loads(flight.payload)
 
-        logger.debug("Graph GET request to %s", url)
         try:
-            with urllib.request.urlopen(request) as response:
-                payload = response.read().decode("utf-8")
-        except urllib.error.HTTPError as exc:
-            error_body = exc.read().decode("utf-8") if exc.fp else ""
-            if log_errors:
-                logger.error(
-                    "Graph GET request failed (%s %s) for %s. Response: %s",
-                    exc.code,
-                    exc.reason,
-                    url,
-                    error_body,
-                )
-            raise
-        except urllib.error.URLError as exc:
-            logger.error("Graph GET request failed for %s: %s", url, exc.reason)
+            payload = self._read(urllib.request.Request(url), url, log_errors)
+            flight.payload = payload
+        except BaseException as exc:
+            # Failures are shared with the waiters but not kept: the next GET retries.
+            flight.error = exc
             raise
-
+        finally:
+            with self._flights_lock:
+                del self._flights[url]
+                if flight.payload is not None and not is_absolute:
+                    self._remember(url, flight.payload)
+            flight.done.set()
         return json.loads(payload)
+
+    def _remember(self, url: str, payload: str) -> None:
+        # Called with the flights lock held.
+        if len(payload) > MEMO_MAX_RESPONSE_BYTES:
+            return
+        self._memo[url] = payload
+        self._memo_size += len(payload)
+        while self._memo_size > MEMO_MAX_BYTES:
+            _, evicted = self._memo.popitem(last=False)
+            self._memo_size -= len(evicted)
+
+    def clear_memo(self) -> None:
+        """Forget remembered GET responses, so the next run sees current data."""
+        with self._flights_lock:
+            self._memo.clear()
+            self._memo_size = 0
+
+    def post(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        request = urllib.request.Request(url, data=json.dumps(body).encode("utf-8"), method="POST")
+        request.add_header("Content-Type", "application/json")
+        return self._open(request, url, log_errors=True)
+
+    def batch(self, requests: Sequence[BatchRequest]) -> List[Any]:
+        """GET several paths through JSON ``$batch``, 20 per round trip.
+
+        Returns the response bodies in request order. Requests that keep
+        failing (or are throttled past the retries) are logged and come back
+        as None, like a skipped export.
+        """
+        results: List[Any] = [None] * len(requests)
+        pending = list(range(len(requests)))
+        for attempt in range(BATCH_RETRIES):
+            throttled: List[int] = []
+            retry_after = 0.0
+            for start in range(0, len(pending), BATCH_SIZE):
+                chunk = pending[start : start + BATCH_SIZE]
+                body = {
+                    "requests": [
+                        {
+                            "id": str(index),
+                            "method": "GET",
+                            "url": _relative_url(*requests[index]),
+                            # Like get(); $count segments require it.
+                            "headers": {"ConsistencyLevel": "eventual"},
+                        }
+                        for index in chunk
+                    ]
+                }
+                for response in self.post("/$batch", body).get("responses", []):
+                    index = int(response.get("id"))
+                    status = int(response.get("status", 0))
+                    if 200 <= status < 300:
+                        # $count bodies are bare numbers, so 0 is a result too.
+                        body = response.get("body")
+                        results[index] = {} if body is None else body
+                    elif status == 429 or status >= 500:
+                        throttled.append(index)
+                        retry_after = max(retry_after, float((response.get("headers") or {}).get("Retry-After", 1)))
+                    else:
+                        logger.warning("Graph batch GET for %s returned %s.", requests[index][0], status)
+            if not throttled:
+                break
+            pending = sorted(throttled)
+            if attempt + 1 < BATCH_RETRIES:
+                time.sleep(retry_after)
+        else:
+            for index in pending:
+                logger.warning("Graph batch GET for %s was throttled; giving up.", requests[index][0])
+        return results
+
+    def cache(self, name: str, ttl_seconds: float) -> TtlCache:
+        """Named cache for this run, persisted in ``cache_directory`` if set."""
+        with self._caches_lock:
+            if name not in self._caches:
+                path = self.cache_directory / f"{name}.json" if self.cache_directory else None
+                self._caches[name] = TtlCache(path, ttl_seconds)
+            return self._caches[name]
+
+    def save_caches(self) -> None:
+        with self._caches_lock:
+            caches = list(self._caches.values())
+        for cache in caches:
+            cache.save()
+
+
+def _http_error(error: urllib.error.HTTPError, body: bytes) -> urllib.error.HTTPError:
+    return urllib.error.HTTPError(error.url, error.code, error.msg, error.hdrs, io.BytesIO(body))
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    """A new exception of the same type and attributes as ``error``, without its traceback."""
+    if isinstance(error, urllib.error.HTTPError):
+        # Each copy gets its own body stream; the shared one may already be read.
+        body = error.fp.getvalue() if isinstance(error.fp, io.BytesIO) else b""
+        return _http_error(error, body)
+    # Built without calling __init__, whose signature differs between types
+    # (JSONDecodeError takes three arguments, OSError up to five).
+    copy = type(error).__new__(type(error), *error.args)
+    copy.__dict__.update(error.__dict__)
+    copy.args = error.args
+    return copy
+
+
+def _relative_url(path: str, params: Optional[Dict[str, str]]) -> str:
+    url = f"/{path.lstrip('/')}"
+    if params:
+        url = f"{url}?{urllib.parse.urlencode(params)}"
+    return url
@@ -0,0 +1,262 @@
+"""Memory accounting for pipeline stages.
+
+A :class:`MemoryProfiler` is active when ``report_options.memory_budget_mb``
+is set or ``--profile-memory`` is given. Each stage records the process RSS
+and its high-water mark, which are cheap to read. With ``--profile-memory`` it
+also records the tracemalloc peak and the top allocating lines, which slows
+the run down noticeably.
+
+The high-water mark only ever rises, so ``peak_growth_mb`` is the amount by
+which a stage raised the process peak; a stage that stays below an earlier
+peak shows 0 there even if it allocated heavily (see ``traced_peak_mb``).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .writers.common import WriterOptions
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+WARN_FRACTION = 0.8
+# Rough cost of writing reports relative to the report schema they come from:
+# section payload copies, JSON encoding and the writers' document models.
+WRITE_GROWTH_FACTOR = 3.0
+LOW_MEMORY_SORT_RUN_SIZE = 10_000
+
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak / MB if sys.platform == "darwin" else peak / 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / MB
+
+
+@dataclass(frozen=True)
+class StageMemory:
+    name: str
+    seconds: float
+    rss_mb: Optional[float]
+    rss_growth_mb: Optional[float]
+    peak_rss_mb: Optional[float]
+    peak_growth_mb: Optional[float]
+    traced_peak_mb: Optional[float] = None
+    top_allocations: List[str] = field(default_factory=list)
+
+
+def _difference(after: Optional[float], before: Optional[float]) -> Optional[float]:
+    if after is None or before is None:
+        return None
+    return after - before
+
+
+def _format_mb(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:,.1f}"
+
+
+class MemoryProfiler:
+    def __init__(self, budget_mb: Optional[int] = None, trace_allocations: bool = False, top: int = 5) -> None:
+        self.budget_mb = budget_mb
+        self.trace_allocations = trace_allocations
+        self.top = top
+        self.stages: List[StageMemory] = []
+        self.pid = os.getpid()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        snapshot = None
+        if self.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            snapshot = tracemalloc.take_snapshot()
+        rss_before = current_rss_mb()
+        peak_before = peak_rss_mb()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, started, rss_before, peak_before, snapshot)
+
+    def _record(
+        self,
+        name: str,
+        started: float,
+        rss_before: Optional[float],
+        peak_before: Optional[float],
+        snapshot: Optional[tracemalloc.Snapshot],
+    ) -> None:
+        traced_peak = None
+        top_allocations: List[str] = []
+        if snapshot is not None:
+            traced_peak = tracemalloc.get_traced_memory()[1] / MB
+            statistics = tracemalloc.take_snapshot().compare_to(snapshot, "lineno")
+            top_allocations = [
+                f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} "
+                f"{stat.size_diff / MB:+,.1f} MiB ({stat.count_diff:+,} blocks)"
+                for stat in statistics[: self.top]
+                if stat.size_diff > 0
+            ]
+        rss = current_rss_mb()
+        peak = peak_rss_mb()
+        stage = StageMemory(
+            name=name,
+            seconds=time.perf_counter() - started,
+            rss_mb=rss,
+            rss_growth_mb=_difference(rss, rss_before),
+            peak_rss_mb=peak,
+            peak_growth_mb=_difference(peak, peak_before),
+            traced_peak_mb=traced_peak,
+            top_allocations=top_allocations,
+        )
+        self.stages.append(stage)
+        self._check_budget(stage)
+
+    def _check_budget(self, stage: StageMemory) -> None:
+        if not self.budget_mb or stage.peak_rss_mb is None:
+            return
+        if stage.peak_rss_mb > self.budget_mb:
+            logger.warning(
+                "Peak RSS reached %.0f MiB during %s, over the %d MiB memory budget.",
+                stage.peak_rss_mb,
+                stage.name,
+                self.budget_mb,
+            )
+        elif stage.peak_rss_mb > self.budget_mb * WARN_FRACTION:
+            logger.warning(
+                "Peak RSS reached %.0f MiB during %s, %.0f%% of the %d MiB memory budget.",
+                stage.peak_rss_mb,
+                stage.name,
+                100 * stage.peak_rss_mb / self.budget_mb,
+                self.budget_mb,
+            )
+
+    def stage_named(self, name: str) -> Optional[StageMemory]:
+        return next((stage for stage in reversed(self.stages) if stage.name == name), None)
+
+    def projected_write_mb(self, schema_stage: str, parallel_jobs: int = 1) -> Optional[float]:
+        """Project the RSS that writing the reports will need.
+
+        Based on the memory retained by ``schema_stage`` (the report schema),
+        scaled by :data:`WRITE_GROWTH_FACTOR` for each set of reports written
+        at the same time.
+        """
+        stage = self.stage_named(schema_stage)
+        rss = current_rss_mb()
+        if stage is None or stage.rss_growth_mb is None or rss is None:
+            return None
+        return rss + max(stage.rss_growth_mb, 0.0) * WRITE_GROWTH_FACTOR * max(parallel_jobs, 1)
+
+    def summary(self) -> str:
+        lines = [f"{'Stage':<40} {'Seconds':>8} {'RSS MiB':>10} {'Peak MiB':>10} {'+Peak':>8} {'Traced':>8}"]
+        for stage in self.stages:
+            lines.append(
+                f"{stage.name[:40]:<40} {stage.seconds:>8.2f} {_format_mb(stage.rss_mb):>10} "
+                f"{_format_mb(stage.peak_rss_mb):>10} {_format_mb(stage.peak_growth_mb):>8} "
+                f"{_format_mb(stage.traced_peak_mb):>8}"
+            )
+            lines.extend(f"    {allocation}" for allocation in stage.top_allocations)
+        return "\n".join(lines)
+
+    def write(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"budget_mb": self.budget_mb, "stages": [asdict(stage) for stage in self.stages]}
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        return path
+
+
+def fit_writer_options(
+    writer_options: WriterOptions,
+    profiler: Optional[MemoryProfiler],
+    schema_stage: str,
+    parallel_jobs: int = 1,
+) -> WriterOptions:
+    """Fall back to lower-memory writer modes when a write would exceed the budget.
+
+    Parallel writes are serialized first, since every worker process holds
+    its own copy of the reports. If one set of reports still does not fit,
+    Word switches to the stream backend and external sorts spill smaller runs.
+    """
+    if profiler is None or not profiler.budget_mb:
+        return writer_options
+    budget_mb = profiler.budget_mb
+    projected_mb = profiler.projected_write_mb(schema_stage, parallel_jobs)
+    if projected_mb is None or projected_mb <= budget_mb:
+        return writer_options
+
+    fallbacks = []
+    if parallel_jobs > 1:
+        fallbacks.append("writing report sets one at a time")
+        writer_options = replace(writer_options, max_workers=1)
+        projected_mb = profiler.projected_write_mb(schema_stage) or projected_mb
+    if projected_mb > budget_mb:
+        if writer_options.word_backend != "stream":
+            fallbacks.append("the stream Word backend")
+            writer_options = replace(writer_options, word_backend="stream")
+        if writer_options.sort_run_size > LOW_MEMORY_SORT_RUN_SIZE:
+            fallbacks.append(f"sort runs of {LOW_MEMORY_SORT_RUN_SIZE:,} rows")
+            writer_options = replace(writer_options, sort_run_size=LOW_MEMORY_SORT_RUN_SIZE)
+    logger.warning(
+        "Writing reports is projected to need about %.0f MiB, over the %d MiB memory budget; using %s.",
+        projected_mb,
+        budget_mb,
+        ", ".join(fallbacks) or "the current writer settings anyway",
+    )
+    return writer_options
+
+
+_profiler: Optional[MemoryProfiler] = None
+
+
+def active_profiler() -> Optional[MemoryProfiler]:
+    if _profiler is not None and _profiler.pid == os.getpid():
+        return _profiler
+    return None
+
+
+def start_profiling(budget_mb: Optional[int] = None, trace_allocations: bool = False) -> MemoryProfiler:
+    global _profiler
+    _profiler = MemoryProfiler(budget_mb, trace_allocations)
+    return _profiler
+
+
+def stop_profiling() -> Optional[MemoryProfiler]:
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None and profiler.trace_allocations and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return profiler
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Record the enclosed block as a stage of the active profiler, if any."""
+    profiler = active_profiler()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
@@ -0,0 +1,193 @@
+"""Incremental loading of saved exports.
+
+Raw exports can be far larger than the report built from them, so assets are
+decoded one at a time from a sliding window over the file rather than with a
+single ``json.load``. Supported sources are:
+
+- the ``*-raw.json`` document written by ``write_raw_export`` (or a bare JSON
+  list of assets);
+- NDJSON, one asset object per line; lines without an ``id`` (such as a
+  ``{"generatedAt": ...}`` header) are treated as export metadata;
+- a directory of JSON files, each holding one asset or a raw export (e.g.
+  ``fixtures/``);
+- an export store written by ``write_export_store``.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, TextIO
+
+from .store import ExportStore
+
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+STORE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = " \t\n\r"
+
+
+def open_raw_export(path: Path) -> Dict[str, Any]:
+    """Return a raw export whose ``assets`` are read lazily from ``path``.
+
+    Top-level fields such as ``generatedAt`` are added to the returned dict as
+    parsing reaches them, so they are all present once ``assets`` has been
+    consumed (``build_report_schema`` reads them after the assets).
+    """
+    raw_export: Dict[str, Any] = {}
+    raw_export["assets"] = _iter_assets(Path(path), raw_export)
+    return raw_export
+
+
+def iter_raw_assets(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the assets of a saved export, one at a time."""
+    return open_raw_export(path)["assets"]
+
+
+def _iter_assets(path: Path, header: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    if path.is_dir():
+        yield from _iter_directory_assets(path, header)
+    elif path.suffix.lower() in STORE_SUFFIXES:
+        with ExportStore(path) as store:
+            header["generatedAt"] = store.generated_at
+            header["organization"] = store.organization
+            header["groupMemberCounts"] = store.group_member_counts
+            yield from store.iter_assets()
+    elif path.suffix.lower() in NDJSON_SUFFIXES:
+        yield from _iter_ndjson_assets(path, header)
+    else:
+        with path.open(encoding="utf-8") as export_file:
+            yield from _JsonStream(export_file, path).assets(header)
+
+
+def _iter_ndjson_assets(path: Path, header: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    with path.open(encoding="utf-8") as export_file:
+        for line_number, line in enumerate(export_file, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path}:{line_number} is not valid JSON: {exc}") from exc
+            if not isinstance(item, dict):
+                continue
+            if "id" in item:
+                yield item
+            else:
+                header.update(item)
+
+
+def _iter_directory_assets(path: Path, header: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    for file_path in sorted(path.glob("*.json")):
+        with file_path.open(encoding="utf-8") as export_file:
+            try:
+                payload = json.load(export_file)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{file_path} is not valid JSON: {exc}") from exc
+        if isinstance(payload, dict) and isinstance(payload.get("assets"), list):
+            header.update((key, value) for key, value in payload.items() if key != "assets")
+            payload = payload["assets"]
+        for item in payload if isinstance(payload, list) else [payload]:
+            if isinstance(item, dict):
+                yield item
+
+
+class _JsonStream:
+    """Decodes a JSON document value by value from a sliding text window."""
+
+    def __init__(self, stream: TextIO, path: Path) -> None:
+        self._stream = stream
+        self._path = path
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"{self._path} is not a valid raw export: {message}")
+
+    def _fill(self, minimum: int = CHUNK_SIZE) -> bool:
+        if self._eof:
+            return False
+        chunk = self._stream.read(minimum)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, expected: str) -> None:
+        found = self._peek()
+        if found != expected:
+            raise self._error(f"expected {expected!r}, found {found or 'end of file'!r}")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as exc:
+                # Most likely a value cut off by the window; widen it (doubling
+                # keeps very large values linear) and try again.
+                if not self._fill(max(CHUNK_SIZE, len(self._buffer))):
+                    raise self._error(str(exc)) from exc
+                continue
+            # A number at the very end of the window may continue in the next chunk.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _array(self) -> Iterator[Any]:
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise self._error(f"expected ',' or ']', found {separator or 'end of file'!r}")
+
+    def assets(self, header: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        if self._peek() == "[":
+            items = self._array()
+        else:
+            items = self._object_assets(header)
+        for item in items:
+            if isinstance(item, dict):
+                yield item
+
+    def _object_assets(self, header: Dict[str, Any]) -> Iterator[Any]:
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == "assets" and self._peek() == "[":
+                yield from self._array()
+            else:
+                header[key] = self._value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise self._error(f"expected ',' or '}}', found {separator or 'end of file'!r}")
@@ -5,13 +5,17 @@ from dataclasses import asdict
 from datetime import datetime, timezone
 from typing import Any, Dict, Iterable, List
 
+from .conflicts import find_setting_conflicts
+from .effective import EffectivePolicyMatrix
+from .hashing import content_hash
 from .schema import (
-    AssignmentCoverage,
     AssetDetail,
+    AssignmentCoverage,
     ReportMetadata,
     ReportSchema,
     SummarySection,
 )
+from .setting_rows import split_setting_rows
 
 
 def _assignment_groups(assignments: Iterable[Dict[str, Any]]) -> Iterable[str]:
@@ -39,7 +43,22 @@ def _build_summary(assets: List[AssetDetail]) -> SummarySection:
     )
 
 
-def _build_assignment_coverage(assets: List[AssetDetail]) -> AssignmentCoverage:
+def _group_members(
+    assets: List[AssetDetail], member_counts: Dict[str, Dict[str, int]]
+) -> Dict[str, Dict[str, int]]:
+    members: Dict[str, Dict[str, int]] = {}
+    for asset in assets:
+        for assignment in asset.assignments:
+            target = assignment.get("target") or {}
+            counts = member_counts.get(target.get("groupId"))
+            if counts:
+                members[target.get("groupDisplayName") or target["groupId"]] = counts
+    return members
+
+
+def _build_assignment_coverage(
+    assets: List[AssetDetail], member_counts: Dict[str, Dict[str, int]]
+) -> AssignmentCoverage:
     total_assets = len(assets)
     assigned_assets = sum(1 for asset in assets if asset.assignments)
     group_counts = Counter()
@@ -51,47 +70,67 @@ def _build_assignment_coverage(assets: List[AssetDetail]) -> AssignmentCoverage:
         assigned_assets=assigned_assets,
         unassigned_assets=total_assets - assigned_assets,
         assignments_by_group=dict(group_counts),
+        members_by_group=_group_members(assets, member_counts),
+    )
+
+
+def build_asset_detail(raw: Dict[str, Any]) -> AssetDetail:
+    raw_details = raw.get("raw") if isinstance(raw.get("raw"), dict) else {}
+    fields = {
+        "asset_id": str(raw.get("id")),
+        "name": str(raw.get("displayName") or raw.get("name") or raw.get("id")),
+        "asset_type": str(raw.get("type")),
+        "description": str(raw.get("description") or raw_details.get("description") or ""),
+        "settings": raw.get("settings") or {},
+        "assignments": raw.get("assignments") or [],
+        "assignment_mappings": raw.get("assignmentMappings") or [],
+        "scope_tags": raw.get("scopeTags") or [],
+    }
+    # The identity fields are hashed along with settings and assignments
+    # because they are rendered too: a rename must invalidate cached pages.
+    setting_rows, oma_setting_count = split_setting_rows(fields["settings"])
+    return AssetDetail(
+        **fields,
+        content_hash=content_hash(fields),
+        setting_rows=setting_rows,
+        oma_setting_count=oma_setting_count,
     )
 
 
 def _build_asset_details(raw_assets: Iterable[Dict[str, Any]]) -> List[AssetDetail]:
-    assets: List[AssetDetail] = []
-    for raw in raw_assets:
-        raw_details = raw.get("raw") if isinstance(raw.get("raw"), dict) else {}
-        assets.append(
-            AssetDetail(
-                asset_id=str(raw.get("id")),
-                name=str(raw.get("displayName") or raw.get("name") or raw.get("id")),
-                asset_type=str(raw.get("type")),
-                description=str(raw.get("description") or raw_details.get("description") or ""),
-                settings=raw.get("settings") or {},
-                assignments=raw.get("assignments") or [],
-                assignment_mappings=raw.get("assignmentMappings") or [],
-            )
-        )
-    return assets
+    return [build_asset_detail(raw) for raw in raw_assets]
 
 
 def build_report_schema(
     raw_export: Dict[str, Any],
     audience: str,
-    organization: str,
+    organization: str | None,
     generated_at: str | None = None,
+    effective_policies: bool = False,
 ) -> ReportSchema:
+    """Build the report schema from a raw export.
+
+    ``effective_policies`` also computes the group x policy x setting
+    :class:`EffectivePolicyMatrix`, which is opt-in because its section
+    lists every assigned group.
+    """
     assets = _build_asset_details(raw_export.get("assets", []))
+    # Streamed exports only have their top-level fields once the assets are read.
     metadata = ReportMetadata(
-        organization=organization,
-        generated_at=generated_at or datetime.now(timezone.utc).isoformat(),
+        organization=organization or str(raw_export.get("organization") or "Unknown organization"),
+        generated_at=generated_at or raw_export.get("generatedAt") or datetime.now(timezone.utc).isoformat(),
         audience=audience,
     )
     summary = _build_summary(assets)
-    assignment_coverage = _build_assignment_coverage(assets)
+    assignment_coverage = _build_assignment_coverage(assets, raw_export.get("groupMemberCounts") or {})
 
     return ReportSchema(
         metadata=metadata,
         summary=summary,
         assets=assets,
         assignment_coverage=assignment_coverage,
+        setting_conflicts=find_setting_conflicts(assets),
+        effective_policies=EffectivePolicyMatrix.build(assets) if effective_policies else None,
     )
 
 
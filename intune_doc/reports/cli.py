@@ -39,6 +39,30 @@ def _parse_formats(values: Iterable[str]) -> List[str]:
     return formats
 
 
+def _parse_choices(values: Iterable[str], supported: Iterable[str], default: str, label: str) -> List[str]:
+    supported = tuple(supported)
+    choices: List[str] = []
+    for value in values:
+        for item in value.split(","):
+            cleaned = item.strip().lower()
+            if cleaned and cleaned not in choices:
+                choices.append(cleaned)
+
+    invalid = [choice for choice in choices if choice not in supported]
+    if invalid:
+        raise ValueError(f"Unsupported {label}: {', '.join(invalid)}")
+
+    return choices or [default]
+
+
+def _parse_audiences(values: Iterable[str], default: str = "client") -> List[str]:
+    return _parse_choices(values, SUPPORTED_AUDIENCES, default, "audiences")
+
+
+def _parse_scopes(values: Iterable[str], default: ReportScope = DEFAULT_REPORT_SCOPE) -> List[ReportScope]:
+    return _parse_choices(values, SUPPORTED_SCOPES, default, "scopes")  # type: ignore[return-value]
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate Intune reports.")
     parser.add_argument(
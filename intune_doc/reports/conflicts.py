@@ -0,0 +1,111 @@
+"""Find settings that several policies configure for the same groups.
+
+Every setting row of every asset is indexed once under ``(setting, group)``
+for each group the asset is assigned to, so the analysis is linear in the
+number of setting rows times assigned groups rather than quadratic in the
+number of policies. Index entries holding more than one policy are overlaps;
+overlaps whose policies set different values are conflicts.
+
+Settings are compared within one policy type (``settings["policyType"]`` when
+the exporter records it, otherwise the asset type). Only named settings are
+compared: OMA-style setting lists, not metadata like platforms or setting
+counts.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .rendering import distill_assignment_mappings
+from .schema import AssetDetail, SettingConflicts, SettingOverlap
+
+UNNAMED_SETTING = "Unnamed Setting"
+
+# (setting scope, setting) -> group id -> [(asset index, value)]
+SettingIndex = Dict[Tuple[str, str], Dict[str, List[Tuple[int, str]]]]
+
+
+def named_setting_rows(asset: AssetDetail) -> Iterator[Tuple[str, str]]:
+    for row in asset.setting_rows[: asset.oma_setting_count]:
+        if row["setting"] != UNNAMED_SETTING:
+            yield row["setting"], row["value"]
+
+
+def applied_groups(asset: AssetDetail) -> Dict[str, str]:
+    """Names of the groups ``asset`` applies to (included and not excluded), by id."""
+    included: Dict[str, str] = {}
+    excluded = set()
+    for mapping in asset.assignment_mappings or distill_assignment_mappings(asset.assignments):
+        group_id = mapping.get("groupId")
+        if not group_id:
+            continue
+        if mapping.get("assignmentType") == "exclude":
+            excluded.add(group_id)
+        else:
+            included[group_id] = str(mapping.get("groupDisplayName") or group_id)
+    return {group_id: name for group_id, name in included.items() if group_id not in excluded}
+
+
+def index_settings(assets: Iterable[AssetDetail]) -> SettingIndex:
+    index: SettingIndex = defaultdict(lambda: defaultdict(list))
+    for position, asset in enumerate(assets):
+        if not isinstance(asset.settings, dict):
+            continue
+        group_ids = list(applied_groups(asset))
+        if not group_ids:
+            continue
+        setting_scope = str(asset.settings.get("policyType") or asset.asset_type)
+        for setting, value in named_setting_rows(asset):
+            by_group = index[(setting_scope, setting)]
+            for group_id in group_ids:
+                by_group[group_id].append((position, value))
+    return index
+
+
+def find_setting_conflicts(assets: List[AssetDetail]) -> SettingConflicts:
+    index = index_settings(assets)
+    group_names: Dict[str, str] = {}
+    for asset in assets:
+        group_names.update(applied_groups(asset))
+
+    # Groups sharing the same policies and values are reported as one overlap.
+    overlaps: Dict[Tuple[str, str, Tuple[Tuple[int, str], ...]], List[str]] = {}
+    for (setting_scope, setting), by_group in index.items():
+        for group_id, entries in by_group.items():
+            policies = tuple(sorted(set(entries)))
+            if len({position for position, _ in policies}) < 2:
+                continue
+            overlaps.setdefault((setting_scope, setting, policies), []).append(group_names[group_id])
+
+    results = []
+    for (setting_scope, setting, policies), groups in overlaps.items():
+        results.append(
+            SettingOverlap(
+                setting=setting,
+                setting_scope=setting_scope,
+                groups=sorted(groups, key=str.casefold),
+                policies=sorted(
+                    (
+                        {
+                            "asset_id": assets[position].asset_id,
+                            "name": assets[position].name,
+                            "asset_type": assets[position].asset_type,
+                            "value": value,
+                        }
+                        for position, value in policies
+                    ),
+                    key=lambda policy: (policy["name"].casefold(), policy["value"]),
+                ),
+                conflicting=len({value for _, value in policies}) > 1,
+            )
+        )
+    # Conflicts first, then by setting.
+    results.sort(key=lambda overlap: (not overlap.conflicting, overlap.setting.casefold(), overlap.setting_scope))
+    return SettingConflicts(
+        overlapping_settings=len({(overlap.setting_scope, overlap.setting) for overlap in results}),
+        conflicting_settings=len(
+            {(overlap.setting_scope, overlap.setting) for overlap in results if overlap.conflicting}
+        ),
+        overlaps=results,
+    )
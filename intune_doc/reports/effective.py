@@ -0,0 +1,140 @@
+"""Effective configuration per group: which policies and settings it gets.
+
+The group x policy x setting matrix is very sparse, so it is kept as two
+compressed sparse row (CSR) tables of ``array`` integers: groups to the
+policies that apply to them (exclusions already removed), and policies to
+their (setting, value) pairs. Setting names and values are interned in
+string tables. Memory stays proportional to the assignments plus the setting
+rows, however many groups and policies there are, and a group's effective
+settings are read by walking two offset ranges.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .conflicts import applied_groups, named_setting_rows
+from .schema import AssetDetail
+
+
+class EffectivePolicyMatrix:
+    """Groups, policies and settings are addressed by their position in the lists below."""
+
+    def __init__(self) -> None:
+        self.group_ids: List[str] = []
+        self.group_names: List[str] = []
+        self.policy_names: List[str] = []
+        self.setting_names: List[str] = []
+        self.values: List[str] = []
+        # Group row g applies policies group_policies[group_offsets[g]:group_offsets[g + 1]].
+        self.group_offsets = array("L", [0])
+        self.group_policies = array("L")
+        # Policy p sets setting_names[policy_settings[i]] to values[policy_values[i]]
+        # for i in range(policy_offsets[p], policy_offsets[p + 1]).
+        self.policy_offsets = array("L", [0])
+        self.policy_settings = array("L")
+        self.policy_values = array("L")
+        self._group_rows: Dict[str, int] = {}
+        self._setting_ids: Dict[str, int] = {}
+
+    @classmethod
+    def build(cls, assets: Iterable[AssetDetail]) -> "EffectivePolicyMatrix":
+        matrix = cls()
+        group_rows: Dict[str, int] = {}
+        group_members: List[List[int]] = []
+        setting_index: Dict[str, int] = {}
+        value_index: Dict[str, int] = {}
+        for policy, asset in enumerate(assets):
+            matrix.policy_names.append(asset.name)
+            for group_id, group_name in applied_groups(asset).items():
+                row = group_rows.get(group_id)
+                if row is None:
+                    row = group_rows[group_id] = len(matrix.group_ids)
+                    matrix.group_ids.append(group_id)
+                    matrix.group_names.append(group_name)
+                    group_members.append([])
+                group_members[row].append(policy)
+            if isinstance(asset.settings, dict):
+                for setting, value in named_setting_rows(asset):
+                    matrix.policy_settings.append(setting_index.setdefault(setting, len(setting_index)))
+                    matrix.policy_values.append(value_index.setdefault(value, len(value_index)))
+            matrix.policy_offsets.append(len(matrix.policy_settings))
+        # Policies were appended in order, so each group's row is already sorted.
+        for policies in group_members:
+            matrix.group_policies.extend(policies)
+            matrix.group_offsets.append(len(matrix.group_policies))
+        matrix.setting_names = list(setting_index)
+        matrix.values = list(value_index)
+        matrix._setting_ids = setting_index
+        # Ids take precedence over display names that happen to look like ids.
+        matrix._group_rows = {name: row for row, name in reversed(list(enumerate(matrix.group_names)))}
+        matrix._group_rows.update(group_rows)
+        return matrix
+
+    @property
+    def group_count(self) -> int:
+        return len(self.group_ids)
+
+    @property
+    def policy_count(self) -> int:
+        return len(self.policy_names)
+
+    @property
+    def entry_count(self) -> int:
+        """Non-empty (group, policy, setting) cells."""
+        return sum(
+            self.policy_offsets[policy + 1] - self.policy_offsets[policy] for policy in self.group_policies
+        )
+
+    def _policies(self, group: str) -> Iterable[int]:
+        row = self._group_rows.get(group)
+        if row is None:
+            return ()
+        return self.group_policies[self.group_offsets[row] : self.group_offsets[row + 1]]
+
+    def policies_for_group(self, group: str) -> List[str]:
+        """Names of the policies that apply to ``group`` (an id or display name)."""
+        return [self.policy_names[policy] for policy in self._policies(group)]
+
+    def settings_for_group(self, group: str) -> Dict[str, List[Tuple[str, str]]]:
+        """Setting -> [(policy name, value)] for everything ``group`` is configured with."""
+        settings: Dict[str, List[Tuple[str, str]]] = {}
+        for policy in self._policies(group):
+            for index in range(self.policy_offsets[policy], self.policy_offsets[policy + 1]):
+                settings.setdefault(self.setting_names[self.policy_settings[index]], []).append(
+                    (self.policy_names[policy], self.values[self.policy_values[index]])
+                )
+        return settings
+
+    def setting_for_group(self, group: str, setting: str) -> Optional[List[Tuple[str, str]]]:
+        """[(policy name, value)] for ``setting`` in ``group``, or None if nothing sets it."""
+        setting_id = self._setting_ids.get(setting)
+        if setting_id is None:
+            return None
+        found = [
+            (self.policy_names[policy], self.values[self.policy_values[index]])
+            for policy in self._policies(group)
+            for index in range(self.policy_offsets[policy], self.policy_offsets[policy + 1])
+            if self.policy_settings[index] == setting_id
+        ]
+        return found or None
+
+    def section_payload(self) -> Dict[str, object]:
+        groups = []
+        for row, name in enumerate(self.group_names):
+            policies = self.group_policies[self.group_offsets[row] : self.group_offsets[row + 1]]
+            groups.append(
+                {
+                    "group": name,
+                    "policies": [self.policy_names[policy] for policy in policies],
+                    "settings": sum(self.policy_offsets[policy + 1] - self.policy_offsets[policy] for policy in policies),
+                }
+            )
+        groups.sort(key=lambda group: str(group["group"]).casefold())
+        return {
+            "group_count": self.group_count,
+            "policy_count": self.policy_count,
+            "entry_count": self.entry_count,
+            "groups": groups,
+        }
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+
+def content_hash(value: Any) -> str:
+    """Return a stable digest of a JSON-compatible value.
+
+    Keys are sorted so the digest does not depend on the order Graph returned
+    properties in; values that are not JSON types are hashed by ``str()``.
+    """
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def text_hash(text: str) -> str:
+    """Digest of a string that is already canonical, e.g. a rendered setting value."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
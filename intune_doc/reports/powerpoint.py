@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from .rendering import render_report
+from typing import Optional
+
+from .rendering import SectionPayloads, render_report
 from .schema import DEFAULT_REPORT_SCOPE, ReportSchema, RenderedReport, ReportScope
 from .templates import TemplateSet
 
@@ -12,5 +14,6 @@ def render(
     report: ReportSchema,
     template: TemplateSet,
     scope: ReportScope = DEFAULT_REPORT_SCOPE,
+    payloads: Optional[SectionPayloads] = None,
 ) -> RenderedReport:
-    return render_report(FORMAT_NAME, report, template, scope)
+    return render_report(FORMAT_NAME, report, template, scope, payloads)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Optional, Tuple
 
 from . import excel, pdf, powerpoint, word
+from ..tracing import span
+from .rendering import SectionPayloads
 from .schema import DEFAULT_REPORT_SCOPE, ReportSchema, RenderedReport, ReportScope
 from .templates import get_template_set
 
@@ -20,11 +22,35 @@ def render_reports(
     formats: Iterable[str],
     audience: str,
     scope: ReportScope = DEFAULT_REPORT_SCOPE,
+    payloads: Optional[SectionPayloads] = None,
 ) -> Dict[str, RenderedReport]:
     template = get_template_set(audience)
+    payloads = payloads or SectionPayloads(report)
     rendered: Dict[str, RenderedReport] = {}
     for format_name in formats:
         if format_name not in RENDERERS:
             raise ValueError(f"Unknown report format: {format_name}")
-        rendered[format_name] = RENDERERS[format_name](report, template, scope)
+        with span(f"render {format_name}", "render", audience=audience, scope=scope):
+            rendered[format_name] = RENDERERS[format_name](report, template, scope, payloads)
     return rendered
+
+
+def render_report_variants(
+    report: ReportSchema,
+    formats: Iterable[str],
+    audiences: Iterable[str],
+    scopes: Iterable[ReportScope],
+) -> Dict[Tuple[str, ReportScope], Dict[str, RenderedReport]]:
+    """Render every audience and scope combination from one report schema.
+
+    Section payloads are built once per scope and shared by all audiences and
+    formats.
+    """
+    formats = list(formats)
+    scopes = list(scopes)
+    payloads = SectionPayloads(report)
+    return {
+        (audience, scope): render_reports(report, formats, audience, scope, payloads)
+        for audience in audiences
+        for scope in scopes
+    }
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import asdict
-from typing import Any, Dict, List
+from dataclasses import asdict, fields, replace
+from typing import Any, Dict, List, Optional
 
-from .schema import DEFAULT_REPORT_SCOPE, ReportSchema, ReportScope, ReportSection, RenderedReport
+from .schema import DEFAULT_REPORT_SCOPE, AssetDetail, ReportSchema, ReportScope, ReportSection, RenderedReport
 from .templates import TemplateSet
 
 
-def _distill_assignment_mappings(assignments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def distill_assignment_mappings(assignments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     mappings: List[Dict[str, Any]] = []
     for assignment in assignments:
         target = assignment.get("target") or {}
@@ -20,6 +20,9 @@ def _distill_assignment_mappings(assignments: List[Dict[str, Any]]) -> List[Dict
                 "groupType": target.get("groupType"),
                 "groupDynamicRule": target.get("groupDynamicRule"),
                 "assignmentType": target.get("assignmentType"),
+                "filterId": target.get("filterId"),
+                "filterDisplayName": target.get("filterDisplayName"),
+                "filterType": target.get("filterType"),
                 "targetType": target.get("@odata.type") or target.get("type"),
                 "intent": assignment.get("intent"),
                 "delivery": assignment.get("delivery"),
@@ -29,48 +32,127 @@ def _distill_assignment_mappings(assignments: List[Dict[str, Any]]) -> List[Dict
     return mappings
 
 
+class AssetPayload(dict):
+    """An asset's section payload, carrying the writers' rendering data alongside.
+
+    The dict is what JSON reports and the server show. The attributes (the
+    fragment cache key and the setting rows built with the schema) are only
+    read by the writers, so they are never serialized.
+    """
+
+    __slots__ = ("content_hash", "setting_rows", "oma_setting_count")
+
+    def __init__(self, payload: Dict[str, Any], asset: AssetDetail, with_settings: bool = True) -> None:
+        super().__init__(payload)
+        self.content_hash = asset.content_hash
+        self.setting_rows = asset.setting_rows if with_settings else []
+        self.oma_setting_count = asset.oma_setting_count if with_settings else 0
+
+
+_PAYLOAD_FIELDS = tuple(item.name for item in fields(AssetDetail) if not item.metadata.get("internal"))
+
+
 def _build_asset_payloads(report: ReportSchema, scope: ReportScope) -> List[Dict[str, Any]]:
     payloads: List[Dict[str, Any]] = []
     for asset in report.assets:
-        assignment_mappings = asset.assignment_mappings or _distill_assignment_mappings(asset.assignments)
+        assignment_mappings = asset.assignment_mappings or distill_assignment_mappings(asset.assignments)
         if scope == "assignment_summary":
-            payloads.append(
-                {
-                    "asset_id": asset.asset_id,
-                    "name": asset.name,
-                    "asset_type": asset.asset_type,
-                    "assignment_mappings": assignment_mappings,
-                }
-            )
+            payload = {
+                "asset_id": asset.asset_id,
+                "name": asset.name,
+                "asset_type": asset.asset_type,
+                "assignment_mappings": assignment_mappings,
+            }
+            payloads.append(AssetPayload(payload, asset, with_settings=False))
         else:
-            asset_payload = asdict(asset)
-            asset_payload["assignment_mappings"] = assignment_mappings
-            payloads.append(asset_payload)
+            payload = {name: getattr(asset, name) for name in _PAYLOAD_FIELDS}
+            payload["assignment_mappings"] = assignment_mappings
+            payloads.append(AssetPayload(payload, asset))
     return payloads
 
 
+class SectionPayloads:
+    """Section payloads of one report, built on first use and then shared.
+
+    Only the asset payloads depend on the scope and none depend on the
+    template, so every format, audience and scope rendered from the same
+    report can reuse them. The payloads are shared, not copied; writers must
+    treat them as read-only.
+    """
+
+    def __init__(self, report: ReportSchema) -> None:
+        self._report = report
+        self._summary: Optional[Dict[str, Any]] = None
+        self._coverage: Optional[Dict[str, Any]] = None
+        self._conflicts: Optional[Dict[str, Any]] = None
+        self._effective: Optional[Dict[str, Any]] = None
+        self._assets: Dict[str, List[Dict[str, Any]]] = {}
+
+    def summary(self) -> Dict[str, Any]:
+        if self._summary is None:
+            self._summary = asdict(self._report.summary)
+        return self._summary
+
+    def assets(self, scope: ReportScope) -> List[Dict[str, Any]]:
+        if scope not in self._assets:
+            self._assets[scope] = _build_asset_payloads(self._report, scope)
+        return self._assets[scope]
+
+    def assignment_coverage(self) -> Dict[str, Any]:
+        if self._coverage is None:
+            self._coverage = asdict(self._report.assignment_coverage)
+        return self._coverage
+
+    def setting_conflicts(self) -> Dict[str, Any]:
+        if self._conflicts is None:
+            self._conflicts = asdict(self._report.setting_conflicts)
+        return self._conflicts
+
+    def effective_policies(self) -> Optional[Dict[str, Any]]:
+        if self._effective is None and self._report.effective_policies is not None:
+            self._effective = self._report.effective_policies.section_payload()
+        return self._effective
+
+
 def build_sections(
     report: ReportSchema,
     template: TemplateSet,
     scope: ReportScope = DEFAULT_REPORT_SCOPE,
+    payloads: Optional[SectionPayloads] = None,
 ) -> List[ReportSection]:
-    return [
+    payloads = payloads or SectionPayloads(report)
+    sections = [
         ReportSection(
             title=template.summary.title,
             description=template.summary.description,
-            payload={template.summary.data_key: asdict(report.summary)},
+            payload={template.summary.data_key: payloads.summary()},
         ),
         ReportSection(
             title=template.asset_details.title,
             description=template.asset_details.description,
-            payload={template.asset_details.data_key: _build_asset_payloads(report, scope)},
+            payload={template.asset_details.data_key: payloads.assets(scope)},
         ),
         ReportSection(
             title=template.assignment_coverage.title,
             description=template.assignment_coverage.description,
-            payload={template.assignment_coverage.data_key: asdict(report.assignment_coverage)},
+            payload={template.assignment_coverage.data_key: payloads.assignment_coverage()},
+        ),
+        ReportSection(
+            title=template.setting_conflicts.title,
+            description=template.setting_conflicts.description,
+            payload={template.setting_conflicts.data_key: payloads.setting_conflicts()},
         ),
     ]
+    effective_policies = payloads.effective_policies()
+    if effective_policies is not None:
+        sections.append(
+            ReportSection(
+                title=template.effective_policies.title,
+                description=template.effective_policies.description,
+                payload={template.effective_policies.data_key: effective_policies},
+            )
+        )
+    return sections
 
 
 def render_report(
@@ -78,11 +160,16 @@ def render_report(
     report: ReportSchema,
     template: TemplateSet,
     scope: ReportScope = DEFAULT_REPORT_SCOPE,
+    payloads: Optional[SectionPayloads] = None,
 ) -> RenderedReport:
-    sections = build_sections(report, template, scope)
+    sections = build_sections(report, template, scope, payloads)
+    metadata = report.metadata
+    if metadata.audience != template.name:
+        metadata = replace(metadata, audience=template.name)
     return RenderedReport(
         format=format_name,
         audience=template.name,
         sections=sections,
-        metadata=report.metadata,
+        metadata=metadata,
+        scope=scope,
     )
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Literal
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
+
+if TYPE_CHECKING:
+    from .effective import EffectivePolicyMatrix
 
 
 ReportScope = Literal["full_settings", "assignment_summary"]
@@ -31,6 +34,13 @@ class AssetDetail:
     settings: Dict[str, Any] = field(default_factory=dict)
     assignments: List[Dict[str, Any]] = field(default_factory=list)
     assignment_mappings: List[Dict[str, Any]] = field(default_factory=list)
+    scope_tags: List[str] = field(default_factory=list)
+    # Rendering data, not part of the asset payload (see AssetPayload).
+    content_hash: str = field(default="", metadata={"internal": True})
+    # extract_setting_rows(settings), stringified once for every writer. The
+    # first oma_setting_count rows come from an OMA-style settings list.
+    setting_rows: List[Dict[str, str]] = field(default_factory=list, metadata={"internal": True})
+    oma_setting_count: int = field(default=0, metadata={"internal": True})
 
 
 @dataclass(frozen=True)
@@ -39,6 +49,28 @@ class AssignmentCoverage:
     assigned_assets: int
     unassigned_assets: int
     assignments_by_group: Dict[str, int] = field(default_factory=dict)
+    # Group name -> transitive {"users": n, "devices": n}, when they were counted.
+    members_by_group: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class SettingOverlap:
+    """One setting configured by several policies for the same groups."""
+
+    setting: str
+    # The policy type the setting belongs to, e.g. a compliance policy platform.
+    setting_scope: str
+    groups: List[str]
+    # {"asset_id", "name", "asset_type", "value"} for each policy, by name.
+    policies: List[Dict[str, str]]
+    conflicting: bool
+
+
+@dataclass(frozen=True)
+class SettingConflicts:
+    overlapping_settings: int = 0
+    conflicting_settings: int = 0
+    overlaps: List[SettingOverlap] = field(default_factory=list)
 
 
 @dataclass(frozen=True)
@@ -47,6 +79,9 @@ class ReportSchema:
     summary: SummarySection
     assets: List[AssetDetail]
     assignment_coverage: AssignmentCoverage
+    setting_conflicts: SettingConflicts = field(default_factory=SettingConflicts)
+    # Only computed when requested; see build_report_schema.
+    effective_policies: Optional["EffectivePolicyMatrix"] = None
 
 
 @dataclass(frozen=True)
@@ -62,3 +97,4 @@ class RenderedReport:
     audience: str
     sections: List[ReportSection]
     metadata: ReportMetadata
+    scope: ReportScope = DEFAULT_REPORT_SCOPE
@@ -0,0 +1,63 @@
+"""Setting rows: every asset's settings flattened to name, value and description.
+
+Rows are built once per asset when the report schema is built and shared by
+the writers, the conflict analysis, the export store and the search index.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Dict
+
+
+def extract_oma_setting_rows(settings: Dict[str, object]) -> list[dict[str, str]]:
+    raw_settings = settings.get("settings")
+    if not isinstance(raw_settings, list):
+        return []
+    rows: list[dict[str, str]] = []
+    for entry in raw_settings:
+        if not isinstance(entry, dict):
+            continue
+        setting_name = (
+            entry.get("omaUri")
+            or entry.get("displayName")
+            or entry.get("settingDefinitionId")
+            or "Unnamed Setting"
+        )
+        description = (
+            entry.get("description")
+            or (entry.get("settingDefinition") or {}).get("description")
+            or ""
+        )
+        value = entry.get("value")
+        rows.append(
+            {
+                "setting": str(setting_name),
+                "value": stringify_setting_value(value),
+                "description": str(description),
+            }
+        )
+    return rows
+
+
+def stringify_setting_value(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else str(value)
+
+
+def split_setting_rows(settings: Dict[str, object]) -> tuple[list[dict[str, str]], int]:
+    """``extract_setting_rows(settings)`` and how many leading rows came from an OMA-style list."""
+    if not isinstance(settings, dict):
+        return [{"setting": "N/A", "value": "N/A", "description": ""}], 0
+    rows = extract_oma_setting_rows(settings)
+    oma_count = len(rows)
+    if rows:
+        remaining_settings = {key: value for key, value in settings.items() if key != "settings"}
+    else:
+        remaining_settings = settings
+    for key, value in remaining_settings.items():
+        rows.append({"setting": str(key), "value": stringify_setting_value(value), "description": ""})
+    return rows or [{"setting": "N/A", "value": "N/A", "description": ""}], oma_count
+
+
+def extract_setting_rows(settings: Dict[str, object]) -> list[dict[str, str]]:
+    return split_setting_rows(settings)[0]
@@ -17,6 +17,8 @@ class TemplateSet:
     summary: SectionTemplate
     asset_details: SectionTemplate
     assignment_coverage: SectionTemplate
+    setting_conflicts: SectionTemplate
+    effective_policies: SectionTemplate
 
 
 ADMIN_TEMPLATE = TemplateSet(
@@ -36,6 +38,16 @@ ADMIN_TEMPLATE = TemplateSet(
         description="Coverage analysis with group-level assignments and gaps.",
         data_key="assignment_coverage",
     ),
+    setting_conflicts=SectionTemplate(
+        title="Setting Conflicts",
+        description="Settings configured by more than one policy for the same groups, conflicting values first.",
+        data_key="setting_conflicts",
+    ),
+    effective_policies=SectionTemplate(
+        title="Effective Policies by Group",
+        description="Policies and settings each group receives, with exclusions applied.",
+        data_key="effective_policies",
+    ),
 )
 
 CLIENT_TEMPLATE = TemplateSet(
@@ -55,6 +67,16 @@ CLIENT_TEMPLATE = TemplateSet(
         description="Assignment rollup for key groups and coverage status.",
         data_key="assignment_coverage",
     ),
+    setting_conflicts=SectionTemplate(
+        title="Setting Overlaps",
+        description="Settings that more than one policy configures for the same groups.",
+        data_key="setting_conflicts",
+    ),
+    effective_policies=SectionTemplate(
+        title="Policies by Group",
+        description="What each group receives once exclusions are taken into account.",
+        data_key="effective_policies",
+    ),
 )
 
 TEMPLATE_SETS: Dict[str, TemplateSet] = {
@@ -0,0 +1,312 @@
+"""Full-text search index over exported assets and settings.
+
+The index is an SQLite database holding an inverted index: every term of an
+asset's name, description, setting ids, setting display names and values maps
+to the entries (one per field or setting row) it occurs in. A query is a
+handful of indexed range scans over the term table, so it answers in
+milliseconds without loading any raw export.
+
+One index can hold the exports of several tenants, keyed by organization.
+Updates are incremental: an asset whose content hash is unchanged since it was
+last indexed is skipped, and assets missing from the new export are removed.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .config import SEARCH_INDEX_NAME
+from .reports.schema import AssetDetail, ReportSchema
+
+
+SCHEMA_VERSION = 1
+
+# Longer tokens are hashes, certificates or encoded blobs nobody searches for.
+MAX_TERM_LENGTH = 40
+# Stored entry text, shown as the snippet of a hit.
+MAX_ENTRY_TEXT = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS exports (
+    id INTEGER PRIMARY KEY,
+    organization TEXT NOT NULL UNIQUE,
+    generated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS assets (
+    id INTEGER PRIMARY KEY,
+    export_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    asset_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    UNIQUE (export_id, type, asset_id)
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    asset INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    setting TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, term TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS postings (
+    term INTEGER NOT NULL,
+    entry INTEGER NOT NULL,
+    PRIMARY KEY (term, entry)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_asset ON entries (asset);
+CREATE INDEX IF NOT EXISTS postings_entry ON postings (entry);
+"""
+
+_WORD = re.compile(r"[0-9A-Za-z]+")
+_WORD_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    organization: str
+    asset_type: str
+    asset_id: str
+    name: str
+    field: str
+    setting: str
+    text: str
+
+
+@dataclass(frozen=True)
+class SearchIndexUpdate:
+    indexed: int
+    unchanged: int
+    removed: int
+
+
+def search_index_path(output_directory: Path) -> Path:
+    return Path(output_directory) / SEARCH_INDEX_NAME
+
+
+def index_terms(text: str) -> Set[str]:
+    """Lower-cased words of ``text`` plus the parts of camelCase words."""
+    terms: Set[str] = set()
+    for word in _WORD.findall(text):
+        if len(word) > MAX_TERM_LENGTH:
+            continue
+        terms.add(word.lower())
+        terms.update(part.lower() for part in _WORD_PART.findall(word))
+    return terms
+
+
+def query_terms(query: str) -> List[str]:
+    return sorted({word.lower() for word in _WORD.findall(query)})
+
+
+def _asset_entries(asset: AssetDetail) -> Iterator[Tuple[str, str, str]]:
+    """(field, setting, text) for each searchable part of ``asset``."""
+    yield "name", "", asset.name
+    if asset.description:
+        yield "description", "", asset.description
+    if not asset.settings:
+        return
+    raw_settings = asset.settings.get("settings") if isinstance(asset.settings, dict) else None
+    if not isinstance(raw_settings, list):
+        raw_settings = []
+    # The OMA-style rows come first, one per dict entry of the settings list.
+    oma_entries = [item for item in raw_settings if isinstance(item, dict)]
+    for position, row in enumerate(asset.setting_rows):
+        setting_names = [row["setting"]]
+        if position < asset.oma_setting_count:
+            entry = oma_entries[position]
+            setting_names.extend(
+                str(entry[key])
+                for key in ("displayName", "settingDefinitionId")
+                if entry.get(key) and str(entry[key]) != row["setting"]
+            )
+        yield "setting", row["setting"], " ".join(setting_names)
+        if row["value"]:
+            yield "value", row["setting"], row["value"]
+        if row["description"]:
+            yield "description", row["setting"], row["description"]
+
+
+class SearchIndex:
+    """An index file, created on first use."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        version = self._metadata("schema_version") if self._has_metadata() else None
+        if version is not None and version != str(SCHEMA_VERSION):
+            self._connection.close()
+            self.path.unlink()
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute("PRAGMA journal_mode = WAL")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+        self._term_ids: Dict[str, int] = {}
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _has_metadata(self) -> bool:
+        return bool(
+            self._connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'metadata'"
+            ).fetchone()
+        )
+
+    def _metadata(self, key: str) -> Optional[str]:
+        row = self._connection.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            self._connection.execute("INSERT OR IGNORE INTO terms (term) VALUES (?)", (term,))
+            (term_id,) = self._connection.execute("SELECT id FROM terms WHERE term = ?", (term,)).fetchone()
+            self._term_ids[term] = term_id
+        return term_id
+
+    def _remove_assets(self, asset_rows: Iterable[int]) -> None:
+        for asset_row in asset_rows:
+            self._connection.execute(
+                "DELETE FROM postings WHERE entry IN (SELECT id FROM entries WHERE asset = ?)", (asset_row,)
+            )
+            self._connection.execute("DELETE FROM entries WHERE asset = ?", (asset_row,))
+            self._connection.execute("DELETE FROM assets WHERE id = ?", (asset_row,))
+
+    def _add_asset(self, export_id: int, asset: AssetDetail) -> None:
+        cursor = self._connection.execute(
+            "INSERT INTO assets (export_id, type, asset_id, name, content_hash) VALUES (?, ?, ?, ?, ?)",
+            (export_id, asset.asset_type, asset.asset_id, asset.name, asset.content_hash),
+        )
+        asset_row = cursor.lastrowid
+        for field, setting, text in _asset_entries(asset):
+            entry = self._connection.execute(
+                "INSERT INTO entries (asset, field, setting, text) VALUES (?, ?, ?, ?)",
+                (asset_row, field, setting, text[:MAX_ENTRY_TEXT]),
+            ).lastrowid
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO postings (term, entry) VALUES (?, ?)",
+                [(self._term_id(term), entry) for term in index_terms(text)],
+            )
+
+    def update(self, organization: str, assets: Iterable[AssetDetail], generated_at: Optional[str] = None) -> SearchIndexUpdate:
+        """Make the index hold exactly ``assets`` for ``organization``, re-indexing only changed assets."""
+        indexed = unchanged = 0
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO exports (organization, generated_at) VALUES (?, ?) "
+                "ON CONFLICT (organization) DO UPDATE SET generated_at = excluded.generated_at",
+                (organization, generated_at),
+            )
+            (export_id,) = self._connection.execute(
+                "SELECT id FROM exports WHERE organization = ?", (organization,)
+            ).fetchone()
+            previous = {
+                (asset_type, asset_id): (asset_row, content_hash)
+                for asset_row, asset_type, asset_id, content_hash in self._connection.execute(
+                    "SELECT id, type, asset_id, content_hash FROM assets WHERE export_id = ?", (export_id,)
+                )
+            }
+            for asset in assets:
+                known = previous.pop((asset.asset_type, asset.asset_id), None)
+                if known is not None and known[1] == asset.content_hash:
+                    unchanged += 1
+                    continue
+                if known is not None:
+                    self._remove_assets([known[0]])
+                self._add_asset(export_id, asset)
+                indexed += 1
+            self._remove_assets(asset_row for asset_row, _ in previous.values())
+            if previous or indexed:
+                # Terms of removed or rewritten entries that nothing uses any more.
+                self._connection.execute(
+                    "DELETE FROM terms WHERE NOT EXISTS (SELECT 1 FROM postings WHERE postings.term = terms.id)"
+                )
+                self._term_ids.clear()
+        return SearchIndexUpdate(indexed=indexed, unchanged=unchanged, removed=len(previous))
+
+    def organizations(self) -> List[str]:
+        return [row[0] for row in self._connection.execute("SELECT organization FROM exports ORDER BY organization")]
+
+    def search(self, query: str, organization: Optional[str] = None, limit: int = 50) -> List[SearchHit]:
+        """Entries of the assets matching every word of ``query``.
+
+        Words match as prefixes, case-insensitively, anywhere in an asset: in its
+        name, description, setting ids and display names, or setting values.
+        """
+        words = query_terms(query)
+        if not words:
+            return []
+        # Entries holding each word, restricted to the assets that hold all of them.
+        matches = " UNION ALL ".join(
+            f"""
+            SELECT {position} AS word, entries.asset AS asset, entries.id AS entry
+            FROM terms
+            JOIN postings ON postings.term = terms.id
+            JOIN entries ON entries.id = postings.entry
+            WHERE terms.term >= ? AND terms.term < ?
+            """
+            for position in range(len(words))
+        )
+        rows = self._connection.execute(
+            f"""
+            WITH matches AS ({matches}),
+            matched_assets AS (
+                SELECT asset FROM matches GROUP BY asset HAVING count(DISTINCT word) = ?
+            ),
+            matched_entries AS (
+                SELECT DISTINCT asset, entry FROM matches WHERE asset IN (SELECT asset FROM matched_assets)
+            )
+            SELECT exports.organization, assets.type, assets.asset_id, assets.name,
+                   entries.field, entries.setting, entries.text
+            FROM matched_entries
+            JOIN entries ON entries.id = matched_entries.entry
+            JOIN assets ON assets.id = matched_entries.asset
+            JOIN exports ON exports.id = assets.export_id
+            WHERE ? IS NULL OR exports.organization = ?
+            ORDER BY exports.organization COLLATE NOCASE, assets.name COLLATE NOCASE, assets.asset_id, entries.id
+            LIMIT ?
+            """,
+            (
+                *(bound for word in words for bound in (word, f"{word}\uffff")),
+                len(words),
+                organization,
+                organization,
+                limit,
+            ),
+        )
+        return [SearchHit(*row) for row in rows]
+
+
+def update_search_index(path: Path, report: ReportSchema) -> SearchIndexUpdate:
+    """Add or refresh ``report``'s export in the index at ``path``."""
+    with SearchIndex(path) as index:
+        return index.update(report.metadata.organization, report.assets, report.metadata.generated_at)
+
+
+def format_hits(hits: Iterable[SearchHit]) -> str:
+    lines: List[str] = []
+    for hit in hits:
+        location = f"{hit.field}" if not hit.setting else f"{hit.field} {hit.setting}"
+        text = " ".join(hit.text.split())
+        if len(text) > 120:
+            text = f"{text[:117]}..."
+        lines.append(f"{hit.organization} | {hit.asset_type} | {hit.name} | {location}: {text}")
+    return "\n".join(lines) if lines else "No matches."
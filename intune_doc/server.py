@@ -0,0 +1,287 @@
+"""Local HTTP server that renders reports from saved exports on demand.
+
+Each export is loaded once into a report schema whose section payloads are
+shared by every request. Rendered artifacts (JSON sections and report files)
+are kept in an LRU cache bounded by size and keyed by export hash, audience,
+scope and format, so a report is rendered on the first request for it and
+then served from memory. Concurrent requests for the same artifact wait for
+one render instead of starting their own.
+
+Routes (all GET):
+
+- ``/exports``: the loaded exports;
+- ``/exports/<hash>/sections``: rendered sections as JSON;
+- ``/exports/<hash>/report.<docx|xlsx|pptx|pdf>``: a report file;
+- ``/exports/<hash>/assets``: asset payloads, a page at a time.
+
+``audience`` and ``scope`` query parameters pick the variant; the assets view
+also takes ``page``, ``per_page`` and ``type``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import tempfile
+import threading
+import urllib.parse
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .config import DEFAULT_CACHE_MB
+from .output import REPORT_WRITERS, dataclass_fields, filter_sections, write_rendered_reports
+from .raw_export import open_raw_export
+from .reports.builder import build_report_schema
+from .reports.cli import SUPPORTED_AUDIENCES, SUPPORTED_SCOPES
+from .reports.hashing import content_hash
+from .reports.registry import render_reports
+from .reports.rendering import SectionPayloads, render_report
+from .reports.schema import ReportSchema
+from .reports.templates import get_template_set
+from .writers.common import WriterOptions, shard_file_slug
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# File suffix in the URL -> format name.
+FILE_FORMATS = {suffix.lstrip("."): format_name for format_name, (_, suffix) in REPORT_WRITERS.items()}
+CONTENT_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    "pdf": "application/pdf",
+    "json": "application/json",
+}
+
+ArtifactKey = Tuple[str, str, str, str]
+
+
+class RequestError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class LoadedExport:
+    export_hash: str
+    source: Path
+    report: ReportSchema
+    payloads: SectionPayloads
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "hash": self.export_hash,
+            "source": str(self.source),
+            "organization": self.report.metadata.organization,
+            "generated_at": self.report.metadata.generated_at,
+            "assets": len(self.report.assets),
+        }
+
+
+def load_export(path: Path, effective_policies: bool = False) -> LoadedExport:
+    report = build_report_schema(
+        open_raw_export(path),
+        audience="admin",
+        organization=None,
+        effective_policies=effective_policies,
+    )
+    export_hash = content_hash(
+        [report.metadata.organization, report.metadata.generated_at, [asset.content_hash for asset in report.assets]]
+    )
+    return LoadedExport(export_hash=export_hash, source=Path(path), report=report, payloads=SectionPayloads(report))
+
+
+class ArtifactCache:
+    """Rendered artifacts, least recently used first out once over ``max_bytes``."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[ArtifactKey, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._rendering: Dict[ArtifactKey, threading.Lock] = {}
+
+    def _lookup(self, key: ArtifactKey) -> Optional[bytes]:
+        # Called with the lock held.
+        artifact = self._entries.get(key)
+        if artifact is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return artifact
+
+    def get_or_render(self, key: ArtifactKey, render: Callable[[], bytes]) -> bytes:
+        with self._lock:
+            artifact = self._lookup(key)
+            if artifact is not None:
+                return artifact
+            key_lock = self._rendering.setdefault(key, threading.Lock())
+        # One render per key; other requests for it wait and then read the cache.
+        with key_lock:
+            with self._lock:
+                artifact = self._lookup(key)
+                if artifact is not None:
+                    return artifact
+                self.misses += 1
+            try:
+                artifact = render()
+            except BaseException:
+                with self._lock:
+                    self._rendering.pop(key, None)
+                raise
+            with self._lock:
+                self._rendering.pop(key, None)
+                self._entries[key] = artifact
+                self.size += len(artifact)
+                while self.size > self.max_bytes and len(self._entries) > 1:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.size -= len(evicted)
+            return artifact
+
+
+class ReportServer:
+    def __init__(
+        self,
+        exports: Iterable[LoadedExport],
+        include_sections: Iterable[str] = (),
+        writer_options: Optional[WriterOptions] = None,
+        cache_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024,
+        default_audience: str = "client",
+    ) -> None:
+        self.exports = {export.export_hash: export for export in exports}
+        self.default_audience = default_audience
+        self.include_sections = list(include_sections)
+        # A response is one file: shards would need links the client cannot follow,
+        # and the request thread is the only worker a render should use.
+        self.writer_options = replace(
+            writer_options or WriterOptions(), excel_shard_by="sheet", word_shard_by="none", max_workers=1
+        )
+        self.cache = ArtifactCache(cache_bytes)
+
+    def export(self, export_hash: str) -> LoadedExport:
+        export = self.exports.get(export_hash)
+        if export is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown export: {export_hash}")
+        return export
+
+    def sections(self, export: LoadedExport, audience: str, scope: str) -> bytes:
+        def render() -> bytes:
+            rendered = render_report("json", export.report, get_template_set(audience), scope, export.payloads)
+            filtered = filter_sections(rendered, self.include_sections)
+            return json.dumps(filtered, ensure_ascii=False, default=dataclass_fields).encode("utf-8")
+
+        return self.cache.get_or_render((export.export_hash, audience, scope, "json"), render)
+
+    def report_file(self, export: LoadedExport, audience: str, scope: str, format_name: str) -> bytes:
+        def render() -> bytes:
+            rendered = render_reports(export.report, [format_name], audience, scope, export.payloads)
+            with tempfile.TemporaryDirectory(prefix="intune-doc-serve-") as temp_dir:
+                paths = write_rendered_reports(
+                    rendered, Path(temp_dir) / "report", self.include_sections, self.writer_options
+                )
+                return paths[format_name].read_bytes()
+
+        return self.cache.get_or_render((export.export_hash, audience, scope, format_name), render)
+
+    def assets_page(self, export: LoadedExport, scope: str, page: int, per_page: int, asset_type: str = "") -> bytes:
+        assets: List[Dict[str, Any]] = export.payloads.assets(scope)
+        if asset_type:
+            assets = [asset for asset in assets if asset.get("asset_type") == asset_type]
+        start = (page - 1) * per_page
+        payload = {
+            "page": page,
+            "per_page": per_page,
+            "total": len(assets),
+            "pages": max(1, -(-len(assets) // per_page)),
+            "assets": assets[start : start + per_page],
+        }
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    def handle(self, path: str, query: Dict[str, str]) -> Tuple[bytes, str, Optional[str]]:
+        """Body, content type and download file name for a GET of ``path``."""
+        parts = [part for part in path.split("/") if part]
+        if parts == ["exports"]:
+            listing = [export.describe() for export in self.exports.values()]
+            return json.dumps(listing, ensure_ascii=False).encode("utf-8"), CONTENT_TYPES["json"], None
+        if len(parts) != 3 or parts[0] != "exports":
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown path: {path}")
+
+        export = self.export(parts[1])
+        audience = _choice(query, "audience", SUPPORTED_AUDIENCES, self.default_audience)
+        scope = _choice(query, "scope", SUPPORTED_SCOPES, SUPPORTED_SCOPES[0])
+        view = parts[2]
+        if view == "sections":
+            return self.sections(export, audience, scope), CONTENT_TYPES["json"], None
+        if view == "assets":
+            page = _positive_int(query, "page", 1)
+            per_page = min(_positive_int(query, "per_page", DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+            return self.assets_page(export, scope, page, per_page, query.get("type", "")), CONTENT_TYPES["json"], None
+        stem, _, suffix = view.partition(".")
+        if stem == "report" and suffix in FILE_FORMATS:
+            body = self.report_file(export, audience, scope, FILE_FORMATS[suffix])
+            file_name = f"{shard_file_slug(export.report.metadata.organization, set())}-{audience}-{scope}.{suffix}"
+            return body, CONTENT_TYPES[suffix], file_name
+        raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown view: {view}")
+
+
+def _choice(query: Dict[str, str], name: str, supported: Iterable[str], default: str) -> str:
+    value = query.get(name, default).strip().lower()
+    if value not in supported:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"{name} must be one of: {', '.join(supported)}")
+    return value
+
+
+def _positive_int(query: Dict[str, str], name: str, default: int) -> int:
+    try:
+        value = int(query.get(name, default))
+    except ValueError as exc:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer") from exc
+    if value < 1:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"{name} must be at least 1")
+    return value
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = "intune-doc"
+
+    def do_GET(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            body, content_type, file_name = self.server.report_server.handle(url.path, query)
+        except RequestError as exc:
+            self._send(exc.status, json.dumps({"error": str(exc)}).encode("utf-8"), CONTENT_TYPES["json"])
+            return
+        except Exception:
+            logger.exception("Rendering %s failed", self.path)
+            error = json.dumps({"error": "Rendering failed"}).encode("utf-8")
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, error, CONTENT_TYPES["json"])
+            return
+        self._send(HTTPStatus.OK, body, content_type, file_name)
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str, file_name: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if file_name:
+            self.send_header("Content-Disposition", f'attachment; filename="{file_name}"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info("%s %s", self.address_string(), format % args)
+
+
+def make_http_server(report_server: ReportServer, host: str, port: int) -> ThreadingHTTPServer:
+    http_server = ThreadingHTTPServer((host, port), _RequestHandler)
+    http_server.daemon_threads = True
+    http_server.report_server = report_server
+    return http_server
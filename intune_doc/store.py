@@ -0,0 +1,277 @@
+"""SQLite store for raw exports.
+
+An export is written to a single database with one row per asset, setting
+row, assignment and group. Indexes cover the common questions (assets of a
+type, policies targeting a group, policies setting something), so they are
+answered with indexed queries rather than a scan of the raw JSON. Each asset's
+full raw payload is kept alongside, so reports can be rebuilt from the store
+alone.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .reports.builder import build_asset_detail
+from .reports.rendering import distill_assignment_mappings
+
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE assets (
+    type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (type, id)
+);
+CREATE TABLE settings (
+    asset_type TEXT NOT NULL,
+    asset_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    setting TEXT NOT NULL COLLATE NOCASE,
+    value TEXT NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE TABLE assignments (
+    asset_type TEXT NOT NULL,
+    asset_id TEXT NOT NULL,
+    group_id TEXT,
+    target_type TEXT,
+    assignment_type TEXT,
+    intent TEXT,
+    payload TEXT NOT NULL
+);
+CREATE TABLE groups (
+    id TEXT PRIMARY KEY,
+    display_name TEXT,
+    group_type TEXT,
+    dynamic_rule TEXT
+);
+"""
+
+# Created after the bulk load, which is much faster than maintaining them
+# row by row. The assets primary key already serves lookups by type.
+_INDEXES = """
+CREATE INDEX assets_position ON assets (position);
+CREATE INDEX settings_asset ON settings (asset_type, asset_id);
+CREATE INDEX settings_setting ON settings (setting);
+CREATE INDEX assignments_asset ON assignments (asset_type, asset_id);
+CREATE INDEX assignments_group ON assignments (group_id);
+CREATE INDEX groups_display_name ON groups (display_name COLLATE NOCASE);
+"""
+
+AssetKey = Tuple[str, str]
+
+
+def store_path(output_prefix: Path) -> Path:
+    return output_prefix.with_name(f"{output_prefix.name}-export.sqlite")
+
+
+def _asset_rows(raw_assets: Iterable[Dict[str, Any]]) -> Iterator[Tuple[tuple, List[tuple], List[tuple], List[tuple]]]:
+    for position, raw_asset in enumerate(raw_assets):
+        asset = build_asset_detail(raw_asset)
+        key = (asset.asset_type, asset.asset_id)
+        settings = [
+            (*key, index, row["setting"], row["value"], row["description"])
+            for index, row in enumerate(asset.setting_rows)
+        ]
+        assignments = []
+        groups = []
+        for mapping in asset.assignment_mappings or distill_assignment_mappings(asset.assignments):
+            group_id = mapping.get("groupId")
+            assignments.append(
+                (
+                    *key,
+                    group_id,
+                    mapping.get("targetType"),
+                    mapping.get("assignmentType"),
+                    mapping.get("intent"),
+                    json.dumps(mapping, ensure_ascii=False),
+                )
+            )
+            if group_id:
+                groups.append(
+                    (
+                        group_id,
+                        mapping.get("groupDisplayName"),
+                        mapping.get("groupType"),
+                        mapping.get("groupDynamicRule"),
+                    )
+                )
+        asset_row = (
+            *key,
+            position,
+            asset.name,
+            asset.description,
+            asset.content_hash,
+            json.dumps(raw_asset, ensure_ascii=False),
+        )
+        yield asset_row, settings, assignments, groups
+
+
+def write_export_store(raw_export: Dict[str, Any], output_prefix: Path) -> Path:
+    """Write ``raw_export`` to ``<prefix>-export.sqlite``, replacing any previous store."""
+    output_prefix.parent.mkdir(parents=True, exist_ok=True)
+    output_path = store_path(output_prefix)
+    temp_path = output_path.with_name(f"{output_path.name}.tmp")
+    if temp_path.exists():
+        temp_path.unlink()
+
+    connection = sqlite3.connect(temp_path)
+    try:
+        # A fresh file that is renamed into place once complete, so the
+        # rollback journal buys nothing.
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(_SCHEMA)
+        with connection:
+            connection.executemany(
+                "INSERT INTO metadata (key, value) VALUES (?, ?)",
+                [
+                    ("schema_version", str(SCHEMA_VERSION)),
+                    ("generated_at", raw_export.get("generatedAt")),
+                    ("organization", raw_export.get("organization")),
+                    ("group_member_counts", json.dumps(raw_export.get("groupMemberCounts") or {})),
+                ],
+            )
+            seen: Set[AssetKey] = set()
+            for asset_row, settings, assignments, groups in _asset_rows(raw_export.get("assets", [])):
+                key = (asset_row[0], asset_row[1])
+                if key in seen:
+                    # A later duplicate replaces the asset, so drop the rows of the
+                    # earlier one too (rare, and before the indexes exist, so a scan).
+                    for table in ("settings", "assignments"):
+                        connection.execute(f"DELETE FROM {table} WHERE asset_type = ? AND asset_id = ?", key)
+                seen.add(key)
+                connection.execute(
+                    "INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    asset_row,
+                )
+                connection.executemany("INSERT INTO settings VALUES (?, ?, ?, ?, ?, ?)", settings)
+                connection.executemany("INSERT INTO assignments VALUES (?, ?, ?, ?, ?, ?, ?)", assignments)
+                connection.executemany(
+                    "INSERT INTO groups VALUES (?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET "
+                    "display_name = coalesce(excluded.display_name, display_name), "
+                    "group_type = coalesce(excluded.group_type, group_type), "
+                    "dynamic_rule = coalesce(excluded.dynamic_rule, dynamic_rule)",
+                    groups,
+                )
+        connection.executescript(_INDEXES)
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+    os.replace(temp_path, output_path)
+    return output_path
+
+
+class ExportStore:
+    """Read access to a store written by :func:`write_export_store`."""
+
+    def __init__(self, path: Path) -> None:
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Export store not found: {path}")
+        self._connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+    def __enter__(self) -> "ExportStore":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _metadata(self, key: str) -> Optional[str]:
+        row = self._connection.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def generated_at(self) -> Optional[str]:
+        return self._metadata("generated_at")
+
+    @property
+    def organization(self) -> Optional[str]:
+        return self._metadata("organization")
+
+    @property
+    def group_member_counts(self) -> Dict[str, Dict[str, int]]:
+        return json.loads(self._metadata("group_member_counts") or "{}")
+
+    def iter_assets(self, asset_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield raw asset payloads in export order, optionally of one type."""
+        if asset_type is None:
+            cursor = self._connection.execute("SELECT payload FROM assets ORDER BY position")
+        else:
+            cursor = self._connection.execute(
+                "SELECT payload FROM assets WHERE type = ? ORDER BY position",
+                (asset_type,),
+            )
+        for (payload,) in cursor:
+            yield json.loads(payload)
+
+    def raw_export(self) -> Dict[str, Any]:
+        raw_export: Dict[str, Any] = {"generatedAt": self.generated_at, "assets": list(self.iter_assets())}
+        if self.organization is not None:
+            raw_export["organization"] = self.organization
+        if self.group_member_counts:
+            raw_export["groupMemberCounts"] = self.group_member_counts
+        return raw_export
+
+    def asset_types(self) -> Dict[str, int]:
+        return dict(self._connection.execute("SELECT type, count(*) FROM assets GROUP BY type ORDER BY type"))
+
+    def policies_for_group(self, group: str) -> List[Dict[str, str]]:
+        """Assets assigned to ``group``, given as a group id or display name."""
+        rows = self._connection.execute(
+            """
+            SELECT DISTINCT assets.type, assets.id, assets.name, assignments.assignment_type, assignments.intent
+            FROM assignments
+            JOIN assets ON assets.type = assignments.asset_type AND assets.id = assignments.asset_id
+            WHERE assignments.group_id = ?
+               OR assignments.group_id IN (SELECT id FROM groups WHERE display_name = ? COLLATE NOCASE)
+            ORDER BY assets.position
+            """,
+            (group, group),
+        )
+        return [
+            {"type": row[0], "id": row[1], "name": row[2], "assignment_type": row[3] or "", "intent": row[4] or ""}
+            for row in rows
+        ]
+
+    def policies_with_setting(self, text: str, prefix: bool = False) -> List[Dict[str, str]]:
+        """Assets with a setting whose name contains ``text``, case-insensitively.
+
+        With ``prefix`` the name must start with ``text`` instead, which is
+        answered from the setting index (``"./Device/Vendor/MSFT/BitLocker"``).
+        ``%`` and ``_`` in ``text`` match themselves.
+        """
+        escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"{escaped}%" if prefix else f"%{escaped}%"
+        rows = self._connection.execute(
+            """
+            SELECT assets.type, assets.id, assets.name, settings.setting, settings.value
+            FROM settings
+            JOIN assets ON assets.type = settings.asset_type AND assets.id = settings.asset_id
+            WHERE settings.setting LIKE ? ESCAPE '\\'
+            ORDER BY assets.position, settings.position
+            """,
+            (pattern,),
+        )
+        return [
+            {"type": row[0], "id": row[1], "name": row[2], "setting": row[3], "value": row[4]}
+            for row in rows
+        ]
+
+    def query(self, sql: str, parameters: Iterable[Any] = ()) -> List[tuple]:
+        """Run an ad-hoc read-only query."""
+        return self._connection.execute(sql, tuple(parameters)).fetchall()
@@ -0,0 +1 @@
+"""Format-specific document writers."""
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Mapping, Optional, Sequence, Union
+
+
+@dataclass(frozen=True)
+class Heading:
+    text: str
+    level: int = 1
+
+
+@dataclass(frozen=True)
+class Paragraph:
+    text: str
+    style: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Link:
+    """A paragraph holding a single external hyperlink, e.g. to a shard file."""
+
+    text: str
+    target: str
+    style: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PageBreak:
+    pass
+
+
+@dataclass(frozen=True)
+class TableOfContents:
+    pass
+
+
+@dataclass(frozen=True)
+class Table:
+    headers: Sequence[str]
+    rows: Iterable[Sequence[str]]
+    style: str
+    header_fill: str
+    column_fills: Mapping[int, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Fragment:
+    """A run of blocks that a writer may cache under ``key``.
+
+    ``render`` produces the blocks; writers without a render cache (or on a
+    cache miss) simply write whatever it returns.
+    """
+
+    key: str
+    render: Callable[[], Iterable["Block"]]
+
+
+Block = Union[Heading, Paragraph, Link, PageBreak, TableOfContents, Table, Fragment]
@@ -0,0 +1,245 @@
+"""Report data helpers shared by the format-specific writers.
+
+Everything here is plain Python so the writer modules (and ``output``) can
+share it without pulling in a document library.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from ..external_sort import DEFAULT_RUN_SIZE
+from ..reports.schema import RenderedReport
+from ..reports.setting_rows import extract_setting_rows
+
+
+@dataclass(frozen=True)
+class WriterOptions:
+    excel_shard_by: str = "sheet"
+    word_backend: str = "python-docx"
+    word_shard_by: str = "none"
+    word_shard_size: int = 500
+    render_cache_directory: Optional[str] = None
+    max_workers: Optional[int] = None
+    # Rows held in memory per external-sort run before spilling to disk.
+    sort_run_size: int = DEFAULT_RUN_SIZE
+
+
+def map_in_workers(function: Callable, jobs: list, max_workers: Optional[int] = None) -> list:
+    """Run ``function`` over ``jobs`` in worker processes when more than one is useful."""
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    if workers > 1 and len(jobs) > 1:
+        # multiprocessing is slow to import; only pay for it when fanning out.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, jobs))
+    return [function(job) for job in jobs]
+
+
+def shard_file_slug(key: str, used: set[str]) -> str:
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "-", key).strip("-.") or "unassigned"
+    candidate = slug
+    suffix = 2
+    while candidate.casefold() in used:
+        candidate = f"{slug}-{suffix}"
+        suffix += 1
+    used.add(candidate.casefold())
+    return candidate
+
+
+def extract_assets_payload(report: RenderedReport) -> list[dict[str, object]]:
+    assets_payload = next(
+        (section.payload.get("assets") for section in report.sections if "assets" in section.payload),
+        None,
+    )
+    if isinstance(assets_payload, list):
+        return assets_payload
+    return []
+
+
+def extract_assignment_coverage_payload(report: RenderedReport) -> Dict[str, object]:
+    payload = next(
+        (
+            section.payload.get("assignment_coverage")
+            for section in report.sections
+            if "assignment_coverage" in section.payload
+        ),
+        None,
+    )
+    if isinstance(payload, dict):
+        return payload
+    return {}
+
+
+def extract_summary_payload(report: RenderedReport) -> Dict[str, object]:
+    payload = next(
+        (section.payload.get("summary") for section in report.sections if "summary" in section.payload),
+        None,
+    )
+    if isinstance(payload, dict):
+        return payload
+    return {}
+
+
+def summarize_groups(assets_payload: object) -> list[dict[str, object]]:
+    summary: Dict[str, dict[str, object]] = {}
+    if not isinstance(assets_payload, list):
+        return []
+    for asset in assets_payload:
+        asset_id = asset.get("asset_id")
+        assignments = asset.get("assignment_mappings", [])
+        settings = asset.get("settings", {}) or {}
+        settings_count = len(settings) if isinstance(settings, dict) else 0
+        for mapping in assignments:
+            group_id = mapping.get("groupId")
+            if not group_id:
+                continue
+            group_entry = summary.setdefault(
+                group_id,
+                {
+                    "name": mapping.get("groupDisplayName") or group_id,
+                    "type": mapping.get("groupType") or "unknown",
+                    "dynamic_rule": mapping.get("groupDynamicRule"),
+                    "assigned_assets": set(),
+                    "settings_applied": 0,
+                },
+            )
+            group_entry["assigned_assets"].add(asset_id)
+            group_entry["settings_applied"] += settings_count
+
+    results: list[dict[str, object]] = []
+    for group in summary.values():
+        results.append(
+            {
+                "name": group["name"],
+                "type": group["type"],
+                "dynamic_rule": group["dynamic_rule"],
+                "assigned_assets": len(group["assigned_assets"]),
+                "settings_applied": group["settings_applied"],
+            }
+        )
+    return sorted(results, key=lambda item: item["name"].lower())
+
+
+def summarize_inventory(assets_payload: object) -> list[dict[str, object]]:
+    if not isinstance(assets_payload, list):
+        return []
+    summary: Dict[str, dict[str, int]] = {}
+    for asset in assets_payload:
+        asset_type = asset.get("asset_type") or "Unknown"
+        assignments = asset.get("assignment_mappings", []) or asset.get("assignments", [])
+        entry = summary.setdefault(str(asset_type), {"total": 0, "assigned": 0, "unassigned": 0})
+        entry["total"] += 1
+        if assignments:
+            entry["assigned"] += 1
+        else:
+            entry["unassigned"] += 1
+    results: list[dict[str, object]] = []
+    for asset_type, counts in summary.items():
+        results.append(
+            {
+                "asset_type": asset_type.replace("_", " ").title(),
+                "total": counts["total"],
+                "assigned": counts["assigned"],
+                "unassigned": counts["unassigned"],
+            }
+        )
+    return sorted(results, key=lambda item: item["asset_type"].lower())
+
+
+def _extract_platforms(settings: Dict[str, object]) -> list[str]:
+    platforms: list[str] = []
+    if not isinstance(settings, dict):
+        return platforms
+    for key in ("platforms", "platform", "platformType"):
+        value = settings.get(key)
+        if isinstance(value, list):
+            platforms.extend(str(item) for item in value if item)
+        elif value:
+            platforms.append(str(value))
+    return platforms
+
+
+def summarize_platform_coverage(assets_payload: object) -> list[dict[str, object]]:
+    if not isinstance(assets_payload, list):
+        return []
+    platform_counts: Dict[str, int] = {}
+    for asset in assets_payload:
+        settings = asset.get("settings", {}) or {}
+        platforms = _extract_platforms(settings)
+        for platform in platforms or ["Unknown"]:
+            platform_counts[platform] = platform_counts.get(platform, 0) + 1
+    return sorted(
+        [{"platform": platform, "count": count} for platform, count in platform_counts.items()],
+        key=lambda item: item["platform"].lower(),
+    )
+
+
+def asset_setting_rows(asset: Dict[str, object]) -> list[dict[str, str]]:
+    """Setting rows of an asset payload, normalized once when the report schema was built.
+
+    Payloads without settings, such as the assignment summary scope, get the N/A row.
+    """
+    return getattr(asset, "setting_rows", None) or extract_setting_rows({})
+
+
+def extract_setting_names(settings: Dict[str, object]) -> list[str]:
+    names: list[str] = []
+    if not isinstance(settings, dict):
+        return ["N/A"]
+    raw_settings = settings.get("settings")
+    if isinstance(raw_settings, list):
+        for entry in raw_settings:
+            if not isinstance(entry, dict):
+                continue
+            setting_name = (
+                entry.get("omaUri")
+                or entry.get("displayName")
+                or entry.get("settingDefinitionId")
+                or "Unnamed Setting"
+            )
+            names.append(str(setting_name))
+    for key in settings.keys():
+        if key == "settings":
+            continue
+        names.append(str(key))
+    return names or ["N/A"]
+
+
+def assignment_target_label(mapping: Dict[str, object]) -> str | None:
+    target_type = str(mapping.get("targetType") or "").lower()
+    if "alldevicesassignmenttarget" in target_type or "alldevices" in target_type:
+        return "ALL DEVICES"
+    if "alllicensedusersassignmenttarget" in target_type or "allusers" in target_type:
+        return "ALL USERS"
+    return None
+
+
+def summarize_enrollment_profiles(
+    assets_payload: list[dict[str, object]],
+) -> list[dict[str, str]]:
+    summary: Dict[str, list[str]] = {}
+    for asset in assets_payload:
+        if asset.get("asset_type") != "enrollment_profiles":
+            continue
+        profile_name = asset.get("name") or "Unnamed Enrollment Profile"
+        for mapping in asset.get("assignment_mappings", []) or []:
+            group_name = mapping.get("groupDisplayName") or mapping.get("groupId")
+            if not group_name:
+                continue
+            summary.setdefault(str(group_name), []).append(str(profile_name))
+
+    results: list[dict[str, str]] = []
+    for group_name, profiles in summary.items():
+        unique_profiles = sorted(set(profiles), key=str.lower)
+        results.append(
+            {
+                "group": group_name,
+                "profiles": ", ".join(unique_profiles),
+            }
+        )
+    return sorted(results, key=lambda item: item["group"].lower())
@@ -0,0 +1,334 @@
+"""Format-neutral document layout for the Word and PDF writers."""
+
+from __future__ import annotations
+
+import json
+from functools import partial
+from typing import Dict, Iterable, Iterator, Optional
+
+from ..reports.schema import RenderedReport
+from .blocks import Block, Fragment, Heading, Link, PageBreak, Paragraph, Table, TableOfContents
+from .common import (
+    asset_setting_rows,
+    summarize_groups,
+    summarize_inventory,
+    summarize_platform_coverage,
+)
+
+
+def iter_document_blocks(
+    report: RenderedReport,
+    asset_shards: Optional[list[tuple[str, str, int]]] = None,
+) -> Iterator[Block]:
+    yield Heading(f"{report.metadata.organization} Intune Report", level=0)
+    yield Paragraph(f"Audience: {report.audience}")
+    yield Paragraph(f"Generated at: {report.metadata.generated_at}")
+    yield PageBreak()
+    yield Heading("Table of Contents", level=1)
+    yield TableOfContents()
+
+    assets_payload = next(
+        (section.payload.get("assets") for section in report.sections if "assets" in section.payload),
+        None,
+    )
+
+    for section in report.sections:
+        yield PageBreak()
+        yield Heading(section.title, level=1)
+        if section.description:
+            yield Paragraph(section.description)
+        for key, payload in section.payload.items():
+            if key == "summary":
+                yield from _summary_section_blocks(payload, assets_payload)
+            elif key == "assets" and asset_shards is not None:
+                yield from _asset_shard_blocks(asset_shards)
+            elif key == "assets":
+                yield from assets_section_blocks(payload)
+            elif key == "assignment_coverage":
+                yield from _assignment_coverage_section_blocks(payload)
+            elif key == "setting_conflicts":
+                yield from _setting_conflicts_section_blocks(payload)
+            elif key == "effective_policies":
+                yield from _effective_policies_section_blocks(payload)
+            else:
+                payload_text = json.dumps(payload, indent=2, ensure_ascii=False)
+                yield Paragraph(payload_text)
+
+
+def _asset_shard_blocks(asset_shards: list[tuple[str, str, int]]) -> Iterator[Block]:
+    if not asset_shards:
+        yield Paragraph("No asset data available.")
+        return
+    yield Paragraph("Asset detail pages are split into the following documents:")
+    for label, file_name, asset_count in asset_shards:
+        noun = "asset" if asset_count == 1 else "assets"
+        yield Link(f"{label} ({asset_count} {noun})", target=file_name, style="List Bullet")
+
+
+def _summary_section_blocks(payload: Dict[str, object], assets_payload: object) -> Iterator[Block]:
+    title = payload.get("title")
+    if title:
+        yield Heading(str(title), level=2)
+    highlights = payload.get("highlights", [])
+    if highlights:
+        yield Paragraph("Highlights", style="List Bullet")
+        for item in highlights:
+            yield Paragraph(str(item), style="List Bullet")
+
+    metrics = payload.get("metrics", {})
+    if metrics:
+        yield Paragraph("Key Metrics")
+        yield Table(
+            headers=["Metric", "Value"],
+            rows=[
+                [str(key), json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else str(value)]
+                for key, value in metrics.items()
+            ],
+            style="Light Grid",
+            header_fill="D9E1F2",
+        )
+
+    if assets_payload:
+        yield Paragraph("Configuration Inventory")
+        yield from _configuration_inventory_blocks(assets_payload)
+        yield Paragraph("Platform Coverage")
+        yield from _platform_coverage_blocks(assets_payload)
+        yield Paragraph("Top Assigned Groups")
+        yield from _top_assigned_groups_blocks(assets_payload)
+
+
+def _configuration_inventory_blocks(assets_payload: object) -> Iterator[Block]:
+    inventory = summarize_inventory(assets_payload)
+    if not inventory:
+        yield Paragraph("No assets available.")
+        return
+    yield Table(
+        headers=["Policy Type", "Total", "Assigned", "Unassigned"],
+        rows=[
+            [row["asset_type"], str(row["total"]), str(row["assigned"]), str(row["unassigned"])]
+            for row in inventory
+        ],
+        style="Light Grid Accent 1",
+        header_fill="1F4E79",
+        column_fills={2: "C6E0B4", 3: "FCE4D6"},
+    )
+
+
+def _platform_coverage_blocks(assets_payload: object) -> Iterator[Block]:
+    coverage = summarize_platform_coverage(assets_payload)
+    if not coverage:
+        yield Paragraph("No platform data available.")
+        return
+    yield Table(
+        headers=["Platform", "Configs"],
+        rows=[[row["platform"], str(row["count"])] for row in coverage],
+        style="Light Grid",
+        header_fill="D9E1F2",
+    )
+
+
+def _top_assigned_groups_blocks(assets_payload: object) -> Iterator[Block]:
+    group_summary = summarize_groups(assets_payload)
+    if not group_summary:
+        yield Paragraph("No group assignments available.")
+        return
+    top_groups = sorted(group_summary, key=lambda item: item["assigned_assets"], reverse=True)[:10]
+    yield Table(
+        headers=["Rank", "Group Name", "Assignments", "Settings Applied", "Type"],
+        rows=[
+            [str(idx), row["name"], str(row["assigned_assets"]), str(row["settings_applied"]), row["type"]]
+            for idx, row in enumerate(top_groups, start=1)
+        ],
+        style="Light Grid Accent 1",
+        header_fill="BDD7EE",
+        column_fills={2: "C6E0B4", 3: "FCE4D6"},
+    )
+
+
+ASSET_ASSIGNMENT_HEADERS = [
+    "Group",
+    "Type",
+    "Assignment",
+    "Filter",
+    "Intent",
+    "Delivery",
+    "Schedule",
+    "Dynamic Rule",
+]
+
+
+def assets_section_blocks(assets_payload: object) -> Iterator[Block]:
+    if not isinstance(assets_payload, list):
+        yield Paragraph("No asset data available.")
+        return
+    for asset in assets_payload:
+        yield Fragment(getattr(asset, "content_hash", ""), partial(_asset_blocks, asset))
+
+
+def _asset_blocks(asset: Dict[str, object]) -> Iterator[Block]:
+    asset_name = asset.get("name") or "Unnamed Asset"
+    asset_type = asset.get("asset_type") or "Unknown"
+    yield Heading(f"{asset_name} ({asset_type})", level=2)
+    yield Paragraph(f"Asset ID: {asset.get('asset_id')}")
+    scope_tags = asset.get("scope_tags") or []
+    if scope_tags:
+        yield Paragraph(f"Scope tags: {', '.join(str(tag) for tag in scope_tags)}")
+    asset_description = asset.get("description")
+    if asset_description:
+        yield Paragraph(str(asset_description))
+
+    settings = asset.get("settings", {}) or {}
+    yield Paragraph("Settings")
+    if settings:
+        setting_rows = asset_setting_rows(asset)
+        oma_count = getattr(asset, "oma_setting_count", 0)
+        if oma_count:
+            yield _settings_table(setting_rows[:oma_count])
+            if setting_rows[oma_count:]:
+                yield Paragraph("Additional Settings")
+                yield _key_value_table(setting_rows[oma_count:])
+        else:
+            yield _settings_table(setting_rows)
+    else:
+        yield Paragraph("No settings recorded.")
+
+    assignments = asset.get("assignment_mappings", []) or []
+    yield Paragraph("Assignments")
+    if assignments:
+        yield Table(
+            headers=ASSET_ASSIGNMENT_HEADERS,
+            rows=[_assignment_mapping_row(mapping) for mapping in assignments],
+            style="Light Grid",
+            header_fill="FFF2CC",
+        )
+    else:
+        yield Paragraph("No assignments recorded.")
+
+
+def _stringify_mapping_value(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else str(value or "")
+
+
+def _assignment_mapping_row(mapping: Dict[str, object]) -> list[str]:
+    return [
+        mapping.get("groupDisplayName") or mapping.get("groupId", ""),
+        mapping.get("groupType") or "",
+        mapping.get("assignmentType") or "",
+        _assignment_filter_label(mapping),
+        mapping.get("intent") or "",
+        _stringify_mapping_value(mapping.get("delivery")),
+        _stringify_mapping_value(mapping.get("schedule")),
+        mapping.get("groupDynamicRule") or "N/A",
+    ]
+
+
+def _assignment_filter_label(mapping: Dict[str, object]) -> str:
+    name = mapping.get("filterDisplayName") or mapping.get("filterId")
+    if not name:
+        return ""
+    return f"{mapping.get('filterType') or 'include'}: {name}"
+
+
+def _key_value_table(rows: Iterable[dict[str, str]]) -> Table:
+    return Table(
+        headers=["Setting", "Value"],
+        rows=[[row["setting"], row["value"]] for row in rows],
+        style="Light Grid",
+        header_fill="E2EFDA",
+    )
+
+
+def _settings_table(rows: Iterable[dict[str, str]]) -> Table:
+    return Table(
+        headers=["Setting", "Value", "Description"],
+        rows=[[row["setting"], row["value"], row["description"]] for row in rows],
+        style="Light Grid",
+        header_fill="E2EFDA",
+    )
+
+
+def _assignment_coverage_section_blocks(payload: Dict[str, object]) -> Iterator[Block]:
+    yield Table(
+        headers=["Metric", "Value"],
+        rows=[
+            [key.replace("_", " ").title(), str(payload.get(key, 0))]
+            for key in ("total_assets", "assigned_assets", "unassigned_assets")
+        ],
+        style="Light Grid",
+        header_fill="DDEBF7",
+    )
+
+    assignments_by_group = payload.get("assignments_by_group", {}) or {}
+    members_by_group = payload.get("members_by_group", {}) or {}
+    yield Paragraph("Assignments by Group")
+    if assignments_by_group and members_by_group:
+        yield Table(
+            headers=["Group", "Assigned Assets", "Users", "Devices"],
+            rows=[
+                [str(group), str(count), *_member_counts(members_by_group.get(group))]
+                for group, count in assignments_by_group.items()
+            ],
+            style="Light Grid Accent 2",
+            header_fill="F8CBAD",
+        )
+    elif assignments_by_group:
+        yield Table(
+            headers=["Group", "Assigned Assets"],
+            rows=[[str(group), str(count)] for group, count in assignments_by_group.items()],
+            style="Light Grid Accent 2",
+            header_fill="F8CBAD",
+        )
+    else:
+        yield Paragraph("No group assignment coverage available.")
+
+
+def _member_counts(counts: object) -> list[str]:
+    if not isinstance(counts, dict):
+        return ["", ""]
+    return [str(counts.get("users", "")), str(counts.get("devices", ""))]
+
+
+def _setting_conflicts_section_blocks(payload: Dict[str, object]) -> Iterator[Block]:
+    overlaps = payload.get("overlaps", []) or []
+    if not overlaps:
+        yield Paragraph("No setting is configured by more than one policy for the same groups.")
+        return
+    yield Paragraph(
+        f"{payload.get('conflicting_settings', 0)} settings have conflicting values and "
+        f"{payload.get('overlapping_settings', 0)} are configured by more than one policy."
+    )
+    yield Table(
+        headers=["Setting", "Policy Type", "Groups", "Policies", "Conflict"],
+        rows=[
+            [
+                str(overlap.get("setting")),
+                str(overlap.get("setting_scope")),
+                ", ".join(str(group) for group in overlap.get("groups", [])),
+                "; ".join(f"{policy.get('name')}: {policy.get('value')}" for policy in overlap.get("policies", [])),
+                "Yes" if overlap.get("conflicting") else "No",
+            ]
+            for overlap in overlaps
+        ],
+        style="Light Grid Accent 2",
+        header_fill="F8CBAD",
+    )
+
+
+def _effective_policies_section_blocks(payload: Dict[str, object]) -> Iterator[Block]:
+    groups = payload.get("groups", []) or []
+    if not groups:
+        yield Paragraph("No policy is assigned to a group.")
+        return
+    yield Paragraph(
+        f"{payload.get('group_count', 0)} groups receive settings from {payload.get('policy_count', 0)} policies "
+        f"({payload.get('entry_count', 0)} group, policy and setting combinations)."
+    )
+    yield Table(
+        headers=["Group", "Policies", "Settings"],
+        rows=[
+            [str(group.get("group")), ", ".join(str(policy) for policy in group.get("policies", [])), str(group.get("settings", 0))]
+            for group in groups
+        ],
+        style="Light Grid Accent 2",
+        header_fill="F8CBAD",
+    )
@@ -0,0 +1,312 @@
+"""Streaming WordprocessingML writer.
+
+Builds a ``.docx`` package without an in-memory object model: the parts of
+python-docx's default template are copied as-is, and ``word/document.xml`` is
+written block by block straight into the zip archive. Table header colours
+are expressed as table styles derived from the built-in grid styles rather
+than as shading on every header cell, so each row costs one string append.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import os
+import re
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from .blocks import Block, Fragment, Heading, Link, PageBreak, Paragraph, Table, TableOfContents
+from .render_cache import RenderCache
+
+
+TOC_FIELD_INSTRUCTION = 'TOC \\o "1-3" \\h \\z \\u'
+HYPERLINK_COLOR = "0563C1"
+HYPERLINK_RELATIONSHIP = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink"
+
+DOCUMENT_PART = "word/document.xml"
+STYLES_PART = "word/styles.xml"
+RELATIONSHIPS_PART = "word/_rels/document.xml.rels"
+FLUSH_THRESHOLD = 64 * 1024
+
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+_RUN_BREAKS = re.compile(r"(\r\n|\r|\n|\t)")
+_STYLE_ID_CHARS = re.compile(r"[^A-Za-z0-9]")
+
+_DOCUMENT_START = (
+    "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    "<w:body>"
+)
+_DOCUMENT_END = "</w:body></w:document>"
+
+
+def _template_path() -> Path:
+    # Locate the template without importing python-docx itself.
+    spec = importlib.util.find_spec("docx")
+    if spec is None or not spec.submodule_search_locations:
+        raise RuntimeError("python-docx is required for its default document template")
+    return Path(list(spec.submodule_search_locations)[0]) / "templates" / "default.docx"
+
+
+def _style_id(name: str) -> str:
+    return _STYLE_ID_CHARS.sub("", name)
+
+
+def _builtin_table_style_id(name: str) -> str:
+    # "Light Grid Accent 1" is stored as "LightGrid-Accent1" in the template.
+    base, _, accent = name.partition(" Accent ")
+    style_id = _style_id(base)
+    return f"{style_id}-Accent{accent}" if accent else style_id
+
+
+def _clean(text: str) -> str:
+    return _INVALID_XML_CHARS.sub("", text)
+
+
+def _run_xml(text: str) -> str:
+    if not text:
+        return ""
+    parts: List[str] = []
+    for piece in _RUN_BREAKS.split(_clean(text)):
+        if not piece:
+            continue
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in ("\n", "\r", "\r\n"):
+            parts.append("<w:br/>")
+        else:
+            parts.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+    return f"<w:r>{''.join(parts)}</w:r>"
+
+
+def _paragraph_properties(style_id: Optional[str]) -> str:
+    return f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>' if style_id else ""
+
+
+def _paragraph_xml(text: str, style_id: Optional[str] = None) -> str:
+    return f"<w:p>{_paragraph_properties(style_id)}{_run_xml(text)}</w:p>"
+
+
+class DocxStreamWriter:
+    """Writes document blocks into a ``.docx`` archive as they arrive.
+
+    The archive is written to ``<name>.tmp`` and renamed to ``output_path``
+    once it is complete; a writer left by an exception removes it instead.
+    """
+
+    def __init__(self, output_path: Path, cache: Optional[RenderCache] = None) -> None:
+        self._cache = cache
+        self._template = zipfile.ZipFile(_template_path())
+        template_document = self._template.read(DOCUMENT_PART).decode("utf-8")
+        section = re.search(r"<w:sectPr\b.*?</w:sectPr>", template_document, re.DOTALL)
+        self._section_xml = section.group(0) if section else ""
+        self._column_space = self._text_width(self._section_xml)
+        self._table_styles: Dict[Tuple[str, str], str] = {}
+        self._fragment_styles: Optional[List[Tuple[str, str]]] = None
+        self._hyperlinks: Dict[str, str] = {}
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+        self._output_path = Path(output_path)
+        self._temp_path = self._output_path.with_name(f"{self._output_path.name}.tmp")
+        self._archive = zipfile.ZipFile(self._temp_path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._document = self._archive.open(DOCUMENT_PART, "w", force_zip64=True)
+        self._emit(_DOCUMENT_START)
+
+    def __enter__(self) -> "DocxStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is not None:
+            self.abandon()
+            return
+        try:
+            self.close()
+        except BaseException:
+            self.abandon()
+            raise
+
+    @staticmethod
+    def _text_width(section_xml: str) -> int:
+        width = re.search(r'<w:pgSz[^>]*w:w="(\d+)"', section_xml)
+        left = re.search(r'<w:pgMar[^>]*w:left="(\d+)"', section_xml)
+        right = re.search(r'<w:pgMar[^>]*w:right="(\d+)"', section_xml)
+        if not (width and left and right):
+            return 8640
+        return int(width.group(1)) - int(left.group(1)) - int(right.group(1))
+
+    def _emit(self, xml: str) -> None:
+        self._buffer.append(xml)
+        self._buffered += len(xml)
+        if self._buffered >= FLUSH_THRESHOLD:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._document.write("".join(self._buffer).encode("utf-8"))
+            self._buffer = []
+            self._buffered = 0
+
+    def write(self, block: Block) -> None:
+        if isinstance(block, Fragment) and self._cache is not None:
+            self._write_fragment(block)
+            return
+        for xml in self._block_xml(block):
+            self._emit(xml)
+
+    def write_all(self, blocks: Iterable[Block]) -> None:
+        for block in blocks:
+            self.write(block)
+
+    def _block_xml(self, block: Block) -> Iterator[str]:
+        if isinstance(block, Heading):
+            style = "Title" if block.level == 0 else f"Heading{block.level}"
+            yield _paragraph_xml(block.text, style)
+        elif isinstance(block, Paragraph):
+            yield _paragraph_xml(block.text, _style_id(block.style) if block.style else None)
+        elif isinstance(block, Link):
+            yield self._link_xml(block)
+        elif isinstance(block, PageBreak):
+            yield '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+        elif isinstance(block, TableOfContents):
+            yield f"<w:p><w:fldSimple w:instr={quoteattr(TOC_FIELD_INSTRUCTION)}/></w:p>"
+        elif isinstance(block, Table):
+            yield from self._table_xml(block)
+        elif isinstance(block, Fragment):
+            for fragment_block in block.render():
+                yield from self._block_xml(fragment_block)
+
+    def _write_fragment(self, fragment: Fragment) -> None:
+        def render() -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+            self._fragment_styles = []
+            try:
+                xml = "".join(self._block_xml(fragment))
+                return xml, tuple(self._fragment_styles)
+            finally:
+                self._fragment_styles = None
+
+        # Cached markup is spliced in verbatim, so fragments must not hold
+        # links: their relationship ids are only valid in one document.
+        xml, table_styles = self._cache.fetch(fragment.key, render)
+        for base_style, header_fill in table_styles:
+            self._table_style(base_style, header_fill)
+        self._emit(xml)
+
+    def _link_xml(self, link: Link) -> str:
+        if link.target not in self._hyperlinks:
+            self._hyperlinks[link.target] = f"rIdLink{len(self._hyperlinks) + 1}"
+        run = _run_xml(link.text).replace(
+            "<w:r>",
+            f'<w:r><w:rPr><w:color w:val="{HYPERLINK_COLOR}"/><w:u w:val="single"/></w:rPr>',
+            1,
+        )
+        return (
+            f"<w:p>{_paragraph_properties(_style_id(link.style) if link.style else None)}"
+            f'<w:hyperlink r:id="{self._hyperlinks[link.target]}">{run}</w:hyperlink></w:p>'
+        )
+
+    def _table_style(self, base_style: str, header_fill: str) -> str:
+        key = (base_style, header_fill.upper())
+        if self._fragment_styles is not None and key not in self._fragment_styles:
+            self._fragment_styles.append(key)
+        if key not in self._table_styles:
+            self._table_styles[key] = f"{_style_id(base_style)}Header{key[1]}"
+        return self._table_styles[key]
+
+    def _table_xml(self, table: Table) -> Iterator[str]:
+        columns = len(table.headers)
+        column_width = self._column_space // max(columns, 1)
+        cell_start = f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{column_width}"/></w:tcPr>'
+        shaded_cells = {
+            idx: (
+                f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{column_width}"/>'
+                f'<w:shd w:val="clear" w:color="auto" w:fill="{color}"/></w:tcPr>'
+            )
+            for idx, color in table.column_fills.items()
+        }
+
+        yield (
+            "<w:tbl><w:tblPr>"
+            f'<w:tblStyle w:val="{self._table_style(table.style, table.header_fill)}"/>'
+            '<w:tblW w:type="auto" w:w="0"/>'
+            '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+            'w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+            "</w:tblPr><w:tblGrid>"
+            + f'<w:gridCol w:w="{column_width}"/>' * columns
+            + "</w:tblGrid>"
+        )
+        yield (
+            '<w:tr><w:trPr><w:tblHeader/></w:trPr>'
+            + "".join(f"{cell_start}{_paragraph_xml(str(header))}</w:tc>" for header in table.headers)
+            + "</w:tr>"
+        )
+        for row in table.rows:
+            cells = []
+            for idx in range(columns):
+                value = row[idx] if idx < len(row) else ""
+                cells.append(f"{shaded_cells.get(idx, cell_start)}{_paragraph_xml(str(value))}</w:tc>")
+            yield f"<w:tr>{''.join(cells)}</w:tr>"
+        yield "</w:tbl>"
+
+    def _styles_xml(self) -> bytes:
+        styles = self._template.read(STYLES_PART).decode("utf-8")
+        definitions = "".join(
+            f'<w:style w:type="table" w:customStyle="1" w:styleId="{style_id}">'
+            f'<w:name w:val="{escape(base_style)} Header {fill}"/>'
+            f'<w:basedOn w:val="{_builtin_table_style_id(base_style)}"/>'
+            '<w:uiPriority w:val="99"/><w:tblPr/>'
+            '<w:tblStylePr w:type="firstRow">'
+            f'<w:tcPr><w:shd w:val="clear" w:color="auto" w:fill="{fill}"/></w:tcPr>'
+            "</w:tblStylePr></w:style>"
+            for (base_style, fill), style_id in self._table_styles.items()
+        )
+        return styles.replace("</w:styles>", f"{definitions}</w:styles>").encode("utf-8")
+
+    def _relationships_xml(self) -> bytes:
+        relationships = self._template.read(RELATIONSHIPS_PART).decode("utf-8")
+        definitions = "".join(
+            f'<Relationship Id="{relationship_id}" Type="{HYPERLINK_RELATIONSHIP}" '
+            f'Target={quoteattr(target)} TargetMode="External"/>'
+            for target, relationship_id in self._hyperlinks.items()
+        )
+        return relationships.replace("</Relationships>", f"{definitions}</Relationships>").encode("utf-8")
+
+    def close(self) -> None:
+        if self._archive is None:
+            return
+        self._emit(f"{self._section_xml}{_DOCUMENT_END}")
+        self._flush()
+        self._document.close()
+
+        self._archive.writestr(STYLES_PART, self._styles_xml())
+        self._archive.writestr(RELATIONSHIPS_PART, self._relationships_xml())
+        for item in self._template.infolist():
+            if item.filename not in (DOCUMENT_PART, STYLES_PART, RELATIONSHIPS_PART):
+                self._archive.writestr(item, self._template.read(item.filename))
+        self._archive.close()
+        self._template.close()
+        self._archive = None
+        os.replace(self._temp_path, self._output_path)
+
+    def abandon(self) -> None:
+        """Discard the unfinished archive without writing the remaining parts."""
+        if self._archive is None:
+            return
+        # The file is thrown away, so a failure to close it must not hide
+        # the error that stopped the render.
+        with contextlib.suppress(Exception):
+            self._document.close()
+        with contextlib.suppress(Exception):
+            self._archive.close()
+        self._template.close()
+        self._archive = None
+        self._temp_path.unlink(missing_ok=True)
+
+
+def write_docx(blocks: Iterable[Block], output_path: Path, cache: Optional[RenderCache] = None) -> None:
+    with DocxStreamWriter(output_path, cache) as writer:
+        writer.write_all(blocks)
@@ -0,0 +1,396 @@
+"""Excel report writer."""
+
+from __future__ import annotations
+
+import tempfile
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.hyperlink import Hyperlink
+
+from ..config import EXCEL_SHARD_MODES
+from ..external_sort import DEFAULT_RUN_SIZE, dump_rows, external_sort, load_rows
+from ..reports.schema import RenderedReport
+from .common import (
+    WriterOptions,
+    asset_setting_rows,
+    assignment_target_label,
+    extract_assets_payload,
+    map_in_workers,
+    shard_file_slug,
+    summarize_groups,
+    summarize_inventory,
+    summarize_platform_coverage,
+)
+from .render_cache import RenderCache, open_render_cache
+
+
+EXCEL_HEADER_STYLE = "Intune Table Header"
+EXCEL_BODY_STYLE = "Intune Table Body"
+EXCEL_SECTION_TITLE_STYLE = "Intune Section Title"
+EXCEL_MAX_COLUMN_WIDTH = 50
+EXCEL_MAX_ROWS = 1_048_576
+ASSIGNMENTS_HEADERS = [
+    "Setting",
+    "Setting Value",
+    "Description",
+    "Policy",
+    "Policy Description",
+    "Policy Type",
+    "Group",
+    "Assignment Scope",
+]
+
+
+def write_report(report: RenderedReport, output_path: Path, writer_options: WriterOptions) -> None:
+    _write_excel_report(
+        report,
+        output_path,
+        shard_by=writer_options.excel_shard_by,
+        max_workers=writer_options.max_workers,
+        cache=open_render_cache(writer_options.render_cache_directory, "excel", report.audience, report.scope),
+        run_size=writer_options.sort_run_size,
+    )
+
+
+def _excel_named_styles() -> list[NamedStyle]:
+    thin = Side(style="thin")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    return [
+        NamedStyle(
+            name=EXCEL_HEADER_STYLE,
+            font=Font(bold=True, color="FFFFFF"),
+            fill=PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid"),
+            alignment=Alignment(horizontal="center", vertical="center"),
+            border=border,
+        ),
+        NamedStyle(
+            name=EXCEL_BODY_STYLE,
+            alignment=Alignment(horizontal="left"),
+            border=border,
+        ),
+        NamedStyle(name=EXCEL_SECTION_TITLE_STYLE, font=Font(bold=True, size=14)),
+    ]
+
+
+class _ColumnWidths:
+    """Tracks the widest value per column while rows are produced."""
+
+    def __init__(self) -> None:
+        self._widths: Dict[int, int] = {}
+
+    def observe(self, row: Iterable[object]) -> None:
+        for col_idx, value in enumerate(row, start=1):
+            if value is None:
+                continue
+            length = len(str(value))
+            if length > self._widths.get(col_idx, 0):
+                self._widths[col_idx] = length
+
+    def apply(self, sheet) -> None:
+        for col_idx, max_length in self._widths.items():
+            width = min(max_length + 2, EXCEL_MAX_COLUMN_WIDTH)
+            sheet.column_dimensions[get_column_letter(col_idx)].width = width
+
+
+def _styled_row(sheet, values: Iterable[object], style: str) -> list[WriteOnlyCell]:
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.style = style
+        cells.append(cell)
+    return cells
+
+
+@dataclass(frozen=True)
+class _AssignmentShard:
+    label: str
+    location: str
+    rows: int
+    first_group: str = ""
+    last_group: str = ""
+    is_file: bool = False
+
+
+def _write_excel_report(
+    report: RenderedReport,
+    output_path: Path,
+    shard_by: str = "sheet",
+    max_workers: Optional[int] = None,
+    cache: Optional[RenderCache] = None,
+    run_size: int = DEFAULT_RUN_SIZE,
+) -> None:
+    if shard_by not in EXCEL_SHARD_MODES:
+        raise ValueError(f"Unknown Excel shard mode: {shard_by}")
+    workbook = _new_excel_workbook()
+    assets_payload = extract_assets_payload(report)
+    _write_excel_summary_sheet(workbook, assets_payload)
+
+    if shard_by == "sheet":
+        sorted_rows, widths, row_count = _sort_assignment_rows(_iter_assignment_rows(assets_payload, cache), run_size)
+        index_sheet = workbook.create_sheet("Index") if row_count > EXCEL_MAX_ROWS - 1 else None
+        shards = _write_assignment_sheets(workbook, sorted_rows, widths, row_count)
+    else:
+        index_sheet = workbook.create_sheet("Index")
+        shards = _write_assignment_workbooks(assets_payload, output_path, shard_by, max_workers, cache, run_size)
+
+    if index_sheet is not None:
+        _write_excel_index_sheet(index_sheet, shards)
+    workbook.save(output_path)
+
+
+def _new_excel_workbook() -> Workbook:
+    workbook = Workbook(write_only=True)
+    for style in _excel_named_styles():
+        workbook.add_named_style(style)
+    return workbook
+
+
+def _write_excel_summary_sheet(workbook: Workbook, assets_payload: list[dict[str, object]]) -> None:
+    inventory_rows = [
+        [row["asset_type"], row["total"], row["assigned"], row["unassigned"]]
+        for row in summarize_inventory(assets_payload)
+    ]
+    platform_rows = [
+        [row["platform"], row["count"]]
+        for row in summarize_platform_coverage(assets_payload)
+    ]
+    top_groups = sorted(summarize_groups(assets_payload), key=lambda item: item["assigned_assets"], reverse=True)[:10]
+    top_group_rows = [
+        [idx, row["name"], row["assigned_assets"], row["settings_applied"], row["type"]]
+        for idx, row in enumerate(top_groups, start=1)
+    ]
+    tables = [
+        ("Configuration Inventory", ["Policy Type", "Total", "Assigned", "Unassigned"], inventory_rows),
+        ("Platform Coverage", ["Platform", "Configs"], platform_rows),
+        ("Top Assigned Groups", ["Rank", "Group Name", "Assignments", "Settings Applied", "Type"], top_group_rows),
+    ]
+
+    # Write-only sheets emit column widths ahead of the first row, so the
+    # (small) summary tables are laid out before anything is appended.
+    layout: list[tuple[list[object], str | None]] = []
+    for idx, (title, headers, rows) in enumerate(tables):
+        if idx:
+            layout.extend([([], None), ([], None)])
+        layout.append(([title], EXCEL_SECTION_TITLE_STYLE))
+        layout.append((headers, EXCEL_HEADER_STYLE))
+        layout.extend((row, EXCEL_BODY_STYLE) for row in rows)
+
+    summary_sheet = workbook.create_sheet("Summary")
+    widths = _ColumnWidths()
+    for values, _ in layout:
+        widths.observe(values)
+    widths.apply(summary_sheet)
+    for values, style in layout:
+        summary_sheet.append(_styled_row(summary_sheet, values, style) if style else values)
+
+
+def _assignment_sort_key(row: list[object]) -> tuple[str, str, str]:
+    return (
+        str(row[6]).casefold(),
+        str(row[0]).casefold(),
+        str(row[3]).casefold(),
+    )
+
+
+def _iter_assignment_rows(
+    assets_payload: list[dict[str, object]],
+    cache: Optional[RenderCache] = None,
+) -> Iterable[list[object]]:
+    for asset in assets_payload:
+        if cache is None:
+            yield from _asset_assignment_rows(asset)
+        else:
+            yield from cache.fetch(getattr(asset, "content_hash", ""), partial(_asset_assignment_rows, asset))
+
+
+def _asset_assignment_rows(asset: Dict[str, object]) -> list[list[object]]:
+    policy_name = asset.get("name") or "Unnamed Policy"
+    policy_description = asset.get("description") or ""
+    policy_type = asset.get("asset_type") or "Unknown"
+    assignments = asset.get("assignment_mappings", []) or []
+    group_names = {
+        mapping.get("groupDisplayName") or mapping.get("groupId")
+        for mapping in assignments
+        if mapping.get("groupDisplayName") or mapping.get("groupId")
+    }
+    group_names.discard(None)
+    group_count = len(group_names)
+    target_labels = {
+        label for mapping in assignments if (label := assignment_target_label(mapping))
+    }
+    if assignments:
+        scope_parts = []
+        if group_count:
+            scope_parts.append("Groups")
+        scope_parts.extend(sorted(target_labels))
+        assignment_scope = ", ".join(scope_parts) if scope_parts else "Unassigned"
+    else:
+        assignment_scope = "Unassigned"
+
+    group_labels = sorted(group_names, key=str.casefold) if group_names else []
+    if not group_labels:
+        group_labels = sorted(target_labels, key=str.casefold) if target_labels else ["Unassigned"]
+    return [
+        [
+            setting_row["setting"],
+            setting_row["value"],
+            setting_row["description"],
+            policy_name,
+            policy_description,
+            policy_type,
+            group_label,
+            assignment_scope,
+        ]
+        for setting_row in asset_setting_rows(asset)
+        for group_label in group_labels
+    ]
+
+
+def _sort_assignment_rows(
+    rows: Iterable[list[object]],
+    run_size: int = DEFAULT_RUN_SIZE,
+) -> tuple[Iterator[list[object]], _ColumnWidths, int]:
+    widths = _ColumnWidths()
+    widths.observe(ASSIGNMENTS_HEADERS)
+    row_count = 0
+
+    def observe(row: list[object]) -> None:
+        nonlocal row_count
+        row_count += 1
+        widths.observe(row)
+
+    sorted_rows = external_sort(rows, key=_assignment_sort_key, on_row=observe, run_size=run_size)
+    return sorted_rows, widths, row_count
+
+
+def _write_assignment_sheets(
+    workbook: Workbook,
+    sorted_rows: Iterator[list[object]],
+    widths: _ColumnWidths,
+    row_count: int,
+) -> list[_AssignmentShard]:
+    """Write sorted assignment rows, starting a new sheet whenever one fills up."""
+    rows_per_sheet = EXCEL_MAX_ROWS - 1
+    shard_count = max(1, -(-row_count // rows_per_sheet))
+    shards: list[_AssignmentShard] = []
+    for shard_idx in range(shard_count):
+        title = "Assignments" if shard_idx == 0 else f"Assignments {shard_idx + 1}"
+        sheet = workbook.create_sheet(title)
+        widths.apply(sheet)
+        sheet.append(_styled_row(sheet, ASSIGNMENTS_HEADERS, EXCEL_HEADER_STYLE))
+        written = 0
+        first_group = last_group = ""
+        for row in islice(sorted_rows, rows_per_sheet):
+            if not written:
+                first_group = str(row[6])
+            last_group = str(row[6])
+            sheet.append(_styled_row(sheet, row, EXCEL_BODY_STYLE))
+            written += 1
+        shards.append(_AssignmentShard(title, title, written, first_group, last_group))
+    return shards
+
+
+def _partition_assignment_rows(
+    assets_payload: list[dict[str, object]],
+    shard_by: str,
+    spill_directory: Path,
+    cache: Optional[RenderCache] = None,
+    run_size: int = DEFAULT_RUN_SIZE,
+) -> Dict[str, Path]:
+    """Spread assignment rows over one spill file per shard key."""
+    key_index = 5 if shard_by == "policy_type" else 6
+    spill_paths: Dict[str, Path] = {}
+    buffers: Dict[str, list[list[object]]] = {}
+    buffered = 0
+
+    def flush() -> None:
+        for key, rows in buffers.items():
+            with spill_paths[key].open("ab") as spill_file:
+                dump_rows(rows, spill_file)
+        buffers.clear()
+
+    for row in _iter_assignment_rows(assets_payload, cache):
+        key = str(row[key_index])
+        if key not in spill_paths:
+            spill_paths[key] = spill_directory / f"shard-{len(spill_paths)}.bin"
+        buffers.setdefault(key, []).append(row)
+        buffered += 1
+        if buffered >= run_size:
+            flush()
+            buffered = 0
+    flush()
+    return spill_paths
+
+
+def _write_assignment_shard_workbook(job: tuple[str, str, int]) -> list[_AssignmentShard]:
+    spill_path, output_path, run_size = job
+    workbook = _new_excel_workbook()
+    sorted_rows, widths, row_count = _sort_assignment_rows(load_rows(open(spill_path, "rb")), run_size)
+    shards = _write_assignment_sheets(workbook, sorted_rows, widths, row_count)
+    workbook.save(output_path)
+    return shards
+
+
+def _write_assignment_workbooks(
+    assets_payload: list[dict[str, object]],
+    output_path: Path,
+    shard_by: str,
+    max_workers: Optional[int] = None,
+    cache: Optional[RenderCache] = None,
+    run_size: int = DEFAULT_RUN_SIZE,
+) -> list[_AssignmentShard]:
+    """Write one Assignments workbook per policy type or group, in parallel."""
+    with tempfile.TemporaryDirectory() as spill_directory:
+        spill_paths = _partition_assignment_rows(assets_payload, shard_by, Path(spill_directory), cache, run_size)
+        used_slugs: set[str] = set()
+        jobs = [
+            (
+                key,
+                str(spill_path),
+                output_path.with_name(f"{output_path.stem}-{shard_file_slug(key, used_slugs)}{output_path.suffix}"),
+            )
+            for key, spill_path in sorted(spill_paths.items(), key=lambda item: item[0].casefold())
+        ]
+        results = map_in_workers(
+            _write_assignment_shard_workbook,
+            [(spill_path, str(shard_path), run_size) for _, spill_path, shard_path in jobs],
+            max_workers,
+        )
+
+    return [
+        _AssignmentShard(
+            label=key,
+            location=shard_path.name,
+            rows=sum(sheet.rows for sheet in sheets),
+            first_group=sheets[0].first_group,
+            last_group=sheets[-1].last_group,
+            is_file=True,
+        )
+        for (key, _, shard_path), sheets in zip(jobs, results)
+    ]
+
+
+def _write_excel_index_sheet(index_sheet, shards: list[_AssignmentShard]) -> None:
+    headers = ["Shard", "Location", "Rows", "First Group", "Last Group"]
+    rows = [[shard.label, shard.location, shard.rows, shard.first_group, shard.last_group] for shard in shards]
+    widths = _ColumnWidths()
+    widths.observe(headers)
+    for row in rows:
+        widths.observe(row)
+    widths.apply(index_sheet)
+    index_sheet.append(_styled_row(index_sheet, headers, EXCEL_HEADER_STYLE))
+    for shard, row in zip(shards, rows):
+        cells = _styled_row(index_sheet, row, EXCEL_BODY_STYLE)
+        if shard.is_file:
+            cells[1].hyperlink = shard.location
+        else:
+            cells[1].hyperlink = Hyperlink(ref="", location=f"'{shard.location}'!A1")
+        index_sheet.append(cells)
@@ -0,0 +1,503 @@
+"""Streaming PDF writer.
+
+Pages are laid out from document blocks and written to the output file as
+soon as they fill up, using the standard Helvetica fonts so no font data has
+to be embedded. Object offsets and outline entries are spilled to temporary
+files rather than kept in memory, so the memory needed to write a report is
+bounded by a single page regardless of how many assets it contains. Headings
+become bookmarks in the document outline.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Iterable, List, Optional, Sequence, Tuple
+
+from ..reports.schema import RenderedReport
+from .blocks import Block, Fragment, Heading, Link, PageBreak, Paragraph, Table, TableOfContents
+from .common import WriterOptions
+from .document import iter_document_blocks
+
+
+PAGE_WIDTH = 612.0
+PAGE_HEIGHT = 792.0
+MARGIN = 54.0
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+FOOTER_Y = 30.0
+
+HEADING_SIZES = {0: 20.0, 1: 16.0, 2: 13.0}
+BODY_SIZE = 10.0
+TABLE_SIZE = 8.0
+LINE_SPACING = 1.25
+CELL_PADDING = 3.0
+BULLET = "• "
+ELLIPSIS = "…"
+TEXT_COLOR = "000000"
+LINK_COLOR = "0563C1"
+
+# Reserved object numbers; everything else is allocated in write order.
+CATALOG_ID = 1
+PAGES_ID = 2
+REGULAR_FONT_ID = 3
+BOLD_FONT_ID = 4
+FIRST_DYNAMIC_ID = 5
+
+# Advance widths (1/1000 em) of printable ASCII, from the standard Helvetica AFM files.
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+_DEFAULT_WIDTH = 556
+
+
+def _text_width(text: str, size: float, bold: bool = False) -> float:
+    widths = _HELVETICA_BOLD_WIDTHS if bold else _HELVETICA_WIDTHS
+    total = 0
+    for char in text:
+        code = ord(char) - 32
+        total += widths[code] if 0 <= code < len(widths) else _DEFAULT_WIDTH
+    return total * size / 1000.0
+
+
+def _wrap(text: str, width: float, size: float, bold: bool = False) -> List[str]:
+    lines: List[str] = []
+    for raw_line in text.replace("\t", "    ").splitlines() or [""]:
+        current = ""
+        for word in raw_line.split(" "):
+            candidate = f"{current} {word}" if current else word
+            if _text_width(candidate, size, bold) <= width:
+                current = candidate
+                continue
+            if current:
+                lines.append(current)
+            # Hard-break words that are wider than the available space.
+            current = ""
+            for char in word:
+                if current and _text_width(current + char, size, bold) > width:
+                    lines.append(current)
+                    current = ""
+                current += char
+        lines.append(current)
+    return lines
+
+
+def _clip_lines(lines: List[str], max_lines: int, width: float, size: float, bold: bool = False) -> List[str]:
+    """The first ``max_lines`` of ``lines``, ending in an ellipsis if any were dropped."""
+    if len(lines) <= max_lines:
+        return lines
+    last = lines[max_lines - 1]
+    while last and _text_width(f"{last}{ELLIPSIS}", size, bold) > width:
+        last = last[:-1]
+    return lines[: max_lines - 1] + [f"{last}{ELLIPSIS}"]
+
+
+def _pdf_string(text: str) -> bytes:
+    encoded = text.encode("cp1252", errors="replace")
+    return b"(" + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _hex_to_rgb(color: str) -> str:
+    color = color.lstrip("#")
+    red, green, blue = (int(color[idx:idx + 2], 16) / 255.0 for idx in (0, 2, 4))
+    return f"{red:.3f} {green:.3f} {blue:.3f}"
+
+
+class PdfStreamWriter:
+    """Lays out document blocks and writes each page as soon as it is full.
+
+    Pages go to ``<name>.tmp``, which is renamed to ``output_path`` once the
+    trailer is written; a writer left by an exception removes it instead.
+    """
+
+    def __init__(self, output_path: Path, title: str = "") -> None:
+        self._output_path = Path(output_path)
+        self._temp_path = self._output_path.with_name(f"{self._output_path.name}.tmp")
+        self._file: BinaryIO = open(self._temp_path, "wb")
+        self._offsets = tempfile.TemporaryFile()
+        self._outline = tempfile.TemporaryFile()
+        self._reserved_offsets = {}
+        self._next_id = FIRST_DYNAMIC_ID
+        self._title = title
+        self._page_count = 0
+        self._outline_count = 0
+        self._content: List[str] = []
+        self._annotations: List[str] = []
+        self._cursor = PAGE_HEIGHT - MARGIN
+        self._page_has_content = False
+        self._closed = False
+
+        self._file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._write_reserved(REGULAR_FONT_ID, self._font_object("Helvetica"))
+        self._write_reserved(BOLD_FONT_ID, self._font_object("Helvetica-Bold"))
+
+    def __enter__(self) -> "PdfStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is not None:
+            self.abandon()
+            return
+        try:
+            self.close()
+        except BaseException:
+            self.abandon()
+            raise
+
+    # -- object bookkeeping -------------------------------------------------
+
+    @staticmethod
+    def _font_object(base_font: str) -> bytes:
+        return (
+            f"<< /Type /Font /Subtype /Type1 /BaseFont /{base_font} "
+            "/Encoding /WinAnsiEncoding >>"
+        ).encode("ascii")
+
+    def _write_reserved(self, object_id: int, body: bytes) -> None:
+        self._reserved_offsets[object_id] = self._file.tell()
+        self._write_object_body(object_id, body)
+
+    def _write_object(self, body: bytes) -> int:
+        object_id = self._next_id
+        self._next_id += 1
+        self._offsets.write(f"{self._file.tell():010d} 00000 n \n".encode("ascii"))
+        self._write_object_body(object_id, body)
+        return object_id
+
+    def _write_object_body(self, object_id: int, body: bytes) -> None:
+        self._file.write(f"{object_id} 0 obj\n".encode("ascii"))
+        self._file.write(body)
+        self._file.write(b"\nendobj\n")
+
+    def _current_page_id(self) -> int:
+        # Each page is written as a content stream followed by its page object.
+        return self._next_id + 1
+
+    # -- page layout --------------------------------------------------------
+
+    def _available(self) -> float:
+        return self._cursor - MARGIN - FOOTER_Y
+
+    def _ensure_space(self, height: float) -> None:
+        if height > self._available() and self._page_has_content:
+            self._finish_page()
+
+    def _finish_page(self) -> None:
+        self._page_count += 1
+        footer = f"Page {self._page_count}"
+        self._draw_text(footer, PAGE_WIDTH - MARGIN - _text_width(footer, TABLE_SIZE), FOOTER_Y, TABLE_SIZE)
+        stream = "\n".join(self._content).encode("latin-1")
+        self._write_object(
+            f"<< /Length {len(stream)} >>\nstream\n".encode("ascii") + stream + b"\nendstream"
+        )
+        content_id = self._next_id - 1
+        annotations = f" /Annots [{' '.join(self._annotations)}]" if self._annotations else ""
+        self._write_object(
+            (
+                f"<< /Type /Page /Parent {PAGES_ID} 0 R /MediaBox [0 0 {PAGE_WIDTH:g} {PAGE_HEIGHT:g}] "
+                f"/Resources << /Font << /F1 {REGULAR_FONT_ID} 0 R /F2 {BOLD_FONT_ID} 0 R >> >> "
+                f"/Contents {content_id} 0 R{annotations} >>"
+            ).encode("latin-1")
+        )
+        self._content = []
+        self._annotations = []
+        self._cursor = PAGE_HEIGHT - MARGIN
+        self._page_has_content = False
+
+    def _draw_text(
+        self,
+        text: str,
+        x: float,
+        y: float,
+        size: float,
+        bold: bool = False,
+        color: str = TEXT_COLOR,
+    ) -> None:
+        # Content is kept as latin-1 text so cp1252 bytes round-trip unchanged.
+        font = "F2" if bold else "F1"
+        self._content.append(
+            f"BT {_hex_to_rgb(color)} rg /{font} {size:g} Tf {x:.2f} {y:.2f} Td "
+            f"{_pdf_string(text).decode('latin-1')} Tj ET"
+        )
+
+    def _draw_lines(
+        self,
+        lines: Sequence[str],
+        size: float,
+        bold: bool = False,
+        indent: float = 0.0,
+        color: str = TEXT_COLOR,
+    ) -> Tuple[float, float]:
+        line_height = size * LINE_SPACING
+        first_top = None
+        for line in lines:
+            self._ensure_space(line_height)
+            if first_top is None:
+                first_top = self._cursor
+            self._cursor -= line_height
+            self._draw_text(line, MARGIN + indent, self._cursor + size * 0.25, size, bold, color)
+            self._page_has_content = True
+        return (first_top or self._cursor), self._cursor
+
+    # -- blocks -------------------------------------------------------------
+
+    def write(self, block: Block) -> None:
+        if isinstance(block, Heading):
+            self._write_heading(block)
+        elif isinstance(block, Paragraph):
+            self._write_paragraph(block.text, block.style)
+        elif isinstance(block, Link):
+            self._write_link(block)
+        elif isinstance(block, PageBreak):
+            if self._page_has_content:
+                self._finish_page()
+        elif isinstance(block, TableOfContents):
+            self._write_paragraph("Use the document outline (bookmarks) to navigate this report.", None)
+        elif isinstance(block, Table):
+            self._write_table(block)
+        elif isinstance(block, Fragment):
+            # Page layout depends on where a fragment lands, so it is always laid out afresh.
+            self.write_all(block.render())
+
+    def write_all(self, blocks: Iterable[Block]) -> None:
+        for block in blocks:
+            self.write(block)
+
+    def _write_heading(self, heading: Heading) -> None:
+        size = HEADING_SIZES.get(heading.level, BODY_SIZE + 1)
+        lines = _wrap(heading.text, CONTENT_WIDTH, size, bold=True)
+        # Keep the heading together with at least a couple of lines that follow it.
+        self._ensure_space(size * LINE_SPACING * len(lines) + size * 0.6 + BODY_SIZE * LINE_SPACING * 2)
+        self._cursor -= size * 0.6
+        top, _ = self._draw_lines(lines, size, bold=True)
+        self._record_outline(heading.text, heading.level, top)
+        self._cursor -= size * 0.2
+
+    def _write_paragraph(self, text: str, style: Optional[str]) -> None:
+        indent = 0.0
+        if style == "List Bullet":
+            text = f"{BULLET}{text}"
+            indent = 12.0
+        self._draw_lines(_wrap(text, CONTENT_WIDTH - indent, BODY_SIZE), BODY_SIZE, indent=indent)
+        self._cursor -= BODY_SIZE * 0.4
+
+    def _write_link(self, link: Link) -> None:
+        indent = 12.0 if link.style == "List Bullet" else 0.0
+        lines = _wrap(link.text, CONTENT_WIDTH - indent, BODY_SIZE)
+        top, bottom = self._draw_lines(lines, BODY_SIZE, indent=indent, color=LINK_COLOR)
+        width = max(_text_width(line, BODY_SIZE) for line in lines)
+        target = _pdf_string(link.target).decode("latin-1")
+        self._annotations.append(
+            f"<< /Type /Annot /Subtype /Link /Border [0 0 0] "
+            f"/Rect [{MARGIN + indent:.2f} {bottom:.2f} {MARGIN + indent + width:.2f} {top:.2f}] "
+            f"/A << /S /URI /URI {target} >> >>"
+        )
+        self._cursor -= BODY_SIZE * 0.4
+
+    def _write_table(self, table: Table) -> None:
+        columns = max(len(table.headers), 1)
+        column_width = CONTENT_WIDTH / columns
+        text_width = column_width - 2 * CELL_PADDING
+        line_height = TABLE_SIZE * LINE_SPACING
+        # The header is repeated on every page a table spans, so it is clipped
+        # to half a page to leave room for rows under it.
+        max_header_lines = max(1, int(((PAGE_HEIGHT - 2 * MARGIN - FOOTER_Y) / 2 - 2 * CELL_PADDING) // line_height))
+        headers = [
+            _clip_lines(lines, max_header_lines, text_width, TABLE_SIZE, bold=True)
+            for lines in (_wrap(str(header), text_width, TABLE_SIZE, bold=True) for header in table.headers)
+        ]
+        header_fills = {idx: table.header_fill for idx in range(columns)}
+        header_height = self._row_height(headers)
+        page_capacity = int((PAGE_HEIGHT - 2 * MARGIN - FOOTER_Y - header_height - 2 * CELL_PADDING) // line_height)
+        self._ensure_space(header_height * 2)
+        self._draw_row(headers, column_width, bold=True, fills=header_fills)
+
+        for row in table.rows:
+            cells = [
+                _wrap(str(row[idx]) if idx < len(row) else "", text_width, TABLE_SIZE)
+                for idx in range(columns)
+            ]
+            while cells:
+                needed = max(len(cell) for cell in cells)
+                fit = int((self._available() - 2 * CELL_PADDING) // line_height)
+                if fit < needed and (fit < 1 or needed <= page_capacity):
+                    # Move the row to a fresh page under a repeated header.
+                    self._finish_page()
+                    self._draw_row(headers, column_width, bold=True, fills=header_fills)
+                    continue
+                # Rows taller than a whole page are split across pages.
+                take = min(fit, needed)
+                self._draw_row([cell[:take] for cell in cells], column_width, fills=table.column_fills)
+                remaining = [cell[take:] for cell in cells]
+                cells = remaining if any(remaining) else []
+        self._cursor -= BODY_SIZE * 0.6
+
+    @staticmethod
+    def _row_height(cells: Sequence[Sequence[str]]) -> float:
+        return max((len(cell) for cell in cells), default=1) * TABLE_SIZE * LINE_SPACING + 2 * CELL_PADDING
+
+    def _draw_row(self, cells: Sequence[Sequence[str]], column_width: float, bold: bool = False, fills=None) -> None:
+        height = self._row_height(cells)
+        self._ensure_space(height)
+        top = self._cursor
+        bottom = top - height
+        for idx, lines in enumerate(cells):
+            x = MARGIN + idx * column_width
+            fill = (fills or {}).get(idx)
+            if fill:
+                self._content.append(f"{_hex_to_rgb(fill)} rg {x:.2f} {bottom:.2f} {column_width:.2f} {height:.2f} re f")
+            self._content.append(f"0.6 0.6 0.6 RG 0.5 w {x:.2f} {bottom:.2f} {column_width:.2f} {height:.2f} re S")
+            y = top - CELL_PADDING
+            for line in lines:
+                y -= TABLE_SIZE * LINE_SPACING
+                self._draw_text(line, x + CELL_PADDING, y + TABLE_SIZE * 0.25, TABLE_SIZE, bold)
+        self._cursor = bottom
+        self._page_has_content = True
+
+    # -- outline ------------------------------------------------------------
+
+    def _record_outline(self, title: str, level: int, top: float) -> None:
+        pickle.dump(
+            (title, 0 if level <= 1 else 1, self._current_page_id(), top),
+            self._outline,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        self._outline_count += 1
+
+    def _iter_outline(self) -> Iterable[Tuple[str, int, int, float]]:
+        self._outline.seek(0)
+        for _ in range(self._outline_count):
+            yield pickle.load(self._outline)
+
+    def _write_outline(self) -> Optional[int]:
+        if not self._outline_count:
+            return None
+        # Outline items get consecutive ids in document order, so each top-level
+        # item is immediately followed by its children and only the top-level
+        # items (one per section) need to be remembered.
+        first_item_id = self._next_id + 1
+        top_level: List[Tuple[int, int]] = []
+        for offset, (_, depth, _, _) in enumerate(self._iter_outline()):
+            item_id = first_item_id + offset
+            if depth == 0 or not top_level:
+                top_level.append((item_id, 0))
+            else:
+                parent_id, children = top_level[-1]
+                top_level[-1] = (parent_id, children + 1)
+
+        root_id = self._write_object(
+            (
+                f"<< /Type /Outlines /First {top_level[0][0]} 0 R /Last {top_level[-1][0]} 0 R "
+                f"/Count {len(top_level)} >>"
+            ).encode("ascii")
+        )
+        children_of = dict(top_level)
+        top_level_ids = [item_id for item_id, _ in top_level]
+        position = {item_id: idx for idx, item_id in enumerate(top_level_ids)}
+        parent_id = root_id
+        for offset, (title, depth, page_id, top) in enumerate(self._iter_outline()):
+            item_id = first_item_id + offset
+            links: List[str] = []
+            if item_id in children_of:
+                idx = position[item_id]
+                links.append(f"/Parent {root_id} 0 R")
+                if idx:
+                    links.append(f"/Prev {top_level_ids[idx - 1]} 0 R")
+                if idx + 1 < len(top_level_ids):
+                    links.append(f"/Next {top_level_ids[idx + 1]} 0 R")
+                children = children_of[item_id]
+                if children:
+                    links.append(f"/First {item_id + 1} 0 R /Last {item_id + children} 0 R /Count -{children}")
+                parent_id = item_id
+            else:
+                links.append(f"/Parent {parent_id} 0 R")
+                if item_id > parent_id + 1:
+                    links.append(f"/Prev {item_id - 1} 0 R")
+                if item_id < parent_id + children_of[parent_id]:
+                    links.append(f"/Next {item_id + 1} 0 R")
+            self._write_object(
+                (
+                    f"<< /Title {_pdf_string(title).decode('latin-1')} "
+                    f"/Dest [{page_id} 0 R /XYZ {MARGIN:g} {top:.2f} null] {' '.join(links)} >>"
+                ).encode("latin-1")
+            )
+        return root_id
+
+    # -- trailer ------------------------------------------------------------
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._page_has_content or not self._page_count:
+            self._finish_page()
+        first_page_id = FIRST_DYNAMIC_ID + 1
+        outline_id = self._write_outline()
+
+        kids = " ".join(f"{first_page_id + 2 * idx} 0 R" for idx in range(self._page_count))
+        self._write_reserved(
+            PAGES_ID,
+            f"<< /Type /Pages /Kids [{kids}] /Count {self._page_count} >>".encode("ascii"),
+        )
+        outline = f" /Outlines {outline_id} 0 R /PageMode /UseOutlines" if outline_id else ""
+        self._write_reserved(
+            CATALOG_ID,
+            f"<< /Type /Catalog /Pages {PAGES_ID} 0 R{outline} >>".encode("ascii"),
+        )
+        info_id = self._write_object(f"<< /Title {_pdf_string(self._title).decode('latin-1')} >>".encode("latin-1"))
+
+        xref_offset = self._file.tell()
+        self._file.write(f"xref\n0 {self._next_id}\n0000000000 65535 f \n".encode("ascii"))
+        for object_id in range(1, FIRST_DYNAMIC_ID):
+            self._file.write(f"{self._reserved_offsets[object_id]:010d} 00000 n \n".encode("ascii"))
+        self._offsets.seek(0)
+        while chunk := self._offsets.read(64 * 1024):
+            self._file.write(chunk)
+        self._file.write(
+            (
+                f"trailer\n<< /Size {self._next_id} /Root {CATALOG_ID} 0 R /Info {info_id} 0 R >>\n"
+                f"startxref\n{xref_offset}\n%%EOF\n"
+            ).encode("ascii")
+        )
+        self._file.close()
+        self._offsets.close()
+        self._outline.close()
+        os.replace(self._temp_path, self._output_path)
+
+    def abandon(self) -> None:
+        """Discard the unfinished file without writing the page tree or trailer."""
+        self._closed = True
+        # The file is thrown away, so a failure to close it must not hide
+        # the error that stopped the render.
+        for stream in (self._file, self._offsets, self._outline):
+            with contextlib.suppress(Exception):
+                stream.close()
+        self._temp_path.unlink(missing_ok=True)
+
+
+def write_pdf(blocks: Iterable[Block], output_path: Path, title: str = "") -> None:
+    with PdfStreamWriter(output_path, title=title) as writer:
+        writer.write_all(blocks)
+
+
+def write_report(report: RenderedReport, output_path: Path, writer_options: WriterOptions) -> None:
+    write_pdf(
+        iter_document_blocks(report),
+        output_path,
+        title=f"{report.metadata.organization} Intune Report",
+    )
@@ -0,0 +1,144 @@
+"""PowerPoint report writer."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.util import Inches
+
+from ..reports.schema import RenderedReport
+from .common import (
+    WriterOptions,
+    extract_assets_payload,
+    extract_assignment_coverage_payload,
+    extract_summary_payload,
+    summarize_enrollment_profiles,
+    summarize_groups,
+)
+
+
+def write_report(report: RenderedReport, output_path: Path, writer_options: WriterOptions) -> None:
+    presentation = Presentation()
+    title_slide = presentation.slides.add_slide(presentation.slide_layouts[0])
+    title_slide.shapes.title.text = f"{report.metadata.organization} Intune Report"
+    subtitle = title_slide.placeholders[1]
+    subtitle.text = (
+        f"Audience: {report.audience}\n"
+        f"Generated: {report.metadata.generated_at}"
+    )
+
+    summary_payload = extract_summary_payload(report)
+    assets_payload = extract_assets_payload(report)
+    assignment_payload = extract_assignment_coverage_payload(report)
+    group_summary = summarize_groups(assets_payload)
+    enrollment_summary = summarize_enrollment_profiles(assets_payload)
+    assignments_by_group = assignment_payload.get("assignments_by_group", {}) if assignment_payload else {}
+    members_by_group = assignment_payload.get("members_by_group", {}) if assignment_payload else {}
+
+    summary_slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+    summary_slide.shapes.title.text = "Executive Summary"
+    highlights = summary_payload.get("highlights", []) if isinstance(summary_payload, dict) else []
+    metrics = summary_payload.get("metrics", {}) if isinstance(summary_payload, dict) else {}
+    textbox = summary_slide.shapes.add_textbox(Inches(0.6), Inches(1.4), Inches(4.5), Inches(3.8))
+    text_frame = textbox.text_frame
+    text_frame.text = "Highlights"
+    text_frame.paragraphs[0].font.bold = True
+    for item in highlights:
+        paragraph = text_frame.add_paragraph()
+        paragraph.text = str(item)
+        paragraph.level = 1
+
+    metrics_table = summary_slide.shapes.add_table(
+        rows=len(metrics) + 1,
+        cols=2,
+        left=Inches(5.2),
+        top=Inches(1.4),
+        width=Inches(4.0),
+        height=Inches(3.0),
+    ).table
+    metrics_table.cell(0, 0).text = "Metric"
+    metrics_table.cell(0, 1).text = "Value"
+    for row_idx, (key, value) in enumerate(metrics.items(), start=1):
+        metrics_table.cell(row_idx, 0).text = str(key).replace("_", " ").title()
+        metrics_table.cell(row_idx, 1).text = str(value)
+
+    policies_slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+    policies_slide.shapes.title.text = "Policies Applied to Groups"
+    if group_summary:
+        top_groups = sorted(group_summary, key=lambda item: item["assigned_assets"], reverse=True)[:10]
+        chart_data = CategoryChartData()
+        chart_data.categories = [row["name"] for row in top_groups]
+        chart_data.add_series("Policies Applied", [row["assigned_assets"] for row in top_groups])
+        chart = policies_slide.shapes.add_chart(
+            XL_CHART_TYPE.COLUMN_CLUSTERED,
+            Inches(0.8),
+            Inches(1.6),
+            Inches(8.4),
+            Inches(3.8),
+            chart_data,
+        ).chart
+        chart.has_legend = False
+        chart.value_axis.has_major_gridlines = True
+        chart.plots[0].has_data_labels = True
+    else:
+        no_data_box = policies_slide.shapes.add_textbox(Inches(1.0), Inches(2.2), Inches(8.0), Inches(1.0))
+        no_data_box.text_frame.text = "No group assignment data available."
+
+    coverage_slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+    coverage_slide.shapes.title.text = "Group Coverage Overview"
+    if members_by_group:
+        # Real reach: the transitive users and devices of the largest assigned groups.
+        sorted_members = sorted(
+            members_by_group.items(),
+            key=lambda item: item[1].get("users", 0) + item[1].get("devices", 0),
+            reverse=True,
+        )[:10]
+        chart_data = CategoryChartData()
+        chart_data.categories = [group for group, _ in sorted_members]
+        chart_data.add_series("Users", [counts.get("users", 0) for _, counts in sorted_members])
+        chart_data.add_series("Devices", [counts.get("devices", 0) for _, counts in sorted_members])
+    elif assignments_by_group:
+        sorted_groups = sorted(assignments_by_group.items(), key=lambda item: item[1], reverse=True)[:10]
+        chart_data = CategoryChartData()
+        chart_data.categories = [group for group, _ in sorted_groups]
+        chart_data.add_series("Assets Assigned", [count for _, count in sorted_groups])
+    if members_by_group or assignments_by_group:
+        chart = coverage_slide.shapes.add_chart(
+            XL_CHART_TYPE.COLUMN_CLUSTERED,
+            Inches(0.8),
+            Inches(1.6),
+            Inches(8.4),
+            Inches(3.8),
+            chart_data,
+        ).chart
+        # Users and devices are two series; asset counts are one.
+        chart.has_legend = bool(members_by_group)
+        chart.plots[0].has_data_labels = True
+    else:
+        no_data_box = coverage_slide.shapes.add_textbox(Inches(1.0), Inches(2.2), Inches(8.0), Inches(1.0))
+        no_data_box.text_frame.text = "No coverage data available."
+
+    enrollment_slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+    enrollment_slide.shapes.title.text = "Enrollment Profiles by Group"
+    if enrollment_summary:
+        table = enrollment_slide.shapes.add_table(
+            rows=len(enrollment_summary) + 1,
+            cols=2,
+            left=Inches(0.6),
+            top=Inches(1.6),
+            width=Inches(9.0),
+            height=Inches(4.0),
+        ).table
+        table.cell(0, 0).text = "Group"
+        table.cell(0, 1).text = "Enrollment Profiles"
+        for row_idx, row in enumerate(enrollment_summary, start=1):
+            table.cell(row_idx, 0).text = row["group"]
+            table.cell(row_idx, 1).text = row["profiles"]
+    else:
+        no_data_box = enrollment_slide.shapes.add_textbox(Inches(1.0), Inches(2.2), Inches(8.0), Inches(1.0))
+        no_data_box.text_frame.text = "No enrollment profile assignments available."
+
+    presentation.save(output_path)
@@ -0,0 +1,93 @@
+"""python-docx backend for document blocks."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Optional
+
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+from .blocks import Block, Fragment, Heading, Link, PageBreak, Paragraph, Table, TableOfContents
+from .docx_stream import HYPERLINK_COLOR, TOC_FIELD_INSTRUCTION
+from .render_cache import RenderCache
+
+
+def write_docx(blocks: Iterable[Block], output_path: Path, cache: Optional[RenderCache] = None) -> None:
+    # python-docx builds its own object tree, so fragments are always rendered
+    # and ``cache`` is accepted only to match the stream backend.
+    document = Document()
+    for block in blocks:
+        _add_docx_block(document, block)
+    document.save(output_path)
+
+
+def _add_docx_block(document: Document, block: Block) -> None:
+    if isinstance(block, Heading):
+        document.add_heading(block.text, level=block.level)
+    elif isinstance(block, Paragraph):
+        document.add_paragraph(block.text, style=block.style)
+    elif isinstance(block, Link):
+        _add_hyperlink(document, block)
+    elif isinstance(block, PageBreak):
+        document.add_page_break()
+    elif isinstance(block, TableOfContents):
+        _add_table_of_contents(document)
+    elif isinstance(block, Table):
+        _add_docx_table(document, block)
+    elif isinstance(block, Fragment):
+        for fragment_block in block.render():
+            _add_docx_block(document, fragment_block)
+
+
+def _add_hyperlink(document: Document, block: Link) -> None:
+    paragraph = document.add_paragraph(style=block.style)
+    relationship_id = paragraph.part.relate_to(block.target, RT.HYPERLINK, is_external=True)
+    hyperlink = OxmlElement("w:hyperlink")
+    hyperlink.set(qn("r:id"), relationship_id)
+    run = OxmlElement("w:r")
+    run_properties = OxmlElement("w:rPr")
+    color = OxmlElement("w:color")
+    color.set(qn("w:val"), HYPERLINK_COLOR)
+    underline = OxmlElement("w:u")
+    underline.set(qn("w:val"), "single")
+    run_properties.append(color)
+    run_properties.append(underline)
+    text = OxmlElement("w:t")
+    text.text = block.text
+    run.append(run_properties)
+    run.append(text)
+    hyperlink.append(run)
+    paragraph._p.append(hyperlink)
+
+
+def _add_table_of_contents(document: Document) -> None:
+    paragraph = document.add_paragraph()
+    run = paragraph.add_run()
+    field = OxmlElement("w:fldSimple")
+    field.set(qn("w:instr"), TOC_FIELD_INSTRUCTION)
+    run._r.append(field)
+
+
+def _add_docx_table(document: Document, block: Table) -> None:
+    table = document.add_table(rows=1, cols=len(block.headers))
+    table.style = block.style
+    header_cells = table.rows[0].cells
+    for idx, header in enumerate(block.headers):
+        header_cells[idx].text = header
+        _set_cell_shading(header_cells[idx], block.header_fill)
+    for row in block.rows:
+        row_cells = table.add_row().cells
+        for idx, value in enumerate(row):
+            row_cells[idx].text = value
+        for idx, color in block.column_fills.items():
+            _set_cell_shading(row_cells[idx], color)
+
+
+def _set_cell_shading(cell, color: str) -> None:
+    tc_pr = cell._tc.get_or_add_tcPr()
+    shading = OxmlElement("w:shd")
+    shading.set(qn("w:fill"), color)
+    tc_pr.append(shading)
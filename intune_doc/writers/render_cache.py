@@ -0,0 +1,78 @@
+"""On-disk cache of per-asset rendered fragments.
+
+Fragments are stored one file per asset under a namespace naming the output
+format, template and scope they were rendered for, keyed by the asset's
+content hash. Unchanged assets are spliced back into a report from the cache
+instead of being rendered again. Each entry is written to a temporary file and
+renamed into place, so shard workers can share a cache directory.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+
+# Bump when a writer changes the markup or rows it produces for an asset so
+# fragments rendered by older code are not reused.
+FRAGMENT_VERSION = 1
+
+_NAMESPACE_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+T = TypeVar("T")
+
+
+class RenderCache:
+    def __init__(self, directory: Path, namespace: str) -> None:
+        self.directory = Path(directory) / _NAMESPACE_CHARS.sub("-", f"v{FRAGMENT_VERSION}-{namespace}")
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pickle"
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with self._path(key).open("rb") as cache_file:
+                return pickle.load(cache_file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def put(self, key: str, fragment: Any) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                pickle.dump(fragment, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def fetch(self, key: str, render: Callable[[], T]) -> T:
+        """Return the cached fragment for ``key``, rendering and storing it on a miss."""
+        fragment = self.get(key) if key else None
+        if fragment is not None:
+            self.hits += 1
+            return fragment
+        self.misses += 1
+        fragment = render()
+        if key:
+            self.put(key, fragment)
+        return fragment
+
+
+def open_render_cache(
+    directory: Optional[str],
+    format_name: str,
+    template: str,
+    scope: str,
+) -> Optional[RenderCache]:
+    if not directory:
+        return None
+    return RenderCache(Path(directory), f"{format_name}-{template}-{scope}")
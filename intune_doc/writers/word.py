@@ -0,0 +1,152 @@
+"""Word report writer."""
+
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from ..config import WORD_BACKENDS, WORD_SHARD_MODES
+from ..reports.schema import RenderedReport
+from .blocks import Block, Heading, Paragraph
+from .common import WriterOptions, map_in_workers, shard_file_slug
+from .document import assets_section_blocks, iter_document_blocks
+from .render_cache import RenderCache, open_render_cache
+
+
+# Backend modules are imported on first use so the stream backend never
+# loads python-docx.
+BACKEND_MODULES = {
+    "python-docx": ".python_docx",
+    "stream": ".docx_stream",
+}
+
+
+def write_report(report: RenderedReport, output_path: Path, writer_options: WriterOptions) -> None:
+    _write_docx_report(
+        report,
+        output_path,
+        backend=writer_options.word_backend,
+        shard_by=writer_options.word_shard_by,
+        shard_size=writer_options.word_shard_size,
+        max_workers=writer_options.max_workers,
+        cache=open_render_cache(
+            writer_options.render_cache_directory,
+            f"word-{writer_options.word_backend}",
+            report.audience,
+            report.scope,
+        ),
+    )
+
+
+def _write_docx_report(
+    report: RenderedReport,
+    output_path: Path,
+    backend: str = "python-docx",
+    shard_by: str = "none",
+    shard_size: int = 500,
+    max_workers: Optional[int] = None,
+    cache: Optional[RenderCache] = None,
+) -> None:
+    if backend not in WORD_BACKENDS:
+        raise ValueError(f"Unknown Word backend: {backend}")
+    if shard_by not in WORD_SHARD_MODES:
+        raise ValueError(f"Unknown Word shard mode: {shard_by}")
+
+    asset_shards = None
+    if shard_by != "none":
+        asset_shards = _write_docx_asset_shards(
+            report, output_path, backend, shard_by, shard_size, max_workers, cache
+        )
+    _write_docx_blocks(iter_document_blocks(report, asset_shards), output_path, backend, cache)
+
+
+def _write_docx_blocks(
+    blocks: Iterable[Block],
+    output_path: Path,
+    backend: str,
+    cache: Optional[RenderCache] = None,
+) -> None:
+    backend_module = importlib.import_module(BACKEND_MODULES[backend], __package__)
+    backend_module.write_docx(blocks, output_path, cache)
+
+
+@dataclass(frozen=True)
+class _DocxShardJob:
+    label: str
+    organization: str
+    audience: str
+    generated_at: str
+    section_title: str
+    assets: list
+    output_path: Path
+    backend: str
+    cache: Optional[RenderCache] = None
+
+
+def _split_docx_shards(assets_payload: list[dict[str, object]], shard_by: str, shard_size: int) -> list[tuple[str, list]]:
+    if shard_by == "asset_type":
+        by_type: Dict[str, list] = {}
+        for asset in assets_payload:
+            by_type.setdefault(str(asset.get("asset_type") or "Unknown"), []).append(asset)
+        return [
+            (asset_type.replace("_", " ").title(), assets)
+            for asset_type, assets in sorted(by_type.items(), key=lambda item: item[0].casefold())
+        ]
+    if shard_size < 1:
+        raise ValueError("Word shard size must be at least 1")
+    return [
+        (f"Assets {start + 1}-{min(start + shard_size, len(assets_payload))}", assets_payload[start:start + shard_size])
+        for start in range(0, len(assets_payload), shard_size)
+    ]
+
+
+def _write_docx_asset_shards(
+    report: RenderedReport,
+    output_path: Path,
+    backend: str,
+    shard_by: str,
+    shard_size: int,
+    max_workers: Optional[int] = None,
+    cache: Optional[RenderCache] = None,
+) -> list[tuple[str, str, int]]:
+    """Render asset detail pages into one document per shard, in parallel.
+
+    Returns ``(label, file name, asset count)`` for each shard so the master
+    document can link to it.
+    """
+    assets_section = next((section for section in report.sections if "assets" in section.payload), None)
+    if assets_section is None or not isinstance(assets_section.payload.get("assets"), list):
+        return []
+
+    used_slugs: set[str] = set()
+    jobs = [
+        _DocxShardJob(
+            label=label,
+            organization=report.metadata.organization,
+            audience=report.audience,
+            generated_at=report.metadata.generated_at,
+            section_title=assets_section.title,
+            assets=assets,
+            output_path=output_path.with_name(
+                f"{output_path.stem}-{shard_file_slug(label, used_slugs)}{output_path.suffix}"
+            ),
+            backend=backend,
+            cache=cache,
+        )
+        for label, assets in _split_docx_shards(assets_section.payload["assets"], shard_by, shard_size)
+    ]
+    map_in_workers(_write_docx_shard, jobs, max_workers)
+    return [(job.label, job.output_path.name, len(job.assets)) for job in jobs]
+
+
+def _write_docx_shard(job: _DocxShardJob) -> None:
+    def blocks() -> Iterator[Block]:
+        yield Heading(f"{job.organization} Intune Report", level=0)
+        yield Paragraph(f"Audience: {job.audience}")
+        yield Paragraph(f"Generated at: {job.generated_at}")
+        yield Heading(f"{job.section_title}: {job.label}", level=1)
+        yield from assets_section_blocks(job.assets)
+
+    _write_docx_blocks(blocks(), job.output_path, job.backend, job.cache)
@@ -1,12 +1,14 @@
+import io
 import sys
 import unittest
 from pathlib import Path
+from unittest import mock
 
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from intune_doc.cli import ExportCommandOptions, parse_args  # noqa: E402
+from intune_doc.cli import DiffCommandOptions, ExportCommandOptions, RenderCommandOptions, parse_args  # noqa: E402
 from intune_doc.reports.cli import SUPPORTED_FORMATS  # noqa: E402
 from intune_doc.reports.schema import DEFAULT_REPORT_SCOPE  # noqa: E402
 
@@ -30,6 +32,36 @@ class TestCliParsing(unittest.TestCase):
         with self.assertRaises(ValueError):
             parse_args(["export", "--format", "not-a-format"])
 
+    def test_parse_args_combines_audiences_and_scopes(self) -> None:
+        options = parse_args(
+            ["export", "--audience", "admin,client", "--scope", "full_settings", "--scope", "assignment_summary"],
+            default_audience="admin",
+        )
+
+        self.assertEqual(options.audiences, ["admin", "client"])
+        self.assertEqual(options.scopes, ["full_settings", "assignment_summary"])
+
+    def test_parse_args_rejects_invalid_audiences_and_scopes(self) -> None:
+        for args in (["export", "--audience", "admin,board"], ["render", "fixtures", "--scope", "everything"]):
+            with self.assertRaises(SystemExit) as raised, mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                parse_args(args)
+            self.assertEqual(raised.exception.code, 2)
+            self.assertIn("Unsupported", stderr.getvalue())
+
+    def test_parse_args_diff_command(self) -> None:
+        options = parse_args(["diff", "old-raw.json", "new-raw.json", "--format", "json"])
+
+        self.assertEqual(options, DiffCommandOptions(old="old-raw.json", new="new-raw.json", output_format="json"))
+
+    def test_parse_args_render_command(self) -> None:
+        options = parse_args(["render", "fixtures", "--format", "word", "--scope", "assignment_summary"])
+
+        self.assertIsInstance(options, RenderCommandOptions)
+        self.assertEqual(options.input, "fixtures")
+        self.assertEqual(options.formats, ["word"])
+        self.assertEqual(options.scope, "assignment_summary")
+        self.assertIsNone(options.organization)
+
     def test_parse_args_requires_command(self) -> None:
         with self.assertRaises(SystemExit):
             parse_args([])
@@ -0,0 +1,117 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc.exporters import compliance_policies  # noqa: E402
+from intune_doc.reports.builder import build_report_schema  # noqa: E402
+from intune_doc.reports.rendering import render_report  # noqa: E402
+from intune_doc.reports.setting_rows import split_setting_rows  # noqa: E402
+from intune_doc.reports.templates import get_template_set  # noqa: E402
+
+
+def _assignment(group_id: str, name: str, assignment_type: str = "include") -> dict:
+    return {"target": {"groupId": group_id, "groupDisplayName": name, "assignmentType": assignment_type}}
+
+
+def _policy(policy_id: str, settings: dict, assignments: list, asset_type: str = "device_configurations") -> dict:
+    return {"id": policy_id, "displayName": policy_id, "type": asset_type, "settings": settings, "assignments": assignments}
+
+
+def _compliance(name: str, policy_type: str, password_required: bool) -> dict:
+    rows = [{"displayName": "passwordRequired", "value": password_required}]
+    settings = {"policyType": policy_type, "settings": rows}
+    return _policy(name, settings, [_assignment("g1", "All staff")], "compliance_policies")
+
+
+def _oma(*rows: tuple) -> dict:
+    return {"settings": [{"omaUri": uri, "value": value} for uri, value in rows], "platforms": "windows10"}
+
+
+class TestSettingConflicts(unittest.TestCase):
+    def test_overlaps_and_conflicts_are_found_per_setting_and_group(self) -> None:
+        assets = [
+            _policy("Baseline", _oma(("./Camera", 0), ("./Bluetooth", 1)), [_assignment("g1", "Finance")]),
+            _policy(
+                "Finance lock-down",
+                _oma(("./Camera", 1), ("./Bluetooth", 1)),
+                [_assignment("g1", "Finance"), _assignment("g2", "Sales")],
+            ),
+            # Excluded from Finance, so it cannot conflict there.
+            _policy(
+                "Sales",
+                _oma(("./Camera", 2)),
+                [_assignment("g2", "Sales"), _assignment("g1", "Finance", "exclude")],
+            ),
+        ]
+
+        conflicts = build_report_schema({"assets": assets}, audience="admin", organization="Contoso").setting_conflicts
+
+        self.assertEqual(conflicts.conflicting_settings, 1)
+        self.assertEqual(conflicts.overlapping_settings, 2)
+        camera = [overlap for overlap in conflicts.overlaps if overlap.setting == "./Camera"]
+        self.assertEqual([overlap.groups for overlap in camera], [["Finance"], ["Sales"]])
+        self.assertTrue(all(overlap.conflicting for overlap in camera))
+        self.assertEqual(
+            [(policy["name"], policy["value"]) for policy in camera[0].policies],
+            [("Baseline", "0"), ("Finance lock-down", "1")],
+        )
+        bluetooth = conflicts.overlaps[-1]
+        self.assertEqual((bluetooth.setting, bluetooth.groups, bluetooth.conflicting), ("./Bluetooth", ["Finance"], False))
+
+    def test_settings_are_compared_within_a_policy_type(self) -> None:
+        windows = "#microsoft.graph.windows10CompliancePolicy"
+        assets = [
+            _compliance("Windows", windows, True),
+            _compliance("iOS", "#microsoft.graph.iosCompliancePolicy", False),
+        ]
+
+        report = build_report_schema({"assets": assets}, audience="admin", organization="Contoso")
+        self.assertEqual(report.setting_conflicts.overlaps, [])
+
+        assets.append(_compliance("Windows strict", windows, False))
+        report = build_report_schema({"assets": assets}, audience="admin", organization="Contoso")
+        self.assertEqual([overlap.setting for overlap in report.setting_conflicts.overlaps], ["passwordRequired"])
+        self.assertTrue(report.setting_conflicts.overlaps[0].conflicting)
+
+    def test_compliance_properties_are_exported_as_setting_rows(self) -> None:
+        settings = compliance_policies._extract_settings(
+            {
+                "@odata.type": "#microsoft.graph.windows10CompliancePolicy",
+                "id": "1",
+                "displayName": "Windows",
+                "passwordRequired": True,
+                "requireDeviceEncryption": False,
+            }
+        )
+
+        self.assertEqual(
+            split_setting_rows(settings),
+            (
+                [
+                    {"setting": "passwordRequired", "value": "True", "description": ""},
+                    {"setting": "requireDeviceEncryption", "value": "False", "description": ""},
+                    {"setting": "policyType", "value": "#microsoft.graph.windows10CompliancePolicy", "description": ""},
+                ],
+                2,
+            ),
+        )
+
+    def test_conflicts_are_a_report_section(self) -> None:
+        assets = [
+            _policy("A", _oma(("./Camera", 0)), [_assignment("g1", "Finance")]),
+            _policy("B", _oma(("./Camera", 1)), [_assignment("g1", "Finance")]),
+        ]
+        report = build_report_schema({"assets": assets}, audience="admin", organization="Contoso")
+
+        rendered = render_report("json", report, get_template_set("admin"))
+
+        section = next(section for section in rendered.sections if "setting_conflicts" in section.payload)
+        self.assertEqual(section.payload["setting_conflicts"]["conflicting_settings"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc import auth  # noqa: E402
+from intune_doc.daemon import Watcher, send_control_command  # noqa: E402
+from intune_doc.graph_client import GraphClient  # noqa: E402
+from intune_doc.reports.builder import build_report_schema  # noqa: E402
+
+
+class _AuditGraphClient(GraphClient):
+    """Answers the audit event check with ``events`` and records the filters asked for."""
+
+    def __init__(self) -> None:
+        super().__init__("token")
+        self.events = []
+        self.filters = []
+
+    def get(self, path, params=None, is_absolute=False, log_errors=True):
+        self.filters.append(params["$filter"])
+        return {"value": list(self.events)}
+
+
+class _Tenant:
+    def __init__(self) -> None:
+        self.settings = {"allowCamera": False}
+        self.exports = 0
+        self.written = []
+
+    def export(self):
+        self.exports += 1
+        raw_export = {
+            "assets": [{"id": "1", "displayName": "Camera", "type": "settings_catalog", "settings": dict(self.settings)}]
+        }
+        return raw_export, build_report_schema(raw_export, audience="admin", organization="Contoso")
+
+    def write(self, raw_export, report):
+        self.written.append(report.assets[0].settings)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.graph_client = _AuditGraphClient()
+        self.tenant = _Tenant()
+        self.clock = _Clock()
+        self.watcher = Watcher(
+            self.graph_client,
+            export=self.tenant.export,
+            write=self.tenant.write,
+            interval_seconds=60,
+            full_refresh_seconds=3600,
+            clock=self.clock,
+        )
+
+    def test_exports_only_after_audited_changes_and_writes_only_changed_reports(self) -> None:
+        self.assertEqual(self.watcher.poll(force=True), "written")
+
+        self.clock.now += 60
+        self.assertEqual(self.watcher.poll(), "skipped")
+        self.assertEqual(self.graph_client.filters, ["activityDateTime gt 2023-11-14T22:13:20Z"])
+
+        # Audited, but nothing the export covers changed.
+        self.graph_client.events = [{"id": "event"}]
+        self.assertEqual(self.watcher.poll(), "unchanged")
+
+        self.tenant.settings["allowCamera"] = True
+        self.assertEqual(self.watcher.poll(), "written")
+        self.assertEqual(self.tenant.written, [{"allowCamera": False}, {"allowCamera": True}])
+        self.assertEqual((self.watcher.status.exports, self.watcher.status.writes), (3, 2))
+        self.assertEqual(self.watcher.status.changed_assets, 1)
+
+    def test_full_refresh_exports_without_audited_changes(self) -> None:
+        self.watcher.poll(force=True)
+
+        self.clock.now += 3600
+        self.watcher.poll()
+
+        self.assertEqual(self.tenant.exports, 2)
+        self.assertEqual(self.graph_client.filters, [])
+
+    def test_failed_change_check_exports_anyway(self) -> None:
+        self.watcher.poll(force=True)
+        self.graph_client.get = mock.Mock(side_effect=OSError("forbidden"))
+
+        self.clock.now += 60
+        with self.assertLogs("intune_doc.daemon", level="WARNING") as logs:
+            self.assertEqual(self.watcher.poll(), "unchanged")
+
+        self.assertEqual(self.tenant.exports, 2)
+        self.assertIn("exporting it anyway", "\n".join(logs.output))
+
+    def test_failed_export_is_retried(self) -> None:
+        self.watcher.export = mock.Mock(side_effect=OSError("offline"))
+        with self.assertLogs("intune_doc.daemon", level="ERROR"):
+            self.assertEqual(self.watcher.poll(force=True), "failed")
+        self.watcher.export = self.tenant.export
+
+        self.assertEqual(self.watcher.poll(), "written")
+
+    def test_control_socket_runs_reports_and_stops(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            socket_path = Path(temp_dir) / "watch.sock"
+            thread = threading.Thread(target=self.watcher.run, args=(socket_path,))
+            thread.start()
+            try:
+                deadline = time.time() + 5
+                while not socket_path.exists() and time.time() < deadline:
+                    time.sleep(0.01)
+
+                self.assertEqual(send_control_command(socket_path, "run"), {"ok": True, "queued": True})
+                while self.tenant.exports < 2 and time.time() < deadline:
+                    time.sleep(0.01)
+                status = send_control_command(socket_path, "status")
+                self.assertFalse(send_control_command(socket_path, "export")["ok"])
+            finally:
+                self.watcher.stop()
+                thread.join(5)
+
+            self.assertEqual(self.tenant.exports, 2)
+            self.assertEqual(status["exports"], 2)
+            self.assertFalse(thread.is_alive())
+            self.assertFalse(socket_path.exists())
+
+
+class TestTokenProvider(unittest.TestCase):
+    def test_token_is_renewed_before_it_expires(self) -> None:
+        expiring = auth.TokenResponse("expiring", expires_at=time.time() + 60)
+        renewed = auth.TokenResponse("renewed", expires_at=time.time() + 3600)
+        provider = auth.TokenProvider("tenant", "client", "secret")
+        with mock.patch.object(
+            auth, "request_client_credentials_token", side_effect=[expiring, renewed]
+        ) as request_token:
+            tokens = [provider(), provider(), provider()]
+
+        # The first token is inside the refresh margin, so it is used once.
+        self.assertEqual(tokens, ["expiring", "renewed", "renewed"])
+        self.assertEqual(request_token.call_count, 2)
+
+        graph_client = GraphClient("stale", token_provider=lambda: "fresh")
+        request = mock.Mock()
+        with mock.patch("urllib.request.urlopen", side_effect=OSError("offline")), self.assertRaises(OSError):
+            graph_client._open(request, "https://graph.microsoft.com/beta/x", log_errors=False)
+        request.add_header.assert_any_call("Authorization", "Bearer fresh")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc.diff import diff_assets, diff_exports, format_diff  # noqa: E402
+
+
+def _asset(asset_id: str, settings: dict, group: str = "All Staff", asset_type: str = "settings_catalog") -> dict:
+    return {
+        "id": asset_id,
+        "displayName": f"Policy {asset_id}",
+        "type": asset_type,
+        "settings": settings,
+        "assignments": [
+            {
+                "target": {"groupId": group.lower(), "groupDisplayName": group, "assignmentType": "include"},
+                "intent": "required",
+            }
+        ],
+    }
+
+
+class TestExportDiff(unittest.TestCase):
+    def test_reports_added_removed_and_modified_assets(self) -> None:
+        old = [_asset("a", {"x": 1}), _asset("b", {"x": 1}), _asset("c", {"x": 1, "y": 2})]
+        new = [_asset("a", {"x": 1}), _asset("c", {"x": 5, "z": 3}, group="Finance"), _asset("d", {})]
+
+        diff = diff_assets(old, new)
+
+        self.assertEqual([ref.asset_id for ref in diff.added], ["d"])
+        self.assertEqual([ref.asset_id for ref in diff.removed], ["b"])
+        self.assertEqual(diff.unchanged, 1)
+        (change,) = diff.modified
+        self.assertEqual(
+            [(setting.setting, setting.change, setting.old_value, setting.new_value) for setting in change.setting_changes],
+            [("x", "modified", "1", "5"), ("z", "added", None, "3"), ("y", "removed", "2", None)],
+        )
+        self.assertEqual(
+            [(assignment.target, assignment.change) for assignment in change.assignment_changes],
+            [("include: Finance", "added"), ("include: All Staff", "removed")],
+        )
+
+    def test_same_id_with_different_type_is_a_different_asset(self) -> None:
+        diff = diff_assets([_asset("a", {})], [_asset("a", {}, asset_type="device_configurations")])
+
+        self.assertEqual(len(diff.added), 1)
+        self.assertEqual(len(diff.removed), 1)
+
+    def test_compares_raw_json_with_ndjson(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            old_path = Path(tmp) / "old-raw.json"
+            new_path = Path(tmp) / "new.ndjson"
+            old_path.write_text(json.dumps({"generatedAt": "x", "assets": [_asset("a", {"x": 1})]}), encoding="utf-8")
+            new_path.write_text(
+                "\n".join([json.dumps({"generatedAt": "y"}), json.dumps(_asset("a", {"x": 2}))]),
+                encoding="utf-8",
+            )
+
+            text = format_diff(diff_exports(old_path, new_path))
+
+        self.assertIn("0 added, 0 removed, 1 modified, 0 unchanged", text)
+        self.assertIn("setting changed: x: 1 -> 2", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
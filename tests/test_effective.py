@@ -0,0 +1,86 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc.exporters.plan import plan_export  # noqa: E402
+from intune_doc.reports.builder import build_report_schema  # noqa: E402
+from intune_doc.reports.rendering import render_report  # noqa: E402
+from intune_doc.reports.templates import get_template_set  # noqa: E402
+
+
+def _policy(name: str, settings: list, targets: list) -> dict:
+    return {
+        "id": name.lower(),
+        "displayName": name,
+        "type": "device_configurations",
+        "settings": {"settings": [{"omaUri": uri, "value": value} for uri, value in settings]},
+        "assignments": [
+            {"target": {"groupId": group_id, "groupDisplayName": group_id.title(), "assignmentType": assignment_type}}
+            for group_id, assignment_type in targets
+        ],
+    }
+
+
+RAW_EXPORT = {
+    "assets": [
+        _policy("Baseline", [("./Camera", 0), ("./Bluetooth", 1)], [("finance", "include"), ("sales", "include")]),
+        _policy("Finance", [("./Camera", 1)], [("finance", "include")]),
+        _policy("Kiosk", [("./Camera", 2)], [("sales", "include"), ("finance", "exclude")]),
+    ]
+}
+
+
+class TestEffectivePolicyMatrix(unittest.TestCase):
+    def test_matrix_is_only_built_when_requested(self) -> None:
+        report = build_report_schema(RAW_EXPORT, audience="admin", organization="Contoso")
+
+        self.assertIsNone(report.effective_policies)
+        sections = render_report("json", report, get_template_set("admin")).sections
+        self.assertFalse(any("effective_policies" in section.payload for section in sections))
+
+    def test_lookups_apply_exclusions(self) -> None:
+        matrix = build_report_schema(
+            RAW_EXPORT, audience="admin", organization="Contoso", effective_policies=True
+        ).effective_policies
+
+        self.assertEqual(matrix.policies_for_group("finance"), ["Baseline", "Finance"])
+        self.assertEqual(matrix.policies_for_group("Sales"), ["Baseline", "Kiosk"])
+        self.assertEqual(
+            matrix.settings_for_group("finance"),
+            {"./Camera": [("Baseline", "0"), ("Finance", "1")], "./Bluetooth": [("Baseline", "1")]},
+        )
+        self.assertEqual(matrix.setting_for_group("sales", "./Camera"), [("Baseline", "0"), ("Kiosk", "2")])
+        self.assertIsNone(matrix.setting_for_group("sales", "./Wifi"))
+        self.assertEqual(matrix.policies_for_group("unknown"), [])
+        self.assertEqual((matrix.group_count, matrix.policy_count, matrix.entry_count), (2, 3, 6))
+        # Each (setting, value) pair is stored once per policy, not per group.
+        self.assertEqual(len(matrix.policy_settings), 4)
+
+    def test_matrix_is_a_report_section(self) -> None:
+        report = build_report_schema(RAW_EXPORT, audience="admin", organization="Contoso", effective_policies=True)
+
+        rendered = render_report("json", report, get_template_set("client"))
+
+        payload = next(
+            section.payload["effective_policies"]
+            for section in rendered.sections
+            if "effective_policies" in section.payload
+        )
+        self.assertEqual(
+            payload["groups"],
+            [
+                {"group": "Finance", "policies": ["Baseline", "Finance"], "settings": 3},
+                {"group": "Sales", "policies": ["Baseline", "Kiosk"], "settings": 3},
+            ],
+        )
+
+    def test_effective_policies_section_needs_settings(self) -> None:
+        self.assertTrue(plan_export(["full_settings"], ["effective_policies"]).include_settings)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc.exporters import composite_export  # noqa: E402
+from intune_doc.exporters.composite_export import export_all  # noqa: E402
+from intune_doc.exporters.common import ResourceDefinition  # noqa: E402
+from intune_doc.exporters.plan import ASSET_TYPES, plan_export  # noqa: E402
+from intune_doc.exporters.scheduler import UNKNOWN_COUNT_ESTIMATE, order_by_cost  # noqa: E402
+from intune_doc.graph_client import GraphClient  # noqa: E402
+
+
+class _RecordingGraphClient:
+    def __init__(self) -> None:
+        self.requests = []
+
+    def get(self, path, params=None, is_absolute=False, log_errors=True):
+        self.requests.append((path, params))
+        if path.endswith("/assignments"):
+            return {"value": []}
+        return {"value": [{"id": "1", "displayName": "Policy", "settings": [{"id": "s"}], "platforms": "windows10"}]}
+
+
+class TestExportPlan(unittest.TestCase):
+    def test_settings_are_only_planned_for_full_settings_asset_pages(self) -> None:
+        self.assertTrue(plan_export(["full_settings"]).include_settings)
+        self.assertTrue(plan_export(["assignment_summary", "full_settings"]).include_settings)
+        self.assertFalse(plan_export(["assignment_summary"]).include_settings)
+        self.assertFalse(plan_export(["full_settings"], ["summary", "assignment_coverage"]).include_settings)
+        self.assertTrue(plan_export(["assignment_summary"], keep_settings=True).include_settings)
+
+    def test_assignment_summary_selects_only_identity_fields(self) -> None:
+        graph_client = _RecordingGraphClient()
+
+        raw_export = export_all(graph_client, plan_export(["assignment_summary"]), max_workers=1)
+
+        collection_params = [params for path, params in graph_client.requests if not path.endswith("/assignments")]
+        self.assertTrue(collection_params)
+        # Reference fields are kept so scope tags and images can still be named.
+        self.assertEqual(
+            {params["$select"] for params in collection_params},
+            {"id,displayName", "id,displayName,roleScopeTagIds", "id,displayName,imageId"},
+        )
+        self.assertTrue(all(asset["settings"] == {} for asset in raw_export["assets"]))
+
+    def test_asset_types_skip_whole_resource_families(self) -> None:
+        graph_client = _RecordingGraphClient()
+
+        raw_export = export_all(graph_client, plan_export(["full_settings"], asset_types=["settings_catalog"]))
+
+        self.assertEqual({asset["type"] for asset in raw_export["assets"]}, {"settings_catalog"})
+        self.assertEqual(
+            [path for path, _ in graph_client.requests],
+            ["/deviceManagement/configurationPolicies", "/deviceManagement/configurationPolicies/1/assignments"],
+        )
+        self.assertEqual(raw_export["assets"][0]["settings"]["settings"], [{"id": "s"}])
+
+    def test_asset_types_match_exporter_resources(self) -> None:
+        for asset_type, resources in composite_export.RESOURCE_FAMILIES:
+            self.assertEqual({resource.type_key for resource in resources}, {asset_type})
+        self.assertEqual([asset_type for asset_type, _ in composite_export.RESOURCE_FAMILIES], list(ASSET_TYPES))
+
+
+class _SizedGraphClient(GraphClient):
+    """Serves collections whose size depends on the path, and answers $count probes."""
+
+    def __init__(self) -> None:
+        super().__init__("token")
+
+    def get(self, path, params=None, is_absolute=False, log_errors=True):
+        if path.endswith("/assignments"):
+            return {"value": [{"target": {"groupId": "g1"}}]}
+        if path == "/groups":
+            return {"value": [{"id": "g1", "displayName": "Group"}]}
+        if path.endswith("/definitionValues"):
+            return {"value": []}
+        size = len(path) % 5
+        if params and params.get("$count") == "true":
+            return {"@odata.count": size, "value": []}
+        return {"value": [{"id": f"{path}-{index}", "displayName": f"{path} {index}"} for index in range(size)]}
+
+    def post(self, path, body):
+        # Member count $batch requests.
+        return {"responses": [{"id": request["id"], "status": 200, "body": 3} for request in body["requests"]]}
+
+
+class TestExportScheduler(unittest.TestCase):
+    def test_most_expensive_resources_are_scheduled_first(self) -> None:
+        def resource(name: str, assignable: bool = True) -> ResourceDefinition:
+            return ResourceDefinition(name, name, f"/{name}", f"/{name}/{{id}}/assignments" if assignable else None)
+
+        resources = [resource("small"), resource("filters", assignable=False), resource("unknown"), resource("large")]
+        scheduled = order_by_cost(resources, [3, 5000, None, 800])
+
+        # Unassignable filters only cost their 50 collection pages.
+        self.assertEqual([item.resource.type_key for item in scheduled], ["large", "unknown", "filters", "small"])
+        self.assertEqual(scheduled[1].estimated_requests, 1 + UNKNOWN_COUNT_ESTIMATE * 2)
+        self.assertEqual([item.estimated_requests for item in scheduled[2:]], [50, 7])
+
+    def test_parallel_export_keeps_declaration_order(self) -> None:
+        sequential = export_all(_SizedGraphClient(), max_workers=1)["assets"]
+        parallel = export_all(_SizedGraphClient(), max_workers=4)["assets"]
+
+        self.assertTrue(sequential)
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(
+            {asset["type"] for asset in parallel},
+            {asset_type for asset_type, resources in composite_export.RESOURCE_FAMILIES
+             if any(len(resource.collection_path) % 5 for resource in resources)},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
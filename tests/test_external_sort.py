@@ -0,0 +1,33 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc.external_sort import external_sort  # noqa: E402
+
+
+class TestExternalSort(unittest.TestCase):
+    def test_sorts_in_memory_when_rows_fit_in_one_run(self) -> None:
+        rows = [["b"], ["a"], ["c"]]
+
+        self.assertEqual(list(external_sort(rows, key=lambda row: row[0])), [["a"], ["b"], ["c"]])
+
+    def test_merges_spilled_runs(self) -> None:
+        rows = [[value, str(value)] for value in (7, 3, 9, 1, 5, 8, 2, 6, 4, 0)]
+        seen = []
+
+        result = external_sort(rows, key=lambda row: row[0], run_size=3, on_row=seen.append)
+
+        self.assertEqual(len(seen), len(rows))
+        self.assertEqual([row[0] for row in result], list(range(10)))
+
+    def test_rejects_invalid_run_size(self) -> None:
+        with self.assertRaises(ValueError):
+            external_sort([], key=lambda row: row, run_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import io
+import sys
+import threading
+import traceback
+import unittest
+import urllib.error
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc.graph_client import GraphClient  # noqa: E402
+
+
+class _Response(io.BytesIO):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TestGetCoalescing(unittest.TestCase):
+    def setUp(self) -> None:
+        self.graph_client = GraphClient("token")
+        self.urls = []
+
+    def _urlopen(self, body: bytes = b'{"value": [1]}', release: threading.Event = None):
+        def urlopen(request):
+            self.urls.append(request.full_url)
+            if release is not None:
+                release.wait(5)
+            return _Response(body)
+
+        return mock.patch("urllib.request.urlopen", side_effect=urlopen)
+
+    def test_concurrent_identical_gets_share_one_request(self) -> None:
+        release = threading.Event()
+        results = []
+        with self._urlopen(release=release):
+            threads = [
+                threading.Thread(target=lambda: results.append(self.graph_client.get("/groups", {"$top": "1"})))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            # Let the other threads queue behind the first request before it answers.
+            while not self.urls:
+                threading.Event().wait(0.01)
+            threading.Event().wait(0.05)
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(self.urls, ["https://graph.microsoft.com/beta/groups?%24top=1"])
+        self.assertEqual(results, [{"value": [1]}] * 4)
+        # Every caller gets its own copy.
+        self.assertEqual(len({id(result) for result in results}), 4)
+
+    def test_concurrent_failures_raise_one_exception_per_caller(self) -> None:
+        release = threading.Event()
+        errors = []
+
+        def urlopen(request):
+            self.urls.append(request.full_url)
+            release.wait(5)
+            raise urllib.error.HTTPError(request.full_url, 503, "Unavailable", {}, io.BytesIO(b'{"error": "busy"}'))
+
+        def fetch():
+            try:
+                self.graph_client.get("/groups", log_errors=False)
+            except urllib.error.HTTPError as exc:
+                errors.append(exc)
+
+        with mock.patch("urllib.request.urlopen", side_effect=urlopen):
+            threads = [threading.Thread(target=fetch) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            while not self.urls:
+                threading.Event().wait(0.01)
+            threading.Event().wait(0.05)
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(len(self.urls), 1)
+        self.assertEqual([error.code for error in errors], [503] * 4)
+        self.assertEqual(len({id(error) for error in errors}), 4)
+        shared = [error for error in errors if error.__cause__ is None]
+        self.assertEqual(len(shared), 1)
+        for error in errors:
+            self.assertIn(error.__cause__, (None, shared[0]))
+            # One pass through get() per exception: waiters did not raise the shared one.
+            frames = [frame.name for frame in traceback.extract_tb(error.__traceback__)]
+            self.assertEqual(frames.count("get"), 1, frames)
+        # Every caller can read the error body, not just the first to try.
+        self.assertEqual([error.read() for error in errors], [b'{"error": "busy"}'] * 4)
+
+    def test_repeat_gets_are_answered_from_memory_until_cleared(self) -> None:
+        with self._urlopen():
+            first = self.graph_client.get("/organization")
+            first["value"].append(2)
+            second = self.graph_client.get("/organization")
+            self.graph_client.get("https://graph.microsoft.com/beta/next", is_absolute=True)
+            self.graph_client.get("https://graph.microsoft.com/beta/next", is_absolute=True)
+            self.graph_client.clear_memo()
+            self.graph_client.get("/organization")
+
+        self.assertEqual(second, {"value": [1]})
+        self.assertEqual(self.graph_client.memo_hits, 1)
+        self.assertEqual(len(self.urls), 4)
+
+    def test_failed_gets_are_not_remembered(self) -> None:
+        error = urllib.error.HTTPError("https://graph.microsoft.com/beta/x", 503, "Unavailable", {}, None)
+        with mock.patch("urllib.request.urlopen", side_effect=[error, _Response(b"{}")]) as urlopen:
+            with self.assertRaises(urllib.error.HTTPError):
+                self.graph_client.get("/x", log_errors=False)
+            self.assertEqual(self.graph_client.get("/x"), {})
+
+        self.assertEqual(urlopen.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc.exporters.group_members import fetch_member_counts  # noqa: E402
+from intune_doc.graph_client import GraphClient  # noqa: E402
+from intune_doc.reports.builder import build_report_schema  # noqa: E402
+from intune_doc.store import ExportStore, write_export_store  # noqa: E402
+
+
+class _CountingGraphClient(GraphClient):
+    """Answers member $count requests in $batch; group "g-gone" is not found."""
+
+    def __init__(self, cache_directory=None) -> None:
+        super().__init__("token", cache_directory=cache_directory)
+        self.batches = []
+
+    def post(self, path, body):
+        self.batches.append([request["url"] for request in body["requests"]])
+        responses = []
+        for request in body["requests"]:
+            if "/g-gone/" in request["url"]:
+                responses.append({"id": request["id"], "status": 404, "body": {"error": {}}})
+            else:
+                count = 0 if request["url"].endswith("device/$count") else len(request["url"])
+                responses.append({"id": request["id"], "status": 200, "body": count})
+        return {"responses": responses}
+
+
+class TestGroupMemberCounts(unittest.TestCase):
+    def test_counts_are_batched_twenty_requests_at_a_time(self) -> None:
+        group_ids = [f"g{index:02d}" for index in range(15)]
+        graph_client = _CountingGraphClient()
+
+        counts = fetch_member_counts(graph_client, group_ids)
+
+        self.assertEqual([len(batch) for batch in graph_client.batches], [20, 10])
+        self.assertEqual(set(counts), set(group_ids))
+        self.assertEqual(counts["g00"]["devices"], 0)
+        self.assertEqual(counts["g00"]["users"], len("/groups/g00/transitiveMembers/microsoft.graph.user/$count"))
+
+    def test_cached_counts_are_not_requested_again(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first_run = _CountingGraphClient(Path(temp_dir))
+            with self.assertLogs("intune_doc.exporters.group_members", level="WARNING"):
+                fetch_member_counts(first_run, ["g1", "g-gone"])
+            first_run.save_caches()
+
+            next_run = _CountingGraphClient(Path(temp_dir))
+            counts = fetch_member_counts(next_run, ["g1", "g2"])
+
+        # Only the new group is counted; the failed one was not cached.
+        self.assertEqual(next_run.batches, [[
+            "/groups/g2/transitiveMembers/microsoft.graph.user/$count",
+            "/groups/g2/transitiveMembers/microsoft.graph.device/$count",
+        ]])
+        self.assertEqual(set(counts), {"g1", "g2"})
+
+    def test_coverage_reports_member_counts_by_group_name(self) -> None:
+        raw_export = {
+            "assets": [
+                {
+                    "id": "1",
+                    "displayName": "Policy",
+                    "type": "settings_catalog",
+                    "assignments": [{"target": {"groupId": "g1", "groupDisplayName": "Finance"}}],
+                }
+            ],
+            "groupMemberCounts": {"g1": {"users": 40, "devices": 55}},
+        }
+
+        report = build_report_schema(raw_export, audience="admin", organization="Contoso")
+        self.assertEqual(report.assignment_coverage.members_by_group, {"Finance": {"users": 40, "devices": 55}})
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_path = write_export_store(raw_export, Path(temp_dir) / "report")
+            with ExportStore(store_path) as store:
+                self.assertEqual(store.raw_export()["groupMemberCounts"], raw_export["groupMemberCounts"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import sys
+import tempfile
+import unittest
+import urllib.error
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc.exporters.group_policy_configurations import (  # noqa: E402
+    export_group_policy_configurations,
+)
+from intune_doc.graph_client import GraphClient  # noqa: E402
+from intune_doc.reports.setting_rows import extract_setting_rows  # noqa: E402
+
+
+DEFINITIONS = {
+    "def-1": {
+        "id": "def-1",
+        "displayName": "Configure homepage",
+        "categoryPath": "\\Microsoft Edge\\Startup",
+        "explainText": "Sets the homepage.",
+    },
+    "def-2": {"id": "def-2", "displayName": "Allow InPrivate", "categoryPath": "\\Microsoft Edge"},
+}
+
+
+class _AdmxGraphClient(GraphClient):
+    """Serves two ADMX policies sharing definitions, over GET and $batch."""
+
+    def __init__(self, cache_directory=None, reject_nested_expand=False) -> None:
+        super().__init__("token", cache_directory=cache_directory)
+        self.reject_nested_expand = reject_nested_expand
+        self.gets = []
+        self.batched = []
+
+    def get(self, path, params=None, is_absolute=False, log_errors=True):
+        self.gets.append((path, params))
+        if path == "/deviceManagement/groupPolicyConfigurations":
+            return {"value": [{"id": "p1", "displayName": "Edge"}, {"id": "p2", "displayName": "Edge pilot"}]}
+        if path.endswith("/definitionValues"):
+            if self.reject_nested_expand and "presentationValues" in params["$expand"]:
+                raise urllib.error.HTTPError(path, 400, "Bad Request", {}, None)
+            homepage = {"id": "dv-1", "enabled": True, "definition": {"id": "def-1"}}
+            if not self.reject_nested_expand:
+                homepage["presentationValues"] = _homepage_presentation_values()
+            return {"value": [homepage, {"id": "dv-2", "enabled": False, "definition": {"id": "def-2"}}]}
+        return {"value": []}
+
+    def post(self, path, body):
+        responses = []
+        for request in body["requests"]:
+            self.batched.append(request["url"])
+            url = request["url"].split("?")[0]
+            if url.endswith("/presentationValues"):
+                payload = {"value": _homepage_presentation_values() if "/dv-1/" in url else []}
+            else:
+                payload = DEFINITIONS[url.rsplit("/", 1)[1]]
+            responses.append({"id": request["id"], "status": 200, "body": payload})
+        return {"responses": responses}
+
+
+def _homepage_presentation_values():
+    return [{"value": "https://intranet", "presentation": {"label": "Homepage URL"}}]
+
+
+class TestGroupPolicyConfigurations(unittest.TestCase):
+    def test_definition_values_become_setting_rows(self) -> None:
+        assets = export_group_policy_configurations(_AdmxGraphClient())
+
+        rows = extract_setting_rows(assets[0]["settings"])
+        self.assertEqual(rows[0]["setting"], "\\Microsoft Edge\\Startup\\Configure homepage")
+        self.assertEqual(rows[0]["value"], '{"enabled": true, "Homepage URL": "https://intranet"}')
+        self.assertEqual(rows[0]["description"], "Sets the homepage.")
+        self.assertEqual(rows[1]["setting"], "\\Microsoft Edge\\Allow InPrivate")
+        self.assertEqual(rows[1]["value"], "Disabled")
+        self.assertEqual(rows[2]["setting"], "policyConfigurationIngestionType")
+
+    def test_definitions_are_fetched_once_across_policies_and_runs(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            graph_client = _AdmxGraphClient(Path(temp_dir))
+            export_group_policy_configurations(graph_client)
+            graph_client.save_caches()
+
+            self.assertEqual(len(graph_client.batched), 2)
+            definition_value_gets = [path for path, _ in graph_client.gets if path.endswith("/definitionValues")]
+            self.assertEqual(len(definition_value_gets), 2)
+
+            next_run = _AdmxGraphClient(Path(temp_dir))
+            assets = export_group_policy_configurations(next_run)
+
+        self.assertEqual(next_run.batched, [])
+        self.assertEqual(assets[1]["settings"]["settings"][0]["displayName"], "\\Microsoft Edge\\Startup\\Configure homepage")
+
+    def test_presentation_values_are_batched_when_nested_expand_is_rejected(self) -> None:
+        graph_client = _AdmxGraphClient(reject_nested_expand=True)
+
+        with self.assertLogs("intune_doc.exporters.group_policy_configurations", level="WARNING"):
+            assets = export_group_policy_configurations(graph_client)
+
+        self.assertEqual(
+            assets[0]["settings"]["settings"][0]["value"], {"enabled": True, "Homepage URL": "https://intranet"}
+        )
+        presentation_requests = [url for url in graph_client.batched if "/presentationValues" in url]
+        self.assertEqual(len(presentation_requests), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
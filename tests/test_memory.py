@@ -0,0 +1,85 @@
+import json
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc import memory  # noqa: E402
+from intune_doc.cli import main  # noqa: E402
+from intune_doc.config import OutputConfig, ReportOptionsConfig  # noqa: E402
+from intune_doc.writers.common import WriterOptions  # noqa: E402
+
+
+class TestMemoryProfiling(unittest.TestCase):
+    def test_stage_records_rss_and_top_allocations(self) -> None:
+        profiler = memory.MemoryProfiler(trace_allocations=True)
+        try:
+            with profiler.stage("allocate"):
+                retained = [bytes(1024) for _ in range(4096)]
+        finally:
+            tracemalloc.stop()
+
+        stage = profiler.stage_named("allocate")
+        self.assertEqual(len(retained), 4096)
+        self.assertGreaterEqual(stage.traced_peak_mb, 4)
+        self.assertTrue(stage.top_allocations)
+        self.assertIn("test_memory.py", stage.top_allocations[0])
+        if memory.peak_rss_mb() is not None:
+            self.assertGreater(stage.peak_rss_mb, 0)
+
+    def test_writer_options_fall_back_when_projected_over_budget(self) -> None:
+        profiler = memory.MemoryProfiler(budget_mb=100)
+        writer_options = WriterOptions(word_backend="python-docx")
+
+        with mock.patch.object(profiler, "projected_write_mb", side_effect=[400.0, 150.0]):
+            with self.assertLogs("intune_doc.memory", "WARNING"):
+                fitted = memory.fit_writer_options(writer_options, profiler, "build", parallel_jobs=4)
+
+        self.assertEqual(fitted.max_workers, 1)
+        self.assertEqual(fitted.word_backend, "stream")
+        self.assertEqual(fitted.sort_run_size, memory.LOW_MEMORY_SORT_RUN_SIZE)
+
+    def test_writer_options_are_kept_within_budget(self) -> None:
+        profiler = memory.MemoryProfiler(budget_mb=100)
+        writer_options = WriterOptions()
+
+        with mock.patch.object(profiler, "projected_write_mb", return_value=60.0):
+            self.assertIs(memory.fit_writer_options(writer_options, profiler, "build", 2), writer_options)
+        self.assertIs(memory.fit_writer_options(writer_options, None, "build", 2), writer_options)
+
+    def test_render_command_writes_memory_profile(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            profile_path = Path(tmpdir) / "memory.json"
+            config = OutputConfig(report_options=ReportOptionsConfig(memory_budget_mb=100_000))
+            with mock.patch("intune_doc.cli.load_output_config", return_value=config):
+                exit_code = main(
+                    [
+                        "render",
+                        str(ROOT / "fixtures"),
+                        "--format",
+                        "excel",
+                        "--output",
+                        str(Path(tmpdir) / "report"),
+                        "--profile-memory",
+                        str(profile_path),
+                    ]
+                )
+            profile = json.loads(profile_path.read_text(encoding="utf-8"))
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(profile["budget_mb"], 100_000)
+        names = [stage["name"] for stage in profile["stages"]]
+        self.assertEqual(names[:2], ["build_report_schema", "render reports"])
+        self.assertIn("save report-excel.json", names)
+        self.assertIn("save report-excel.xlsx", names)
+        self.assertIsNone(memory.active_profiler())
+
+
+if __name__ == "__main__":
+    unittest.main()
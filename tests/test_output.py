@@ -0,0 +1,251 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from docx import Document  # noqa: E402
+from openpyxl import load_workbook  # noqa: E402
+
+from intune_doc import output  # noqa: E402
+from intune_doc.reports.builder import build_report_schema  # noqa: E402
+from intune_doc.reports.registry import render_reports  # noqa: E402
+from intune_doc.writers import docx_stream, pdf  # noqa: E402
+from intune_doc.writers import excel as excel_writer  # noqa: E402
+from intune_doc.writers.blocks import Heading, Paragraph, Table  # noqa: E402
+
+
+def _raw_export() -> dict:
+    assets = []
+    for idx, group in enumerate(("Pilot Devices", "All Staff", "Finance")):
+        assets.append(
+            {
+                "id": f"policy-{idx}",
+                "displayName": f"Policy {idx}",
+                "type": "settings_catalog" if idx % 2 else "device_configurations",
+                "settings": {"platforms": "windows10", "first": idx, "second": [idx, idx + 1]},
+                "assignments": [
+                    {
+                        "target": {
+                            "groupId": f"group-{idx}",
+                            "groupDisplayName": group,
+                            "groupType": "security",
+                            "assignmentType": "include",
+                        },
+                        "intent": "required",
+                    }
+                ],
+            }
+        )
+    return {"generatedAt": "2024-01-01T00:00:00+00:00", "assets": assets}
+
+
+def _failing_blocks():
+    yield Heading("Report", level=0)
+    yield Paragraph("Written before the failure.")
+    raise RuntimeError("render failed")
+
+
+def _render(formats):
+    report = build_report_schema(_raw_export(), audience="admin", organization="Contoso")
+    return render_reports(report, formats, "admin")
+
+
+class TestExcelOutput(unittest.TestCase):
+    def test_assignments_sheet_is_sorted_by_group(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = output.write_rendered_reports(_render(["excel"]), Path(tmp) / "report", [])
+            workbook = load_workbook(paths["excel"])
+
+            self.assertEqual(workbook.sheetnames, ["Summary", "Assignments"])
+            groups = [row[6] for row in workbook["Assignments"].iter_rows(min_row=2, values_only=True)]
+            self.assertEqual(groups, sorted(groups, key=str.casefold))
+            self.assertEqual(len(groups), 9)
+
+    def test_assignments_are_split_across_sheets_past_row_limit(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(excel_writer, "EXCEL_MAX_ROWS", 5):
+            paths = output.write_rendered_reports(_render(["excel"]), Path(tmp) / "report", [])
+            workbook = load_workbook(paths["excel"])
+
+            self.assertEqual(
+                workbook.sheetnames,
+                ["Summary", "Index", "Assignments", "Assignments 2", "Assignments 3"],
+            )
+            index_rows = list(workbook["Index"].iter_rows(min_row=2, values_only=True))
+            self.assertEqual([row[2] for row in index_rows], [4, 4, 1])
+
+    def test_assignments_can_be_split_into_workbooks_per_policy_type(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            options = output.WriterOptions(excel_shard_by="policy_type", max_workers=1)
+            paths = output.write_rendered_reports(_render(["excel"]), Path(tmp) / "report", [], options)
+            workbook = load_workbook(paths["excel"])
+
+            self.assertEqual(workbook.sheetnames, ["Summary", "Index"])
+            locations = [row[1] for row in workbook["Index"].iter_rows(min_row=2, values_only=True)]
+            self.assertEqual(
+                locations,
+                ["report-excel-device_configurations.xlsx", "report-excel-settings_catalog.xlsx"],
+            )
+            for location in locations:
+                self.assertTrue((Path(tmp) / location).exists())
+
+
+def _docx_content(path: Path):
+    document = Document(path)
+    paragraphs = [(paragraph.style.name, paragraph.text) for paragraph in document.paragraphs]
+    tables = [[[cell.text for cell in row.cells] for row in table.rows] for table in document.tables]
+    return paragraphs, tables
+
+
+class TestWordOutput(unittest.TestCase):
+    def test_stream_backend_matches_python_docx_content(self) -> None:
+        rendered = _render(["word"])
+        with tempfile.TemporaryDirectory() as tmp:
+            default_path = output.write_rendered_reports(rendered, Path(tmp) / "default", [])["word"]
+            stream_path = output.write_rendered_reports(
+                rendered,
+                Path(tmp) / "stream",
+                [],
+                output.WriterOptions(word_backend="stream"),
+            )["word"]
+
+            self.assertEqual(_docx_content(stream_path), _docx_content(default_path))
+            self.assertEqual(Document(stream_path).tables[0].style.name, "Light Grid Header D9E1F2")
+
+    def test_asset_type_shards_are_linked_from_master_document(self) -> None:
+        options = output.WriterOptions(word_shard_by="asset_type", max_workers=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            master_path = output.write_rendered_reports(_render(["word"]), Path(tmp) / "report", [], options)["word"]
+
+            links = sorted(
+                relationship.target_ref
+                for relationship in Document(master_path).part.rels.values()
+                if relationship.is_external
+            )
+            self.assertEqual(
+                links,
+                ["report-word-Device-Configurations.docx", "report-word-Settings-Catalog.docx"],
+            )
+            shard_headings = [paragraph.text for paragraph in Document(Path(tmp) / links[0]).paragraphs]
+            self.assertIn("Policy 0 (device_configurations)", shard_headings)
+
+    def test_stream_backend_leaves_no_file_when_rendering_fails(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "report.docx"
+            with self.assertRaisesRegex(RuntimeError, "render failed"):
+                docx_stream.write_docx(_failing_blocks(), path)
+
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+
+
+class TestSettingRows(unittest.TestCase):
+    def test_setting_rows_are_stringified_once_when_the_schema_is_built(self) -> None:
+        report = build_report_schema(_raw_export(), audience="admin", organization="Contoso")
+
+        self.assertEqual(
+            [(row["setting"], row["value"]) for row in report.assets[1].setting_rows],
+            [("platforms", "windows10"), ("first", "1"), ("second", "[1, 2]")],
+        )
+        with tempfile.TemporaryDirectory() as tmp, mock.patch(
+            "intune_doc.reports.setting_rows.stringify_setting_value"
+        ) as stringify:
+            rendered = render_reports(report, ["word", "excel"], "admin")
+            output.write_rendered_reports(rendered, Path(tmp) / "report", [])
+
+        stringify.assert_not_called()
+
+    def test_json_payloads_leave_out_rendering_data(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = output.write_rendered_reports(_render(["word"]), Path(tmp) / "report", [])
+            rendered_json = (Path(tmp) / "report-word.json").read_text(encoding="utf-8")
+            word_tables = Document(paths["word"]).tables
+
+        for internal in ("setting_rows", "oma_setting_count", "content_hash"):
+            self.assertNotIn(internal, rendered_json)
+        self.assertIn('"settings"', rendered_json)
+        self.assertIn("windows10", [cell.text for table in word_tables for row in table.rows for cell in row.cells])
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_content_hash_tracks_asset_changes(self) -> None:
+        raw_export = _raw_export()
+        first = build_report_schema(raw_export, audience="admin", organization="Contoso").assets
+        raw_export["assets"][1]["settings"]["first"] = 42
+        second = build_report_schema(raw_export, audience="admin", organization="Contoso").assets
+
+        self.assertEqual(first[0].content_hash, second[0].content_hash)
+        self.assertNotEqual(first[1].content_hash, second[1].content_hash)
+
+    def test_only_changed_assets_are_rendered_again(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_directory = Path(tmp) / "cache"
+            options = output.WriterOptions(word_backend="stream", render_cache_directory=str(cache_directory))
+            output.write_rendered_reports(_render(["word", "excel"]), Path(tmp) / "first", [], options)
+            self.assertEqual(len(list(cache_directory.rglob("*.pickle"))), 6)
+
+            raw_export = _raw_export()
+            raw_export["assets"][1]["settings"]["first"] = 42
+            rendered = render_reports(
+                build_report_schema(raw_export, audience="admin", organization="Contoso"),
+                ["word", "excel"],
+                "admin",
+            )
+            cached = output.write_rendered_reports(rendered, Path(tmp) / "cached", [], options)
+            fresh = output.write_rendered_reports(
+                rendered, Path(tmp) / "fresh", [], output.WriterOptions(word_backend="stream")
+            )
+
+            self.assertEqual(len(list(cache_directory.rglob("*.pickle"))), 8)
+            self.assertEqual(_docx_content(cached["word"]), _docx_content(fresh["word"]))
+            self.assertEqual(
+                list(load_workbook(cached["excel"])["Assignments"].values),
+                list(load_workbook(fresh["excel"])["Assignments"].values),
+            )
+
+
+class TestPdfOutput(unittest.TestCase):
+    def test_pdf_report_has_pages_and_outline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = output.write_rendered_reports(_render(["pdf"]), Path(tmp) / "report", [])["pdf"]
+            content = path.read_bytes()
+
+            self.assertEqual(path.suffix, ".pdf")
+            self.assertTrue(content.startswith(b"%PDF-1.4"))
+            self.assertTrue(content.rstrip().endswith(b"%%EOF"))
+            self.assertIn(b"/Type /Outlines", content)
+            self.assertIn(b"/Title (Policy 0 \\(device_configurations\\))", content)
+            self.assertGreater(content.count(b"/Type /Page "), 1)
+
+    def test_header_taller_than_a_page_is_clipped(self) -> None:
+        table = Table(
+            headers=["Setting " * 2000, "Value"],
+            rows=[["camera", "blocked"], ["bluetooth", "allowed"]],
+            style="Light Grid Accent 1",
+            header_fill="D9E1F2",
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "report.pdf"
+            pdf.write_pdf([table], path)
+            content = path.read_bytes()
+
+        self.assertEqual(content.count(b"/Type /Page "), 1)
+        self.assertIn("…".encode("cp1252"), content)
+        self.assertIn(b"(bluetooth)", content)
+
+    def test_failed_render_keeps_the_previous_report(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "report.pdf"
+            path.write_bytes(b"previous")
+            with self.assertRaisesRegex(RuntimeError, "render failed"):
+                pdf.write_pdf(_failing_blocks(), path)
+
+            self.assertEqual(list(Path(tmp).iterdir()), [path])
+            self.assertEqual(path.read_bytes(), b"previous")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc import raw_export  # noqa: E402
+from intune_doc.cli import main  # noqa: E402
+from intune_doc.config import OutputConfig  # noqa: E402
+from intune_doc.raw_export import iter_raw_assets, open_raw_export  # noqa: E402
+from intune_doc.reports.builder import build_report_schema  # noqa: E402
+
+
+def _assets() -> list:
+    return [
+        {
+            "id": f"asset-{index}",
+            "displayName": f"Policy {index} é",
+            "type": "deviceConfigurations",
+            "settings": {"value": index * 1000, "nested": {"items": list(range(index))}},
+            "assignments": [],
+        }
+        for index in range(5)
+    ]
+
+
+class TestRawExportLoading(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.directory = Path(self._tmp.name)
+
+    def test_streams_raw_export_across_small_chunks(self) -> None:
+        path = self.directory / "report-raw.json"
+        path.write_text(
+            json.dumps({"generatedAt": "2024-01-01T00:00:00+00:00", "assets": _assets(), "organization": "Contoso"}),
+            encoding="utf-8",
+        )
+
+        with mock.patch.object(raw_export, "CHUNK_SIZE", 7):
+            loaded = open_raw_export(path)
+            self.assertNotIn("organization", loaded)
+            self.assertEqual(list(loaded["assets"]), _assets())
+
+        self.assertEqual(loaded["generatedAt"], "2024-01-01T00:00:00+00:00")
+        self.assertEqual(loaded["organization"], "Contoso")
+
+    def test_reads_bare_lists_and_ndjson(self) -> None:
+        list_path = self.directory / "assets.json"
+        list_path.write_text(json.dumps(_assets(), indent=2), encoding="utf-8")
+        ndjson_path = self.directory / "assets.ndjson"
+        ndjson_path.write_text(
+            "\n".join(json.dumps(item) for item in [{"generatedAt": "2024-01-01"}, *_assets()]),
+            encoding="utf-8",
+        )
+
+        with mock.patch.object(raw_export, "CHUNK_SIZE", 16):
+            self.assertEqual(list(iter_raw_assets(list_path)), _assets())
+        loaded = open_raw_export(ndjson_path)
+        self.assertEqual(list(loaded["assets"]), _assets())
+        self.assertEqual(loaded["generatedAt"], "2024-01-01")
+
+    def test_rejects_truncated_exports(self) -> None:
+        path = self.directory / "report-raw.json"
+        path.write_text(json.dumps({"assets": _assets()})[:-20], encoding="utf-8")
+
+        with self.assertRaises(ValueError):
+            list(iter_raw_assets(path))
+
+    def test_builds_schema_from_fixture_directory(self) -> None:
+        report = build_report_schema(open_raw_export(ROOT / "fixtures"), audience="admin", organization=None)
+
+        self.assertEqual(len(report.assets), len(list((ROOT / "fixtures").glob("*.json"))))
+        self.assertEqual(report.metadata.organization, "Unknown organization")
+
+    def test_render_command_writes_reports_from_saved_export(self) -> None:
+        path = self.directory / "report-raw.json"
+        path.write_text(json.dumps({"generatedAt": "2024-01-01", "organization": "Contoso", "assets": _assets()}))
+        output = self.directory / "out" / "rendered"
+
+        # Render never needs config.yaml; keep a local one from changing the output.
+        with mock.patch("intune_doc.cli.load_output_config", return_value=OutputConfig()):
+            exit_code = main(["render", str(path), "--format", "excel", "--output", str(output)])
+
+        self.assertEqual(exit_code, 0)
+        self.assertTrue(output.with_name("rendered-excel.xlsx").exists())
+        rendered = json.loads(output.with_name("rendered-excel.json").read_text(encoding="utf-8"))
+        self.assertEqual(rendered["metadata"]["organization"], "Contoso")
+
+
+    def test_render_command_fans_out_audiences_and_scopes(self) -> None:
+        path = self.directory / "report-raw.json"
+        path.write_text(json.dumps({"generatedAt": "2024-01-01", "assets": _assets()}))
+        output = self.directory / "rendered"
+
+        with mock.patch("intune_doc.cli.load_output_config", return_value=OutputConfig()):
+            exit_code = main(
+                ["render", str(path), "--format", "excel", "--audience", "admin,client", "--scope",
+                 "full_settings,assignment_summary", "--output", str(output)]
+            )
+
+        self.assertEqual(exit_code, 0)
+        for audience in ("admin", "client"):
+            for scope in ("full-settings", "assignment-summary"):
+                prefix = f"rendered-{audience}-{scope}"
+                self.assertTrue((self.directory / f"{prefix}-excel.xlsx").exists())
+                rendered = json.loads((self.directory / f"{prefix}-excel.json").read_text(encoding="utf-8"))
+                self.assertEqual(rendered["audience"], audience)
+                self.assertEqual(rendered["metadata"]["audience"], audience)
+                self.assertEqual(rendered["scope"], scope.replace("-", "_"))
+
+if __name__ == "__main__":
+    unittest.main()
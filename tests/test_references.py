@@ -0,0 +1,97 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc.exporters.composite_export import export_all  # noqa: E402
+from intune_doc.exporters.plan import plan_export  # noqa: E402
+from intune_doc.graph_client import GraphClient  # noqa: E402
+from intune_doc.reports.builder import build_report_schema  # noqa: E402
+from intune_doc.reports.rendering import distill_assignment_mappings  # noqa: E402
+
+
+class _ReferencingGraphClient(GraphClient):
+    """Two policies sharing a filter and scope tags, and a Cloud PC policy using a custom image."""
+
+    def __init__(self) -> None:
+        super().__init__("token")
+        self.paths = []
+
+    def get(self, path, params=None, is_absolute=False, log_errors=True):
+        self.paths.append(path)
+        if path == "/deviceManagement/configurationPolicies":
+            return {
+                "value": [
+                    {"id": "p1", "displayName": "Baseline", "roleScopeTagIds": ["0", "7"]},
+                    {"id": "p2", "displayName": "Pilot", "roleScopeTagIds": ["7", "9"]},
+                ]
+            }
+        if path.startswith("/deviceManagement/configurationPolicies/"):
+            target = {
+                "groupId": "g1",
+                "deviceAndAppManagementAssignmentFilterId": "f1",
+                "deviceAndAppManagementAssignmentFilterType": "exclude",
+            }
+            return {"value": [{"target": target}]}
+        if path == "/deviceManagement/virtualEndpoint/provisioningPolicies":
+            return {"value": [{"id": "w1", "displayName": "Cloud PCs", "imageId": "img-1"}]}
+        if path == "/deviceManagement/assignmentFilters":
+            return {"value": [{"id": "f1", "displayName": "Corporate laptops"}]}
+        if path == "/deviceManagement/roleScopeTags":
+            return {"value": [{"id": "0", "displayName": "Default"}, {"id": "7", "displayName": "Finance"}]}
+        if path == "/deviceManagement/virtualEndpoint/deviceImages":
+            return {"value": [{"id": "img-1", "displayName": "Win11 Finance"}]}
+        if path == "/groups":
+            return {"value": [{"id": "g1", "displayName": "Finance devices"}]}
+        return {"value": []}
+
+    def post(self, path, body):
+        # Member count $batch requests.
+        return {"responses": [{"id": request["id"], "status": 200, "body": 3} for request in body["requests"]]}
+
+
+class TestReferenceResolution(unittest.TestCase):
+    def test_references_are_resolved_with_one_read_per_collection(self) -> None:
+        graph_client = _ReferencingGraphClient()
+
+        assets = export_all(
+            graph_client,
+            plan_export(["full_settings"], asset_types=["settings_catalog", "windows365"]),
+            max_workers=1,
+        )["assets"]
+
+        for path in (
+            "/deviceManagement/assignmentFilters",
+            "/deviceManagement/roleScopeTags",
+            "/deviceManagement/virtualEndpoint/deviceImages",
+        ):
+            self.assertEqual(graph_client.paths.count(path), 1)
+        baseline, pilot, cloud_pc = assets[0], assets[1], assets[-1]
+        self.assertEqual(baseline["scopeTags"], ["Default", "Finance"])
+        self.assertEqual(pilot["scopeTags"], ["Finance", "Unknown scope tag (9)"])
+        self.assertEqual(
+            distill_assignment_mappings(pilot["assignments"])[0]["filterDisplayName"], "Corporate laptops"
+        )
+        self.assertEqual(pilot["assignments"][0]["target"]["filterType"], "exclude")
+        self.assertEqual(cloud_pc["settings"]["imageDisplayName"], "Win11 Finance")
+
+        report = build_report_schema({"assets": assets}, audience="admin", organization="Contoso")
+        self.assertEqual(report.assets[0].scope_tags, ["Default", "Finance"])
+
+    def test_exported_filters_are_reused_instead_of_read_again(self) -> None:
+        graph_client = _ReferencingGraphClient()
+
+        export_all(
+            graph_client,
+            plan_export(["assignment_summary"], asset_types=["settings_catalog", "assignment_filters"]),
+            max_workers=1,
+        )
+
+        self.assertEqual(graph_client.paths.count("/deviceManagement/assignmentFilters"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc import cli  # noqa: E402
+from intune_doc.reports.builder import build_report_schema  # noqa: E402
+from intune_doc.search import SearchIndex, index_terms, update_search_index  # noqa: E402
+
+
+def _raw_export(organization: str, camera: int = 0) -> dict:
+    return {
+        "organization": organization,
+        "assets": [
+            {
+                "id": "bitlocker",
+                "displayName": "Disk encryption",
+                "type": "device_configurations",
+                "settings": {
+                    "settings": [
+                        {
+                            "omaUri": "./Device/Vendor/MSFT/BitLocker/RequireDeviceEncryption",
+                            "displayName": "Require device encryption",
+                            "value": 1,
+                        }
+                    ]
+                },
+            },
+            {
+                "id": "defender",
+                "displayName": "Antivirus baseline",
+                "description": "Microsoft Defender settings for every device",
+                "type": "settings_catalog",
+                "settings": {"allowCamera": camera, "realTimeProtection": "enabled"},
+            },
+        ],
+    }
+
+
+def _report(organization: str, camera: int = 0):
+    return build_report_schema(_raw_export(organization, camera), audience="admin", organization=None)
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "search-index.sqlite"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_camel_case_words_are_split(self) -> None:
+        self.assertTrue({"requiredeviceencryption", "require", "device", "encryption"} <= index_terms(
+            "./Device/Vendor/MSFT/BitLocker/RequireDeviceEncryption"
+        ))
+        self.assertNotIn("a" * 41, index_terms("a" * 41))
+
+    def test_names_settings_descriptions_and_values_are_searchable(self) -> None:
+        update_search_index(self.path, _report("Contoso"))
+
+        with SearchIndex(self.path) as index:
+            bitlocker = index.search("bitlocker")
+            by_display_name = index.search("require encryption")
+            defender = index.search("defender")
+            by_value = index.search("enabled")
+
+        self.assertEqual([(hit.asset_id, hit.field) for hit in bitlocker], [("bitlocker", "setting")])
+        self.assertEqual({hit.asset_id for hit in by_display_name}, {"bitlocker"})
+        self.assertEqual([(hit.name, hit.field) for hit in defender], [("Antivirus baseline", "description")])
+        self.assertEqual([(hit.setting, hit.text) for hit in by_value], [("realTimeProtection", "enabled")])
+
+    def test_updates_only_reindex_changed_assets(self) -> None:
+        update_search_index(self.path, _report("Contoso"))
+        update_search_index(self.path, _report("Fabrikam"))
+
+        update = update_search_index(self.path, _report("Contoso", camera=1))
+
+        self.assertEqual((update.indexed, update.unchanged, update.removed), (1, 1, 0))
+        with SearchIndex(self.path) as index:
+            self.assertEqual(index.organizations(), ["Contoso", "Fabrikam"])
+            self.assertEqual({hit.organization for hit in index.search("bitlocker")}, {"Contoso", "Fabrikam"})
+            self.assertEqual([hit.organization for hit in index.search("bitlocker", "Fabrikam")], ["Fabrikam"])
+
+            report = _report("Contoso")
+            report.assets.pop()
+            self.assertEqual(index.update("Contoso", report.assets).removed, 1)
+            self.assertEqual([hit.organization for hit in index.search("defender")], ["Fabrikam"])
+
+    def test_search_command_prints_matches(self) -> None:
+        update_search_index(self.path, _report("Contoso"))
+        stdout = io.StringIO()
+
+        with contextlib.redirect_stdout(stdout):
+            exit_code = cli.main(["search", "bitlocker", "--index", str(self.path), "--format", "json"])
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual([hit["asset_id"] for hit in json.loads(stdout.getvalue())], ["bitlocker"])
+
+
+if __name__ == "__main__":
+    unittest.main()
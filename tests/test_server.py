@@ -0,0 +1,130 @@
+import io
+import json
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from openpyxl import load_workbook  # noqa: E402
+
+from intune_doc import server  # noqa: E402
+from intune_doc.output import write_raw_export  # noqa: E402
+from intune_doc.server import ArtifactCache, ReportServer, load_export, make_http_server  # noqa: E402
+
+
+def _raw_export() -> dict:
+    return {
+        "generatedAt": "2024-01-01T00:00:00+00:00",
+        "organization": "Contoso",
+        "assets": [
+            {
+                "id": f"policy-{idx}",
+                "displayName": f"Policy {idx}",
+                "type": "settings_catalog" if idx % 2 else "device_configurations",
+                "settings": {"value": idx},
+                "assignments": [{"target": {"groupId": "g1", "groupDisplayName": "Finance"}}],
+            }
+            for idx in range(5)
+        ],
+    }
+
+
+class TestReportServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._tmp = tempfile.TemporaryDirectory()
+        export_path = write_raw_export(_raw_export(), Path(cls._tmp.name) / "contoso")
+        cls.export = load_export(export_path)
+        cls.report_server = ReportServer([cls.export], default_audience="admin")
+        cls.http_server = make_http_server(cls.report_server, "127.0.0.1", 0)
+        cls.thread = threading.Thread(target=cls.http_server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.http_server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.http_server.shutdown()
+        cls.http_server.server_close()
+        cls._tmp.cleanup()
+
+    def _get(self, path: str):
+        with urllib.request.urlopen(f"{self.base_url}{path}") as response:
+            return response.headers, response.read()
+
+    def test_lists_exports_by_hash(self) -> None:
+        _, body = self._get("/exports")
+
+        self.assertEqual(
+            json.loads(body),
+            [
+                {
+                    "hash": self.export.export_hash,
+                    "source": str(self.export.source),
+                    "organization": "Contoso",
+                    "generated_at": "2024-01-01T00:00:00+00:00",
+                    "assets": 5,
+                }
+            ],
+        )
+
+    def test_sections_and_asset_pages_are_json(self) -> None:
+        _, body = self._get(f"/exports/{self.export.export_hash}/sections?audience=client&scope=assignment_summary")
+        sections = json.loads(body)
+        self.assertEqual((sections["audience"], sections["scope"]), ("client", "assignment_summary"))
+
+        _, body = self._get(f"/exports/{self.export.export_hash}/assets?page=2&per_page=2")
+        page = json.loads(body)
+        self.assertEqual((page["total"], page["pages"]), (5, 3))
+        self.assertEqual([asset["asset_id"] for asset in page["assets"]], ["policy-2", "policy-3"])
+
+        _, body = self._get(f"/exports/{self.export.export_hash}/assets?type=settings_catalog")
+        self.assertEqual([asset["asset_id"] for asset in json.loads(body)["assets"]], ["policy-1", "policy-3"])
+
+    def test_report_files_are_rendered_once_and_cached(self) -> None:
+        path = f"/exports/{self.export.export_hash}/report.xlsx?scope=assignment_summary"
+        with mock.patch.object(server, "write_rendered_reports", wraps=server.write_rendered_reports) as write:
+            headers, first = self._get(path)
+            _, second = self._get(path)
+
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertIn("Contoso-admin-assignment_summary.xlsx", headers["Content-Disposition"])
+        self.assertIn("Assignments", load_workbook(io.BytesIO(first)).sheetnames)
+
+    def test_bad_requests_are_reported(self) -> None:
+        for path, status in (
+            ("/exports/unknown/sections", 404),
+            (f"/exports/{self.export.export_hash}/sections?audience=board", 400),
+            (f"/exports/{self.export.export_hash}/assets?page=0", 400),
+            (f"/exports/{self.export.export_hash}/report.txt", 404),
+        ):
+            with self.assertRaises(urllib.error.HTTPError) as raised:
+                self._get(path)
+            self.assertEqual(raised.exception.code, status, path)
+            raised.exception.close()
+
+
+class TestArtifactCache(unittest.TestCase):
+    def test_least_recently_used_artifacts_are_evicted_past_the_size_limit(self) -> None:
+        cache = ArtifactCache(max_bytes=10)
+        cache.get_or_render(("a", "admin", "full_settings", "word"), lambda: b"12345")
+        cache.get_or_render(("b", "admin", "full_settings", "word"), lambda: b"12345")
+        # Touch "a" so "b" is the least recently used.
+        cache.get_or_render(("a", "admin", "full_settings", "word"), lambda: b"changed")
+        cache.get_or_render(("c", "admin", "full_settings", "word"), lambda: b"12345")
+
+        self.assertEqual(cache.get_or_render(("a", "admin", "full_settings", "word"), lambda: b"changed"), b"12345")
+        self.assertEqual(cache.get_or_render(("b", "admin", "full_settings", "word"), lambda: b"new"), b"new")
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
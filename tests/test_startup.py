@@ -0,0 +1,46 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.startup import HEAVY_MODULES, loaded_heavy_modules  # noqa: E402
+
+
+_WRITE_EXCEL = """
+import sys, tempfile
+from pathlib import Path
+from intune_doc.output import write_rendered_reports
+from intune_doc.reports.builder import build_report_schema
+from intune_doc.reports.registry import render_reports
+
+report = build_report_schema({"assets": []}, audience="admin", organization="Contoso")
+with tempfile.TemporaryDirectory() as tmp:
+    write_rendered_reports(render_reports(report, ["excel"], "admin"), Path(tmp) / "report", [])
+print(",".join(name for name in %r if name in sys.modules))
+"""
+
+
+class TestStartup(unittest.TestCase):
+    def test_help_does_not_import_heavy_modules(self) -> None:
+        for command in ("export", "search", "serve", "watch"):
+            with self.subTest(command=command):
+                self.assertEqual(loaded_heavy_modules([command, "--help"]), [])
+
+    def test_only_requested_format_library_is_loaded(self) -> None:
+        result = subprocess.run(
+            [sys.executable, "-c", _WRITE_EXCEL % (HEAVY_MODULES,)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertEqual(result.stdout.strip(), "openpyxl")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc.store import ExportStore, write_export_store  # noqa: E402
+
+
+def _raw_export() -> dict:
+    def asset(asset_id, asset_type, settings, groups):
+        return {
+            "id": asset_id,
+            "displayName": f"Policy {asset_id}",
+            "type": asset_type,
+            "settings": settings,
+            "assignments": [
+                {"target": {"groupId": f"id-{group}", "groupDisplayName": group}, "intent": "required"}
+                for group in groups
+            ],
+        }
+
+    return {
+        "generatedAt": "2024-01-01T00:00:00+00:00",
+        "assets": [
+            asset(
+                "a",
+                "settings_catalog",
+                {"settings": [{"omaUri": "./Device/Vendor/MSFT/BitLocker/RequireDeviceEncryption", "value": 1}]},
+                ["Finance"],
+            ),
+            asset(
+                "e",
+                "endpoint_security",
+                {"settings": [{"settingDefinitionId": "device_vendor_msft_bitlocker_requiredeviceencryption", "value": 1}]},
+                [],
+            ),
+            asset("b", "device_configurations", {"passwordRequired": True}, ["Finance", "All Staff"]),
+            asset("c", "settings_catalog", {}, []),
+            # Enough rows that the planner prefers the indexes over a scan.
+            asset("d", "scripts", {f"setting{idx}": idx for idx in range(200)}, []),
+        ],
+    }
+
+
+class TestExportStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = write_export_store(_raw_export(), Path(self._tmp.name) / "report")
+        self.store = ExportStore(self.path)
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_round_trips_raw_assets_in_order(self) -> None:
+        self.assertEqual(self.path.name, "report-export.sqlite")
+        self.assertEqual(self.store.raw_export(), _raw_export())
+        self.assertEqual([asset["id"] for asset in self.store.iter_assets("settings_catalog")], ["a", "c"])
+
+    def test_policies_for_group_by_name_or_id(self) -> None:
+        by_name = [row["id"] for row in self.store.policies_for_group("finance")]
+        by_id = [row["id"] for row in self.store.policies_for_group("id-All Staff")]
+
+        self.assertEqual(by_name, ["a", "b"])
+        self.assertEqual(by_id, ["b"])
+
+    def test_policies_with_setting_matches_text_literally(self) -> None:
+        self.assertEqual([row["id"] for row in self.store.policies_with_setting("bitlocker")], ["a", "e"])
+        self.assertEqual([row["id"] for row in self.store.policies_with_setting("device_vendor_msft_bitlocker")], ["e"])
+        # "_" is not a wildcard: "setting_1" would otherwise match setting01 .. setting199.
+        self.assertEqual(self.store.policies_with_setting("setting_1"), [])
+
+    def test_policies_with_setting_prefix_uses_setting_index(self) -> None:
+        rows = self.store.policies_with_setting("./device/vendor/msft/bitlocker", prefix=True)
+        plan = self.store.query(
+            "EXPLAIN QUERY PLAN SELECT * FROM settings WHERE setting LIKE ? ESCAPE '\\'",
+            ["./Device/Vendor/MSFT/BitLocker%"],
+        )
+
+        self.assertEqual([(row["id"], row["value"]) for row in rows], [("a", "1")])
+        self.assertTrue(any("settings_setting" in str(step) for step in plan))
+
+    def test_duplicate_assets_replace_their_rows(self) -> None:
+        raw_export = _raw_export()
+        original = next(asset for asset in raw_export["assets"] if asset["id"] == "b")
+        duplicate = dict(original, settings={"passwordMinimumLength": 8}, assignments=[])
+        raw_export["assets"].append(duplicate)
+        with ExportStore(write_export_store(raw_export, Path(self._tmp.name) / "duplicates")) as store:
+            settings = store.query("SELECT setting FROM settings WHERE asset_id = 'b'")
+            assignments = store.query("SELECT count(*) FROM assignments WHERE asset_id = 'b'")
+
+        self.assertEqual(settings, [("passwordMinimumLength",)])
+        self.assertEqual(assignments, [(0,)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from intune_doc import tracing  # noqa: E402
+from intune_doc.cli import main  # noqa: E402
+from intune_doc.config import OutputConfig  # noqa: E402
+from intune_doc.exporters.composite_export import export_all  # noqa: E402
+from intune_doc.exporters.plan import plan_export  # noqa: E402
+from intune_doc.graph_client import GraphClient  # noqa: E402
+
+
+class _GraphClient(GraphClient):
+    def __init__(self) -> None:
+        super().__init__("token")
+
+    def get(self, path, params=None, is_absolute=False, log_errors=True):
+        if path.endswith("/assignments"):
+            return {"value": [{"target": {"groupId": "g1"}}]}
+        if path == "/groups":
+            return {"value": [{"id": "g1", "displayName": "Group"}]}
+        return {"value": [{"id": "1", "displayName": "Policy"}]}
+
+    def post(self, path, body):
+        # Member count $batch requests.
+        return {"responses": [{"id": request["id"], "status": 200, "body": 3} for request in body["requests"]]}
+
+
+class TestTracing(unittest.TestCase):
+    def test_spans_are_not_recorded_without_a_tracer(self) -> None:
+        with tracing.span("idle") as args:
+            args["items"] = 1
+
+        self.assertIsNone(tracing.active_tracer())
+
+    def test_export_records_pagination_and_assignment_spans(self) -> None:
+        tracer = tracing.start_tracing()
+        try:
+            export_all(_GraphClient(), plan_export(["assignment_summary"], asset_types=["scripts"]))
+        finally:
+            tracing.stop_tracing()
+
+        names = [event["name"] for event in tracer.events]
+        self.assertEqual(names.count("export deviceManagementScript"), 1)
+        self.assertEqual(names.count("collect_assignments"), 3)
+        self.assertEqual(names.count("resolve_groups"), 3)
+        self.assertEqual(names.count("GET group member counts"), 1)
+        export_span = next(event for event in tracer.events if event["name"] == "export deviceShellScript")
+        self.assertEqual(export_span["args"], {"path": "/deviceManagement/deviceShellScripts", "items": 1})
+
+    def test_render_command_writes_chrome_trace(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            trace_path = Path(tmpdir) / "trace.json"
+            with mock.patch("intune_doc.cli.load_output_config", return_value=OutputConfig()):
+                exit_code = main(
+                    [
+                        "render",
+                        str(ROOT / "fixtures"),
+                        "--format",
+                        "excel",
+                        "--audience",
+                        "admin,client",
+                        "--output",
+                        str(Path(tmpdir) / "report"),
+                        "--trace",
+                        str(trace_path),
+                    ]
+                )
+            trace = json.loads(trace_path.read_text(encoding="utf-8"))
+
+        self.assertEqual(exit_code, 0)
+        events = trace["traceEvents"]
+        self.assertTrue(all(event["ph"] == "X" and event["dur"] >= 0 for event in events))
+        names = {event["name"] for event in events}
+        self.assertIn("build_report_schema", names)
+        self.assertIn("render excel", names)
+        # Saves from both worker processes are merged into the parent's trace.
+        self.assertIn("save report-admin-excel.xlsx", names)
+        self.assertIn("save report-client-excel.xlsx", names)
+        self.assertIsNone(tracing.active_tracer())
+
+
+if __name__ == "__main__":
+    unittest.main()